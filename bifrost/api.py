@@ -1,27 +1,33 @@
 """FastAPI REST API 서버"""
 
+import asyncio
+import re
+import tempfile
 import time
-from typing import Optional, List
+from typing import Dict, Optional, List, Union
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, Depends, Header, BackgroundTasks, WebSocket, WebSocketDisconnect, Request, Form
+from fastapi import FastAPI, HTTPException, Depends, Header, BackgroundTasks, WebSocket, WebSocketDisconnect, Request, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
-from bifrost.ollama import OllamaClient
-from bifrost.bedrock import BedrockClient, is_bedrock_available
+from bifrost.ollama import get_async_ollama_client, client_registry
+from bifrost.bedrock import AsyncBedrockClient, is_bedrock_available
 from bifrost.database import get_database, Database
 from bifrost.preprocessor import LogPreprocessor
+from bifrost.payload import LogPayload
 from bifrost.metrics import PrometheusMetrics
+from bifrost.singleflight import analysis_flight
 from bifrost.logger import logger
 from bifrost.ratelimit import RateLimiter
 from bifrost.exceptions import BifrostException, RateLimitError, handle_exception
 from bifrost.validators import InputValidator
 from bifrost.filters import LogFilter, SeverityLevel
-from bifrost.export import DataExporter
+from bifrost.export import DataExporter, is_columnar_available
 from bifrost.slack import SlackNotifier
+from bifrost.config import Config
 
 # FastAPI 앱
 app = FastAPI(
@@ -45,6 +51,9 @@ metrics = PrometheusMetrics()
 # Rate Limiter 초기화
 rate_limiter = RateLimiter(requests_per_hour=100)
 
+# 서버 설정 (Ollama 접속 정보 등)
+settings = Config()
+
 # 전역 예외 핸들러
 @app.exception_handler(BifrostException)
 async def bifrost_exception_handler(request: Request, exc: BifrostException):
@@ -91,6 +100,7 @@ class AnalyzeResponse(BaseModel):
     duration_seconds: float
     model: str
     cached: bool = False
+    coalesced: bool = False  # 같은 요청의 진행 중 분석 결과를 함께 받음
 
 
 class HistoryQuery(BaseModel):
@@ -100,6 +110,17 @@ class HistoryQuery(BaseModel):
     service_name: Optional[str] = None
     model: Optional[str] = None
     status: Optional[str] = None
+    fields: Optional[List[str]] = Field(None, description="반환할 필드 (기본 전체, 예: id, created_at, status)")
+    cursor: Optional[str] = Field(
+        None,
+        description="키셋 페이지 커서. 이 필드를 보내면(첫 페이지는 null) {items, next_cursor} 형태로 응답",
+    )
+
+
+class HistoryPage(BaseModel):
+    """키셋 페이지 응답"""
+    items: List[dict]
+    next_cursor: Optional[str] = None
 
 
 class MetricsResponse(BaseModel):
@@ -124,7 +145,20 @@ class FilterKeywordsRequest(BaseModel):
     """키워드 필터링 요청"""
     log_content: str = Field(..., description="로그 내용")
     keywords: List[str] = Field(..., description="키워드 목록")
+    patterns: Optional[List[str]] = Field(None, description="정규식 키워드 목록")
+    case_sensitive: bool = Field(False, description="대소문자 구분")
+    include_matches: bool = Field(False, description="매칭 위치 포함 (log_content 기준 오프셋)")
+
+
+class FilterQueryRequest(BaseModel):
+    """복합 필터링 요청 (지정한 조건을 한 번에 적용)"""
+    log_content: str = Field(..., description="로그 내용")
+    min_level: Optional[SeverityLevel] = Field(None, description="최소 심각도")
+    keywords: Optional[List[str]] = Field(None, description="키워드 목록")
+    patterns: Optional[List[str]] = Field(None, description="정규식 키워드 목록")
     case_sensitive: bool = Field(False, description="대소문자 구분")
+    start_time: Optional[str] = Field(None, description="시작 시각 (예: 2024-10-25 10:00:00)")
+    end_time: Optional[str] = Field(None, description="종료 시각")
 
 
 class SlackNotificationRequest(BaseModel):
@@ -161,6 +195,42 @@ async def verify_api_key(x_api_key: Optional[str] = Header(None)) -> bool:
     return True
 
 
+DEFAULT_BEDROCK_MODEL = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+
+def resolve_model(source: str, model: Optional[str] = None) -> str:
+    """요청 모델명 결정 (미지정 시 소스별 기본 모델)"""
+    if model:
+        return model
+    if source == "cloud":
+        return DEFAULT_BEDROCK_MODEL
+    return settings.get("ollama.model", "mistral")
+
+
+def ollama_client(model: Optional[str] = None):
+    """공용 풀에서 비동기 Ollama 클라이언트 가져오기"""
+    return get_async_ollama_client(
+        url=settings.get("ollama.url", "http://localhost:11434"),
+        model=resolve_model("local", model),
+        timeout=settings.get("ollama.timeout", 120),
+        max_retries=settings.get("ollama.max_retries", 3),
+        pool_size=settings.get("ollama.pool_size", 10),
+    )
+
+
+async def run_analysis(prompt: str, source: str, model: Optional[str] = None) -> dict:
+    """선택한 소스로 비동기 분석 (모델 응답 대기 중 이벤트 루프를 막지 않음)"""
+    if source == "local":
+        return await ollama_client(model).analyze(prompt, stream=False)
+    elif source == "cloud":
+        if not is_bedrock_available():
+            raise HTTPException(status_code=400, detail="Bedrock not available (boto3 not installed)")
+        client = AsyncBedrockClient(model_id=resolve_model("cloud", model))
+        return await client.analyze(prompt)
+    else:
+        raise HTTPException(status_code=400, detail="Invalid source (local or cloud)")
+
+
 # ==================== Routes ====================
 
 @app.get("/")
@@ -181,8 +251,7 @@ async def health():
     
     ollama_healthy = False
     try:
-        client = OllamaClient()
-        ollama_healthy = client.health_check()
+        ollama_healthy = await ollama_client().health_check()
     except:
         pass
     
@@ -238,42 +307,43 @@ async def analyze_log(request: AnalyzeRequest, background_tasks: BackgroundTasks
     start_time = time.time()
     db = get_database()
     
-    # 캐시 확인 (중복 분석 방지)
-    import hashlib
-    log_hash = hashlib.sha256(request.log_content.encode()).hexdigest()
-    cached_results = db.get_duplicate_analyses(log_hash, hours=24)
+    from bifrost.main import MASTER_PROMPT, PROMPT_VERSION
+    model_name = resolve_model(request.source, request.model)
     
-    if cached_results and not request.stream:
-        cached = cached_results[0]
-        metrics.increment_cache_hits()
-        return AnalyzeResponse(
-            id=cached["id"],
-            response=cached["response"],
-            duration_seconds=cached["duration_seconds"],
-            model=cached["model"],
-            cached=True,
-        )
+    # 인코딩/해시/크기는 여기서 한 번만 계산해 전처리·캐시·저장에 재사용
+    payload = LogPayload(request.log_content)
     
-    # 전처리
-    preprocessor = LogPreprocessor()
-    log_content = preprocessor.process(request.log_content)
+    # 캐시 확인 (중복 분석 방지, 메모리 LRU → DB)
+    if not request.stream:
+        cached = db.get_cached_analysis(payload.sha256, model_name, PROMPT_VERSION, hours=24)
+        if cached:
+            metrics.increment_cache_hits(cached["cache_tier"])
+            return AnalyzeResponse(
+                id=cached["id"],
+                response=cached["response"],
+                duration_seconds=cached["duration_seconds"],
+                model=cached["model"],
+                cached=True,
+            )
+        metrics.increment_cache_misses()
     
-    # 프롬프트
-    from bifrost.main import MASTER_PROMPT
-    prompt = MASTER_PROMPT.format(log_content=log_content)
+    async def analyze() -> dict:
+        # 전처리
+        preprocessor = LogPreprocessor()
+        log_content = preprocessor.process(payload)
+        
+        # 프롬프트
+        prompt = MASTER_PROMPT.format(log_content=log_content)
+        
+        # 분석 실행 (API는 스트리밍 미지원)
+        return await run_analysis(prompt, request.source, request.model)
     
     try:
-        # 분석 실행
-        if request.source == "local":
-            client = OllamaClient(model=request.model or "mistral")
-            result = client.analyze(prompt, stream=False)  # API는 스트리밍 미지원
-        elif request.source == "cloud":
-            if not is_bedrock_available():
-                raise HTTPException(status_code=400, detail="Bedrock not available (boto3 not installed)")
-            client = BedrockClient(model_id=request.model or "anthropic.claude-3-sonnet-20240229-v1:0")
-            result = client.analyze(prompt)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid source (local or cloud)")
+        # 같은 로그/모델/프롬프트 분석이 진행 중이면 모델을 다시 부르지 않고 함께 기다림
+        # (결과 행은 요청마다 저장: 태그/서비스 정보가 다를 수 있음)
+        result, coalesced = await analysis_flight.do(
+            (payload.sha256, request.source, model_name, PROMPT_VERSION), analyze, channel="api",
+        )
         
         duration = time.time() - start_time
         
@@ -281,7 +351,7 @@ async def analyze_log(request: AnalyzeRequest, background_tasks: BackgroundTasks
         analysis_id = db.save_analysis(
             source=request.source,
             model=result["metadata"]["model"],
-            log_content=request.log_content,
+            log_content=payload,
             response=result["response"],
             duration=duration,
             tags=request.tags,
@@ -289,6 +359,7 @@ async def analyze_log(request: AnalyzeRequest, background_tasks: BackgroundTasks
             environment=request.environment,
             tokens_used=result["metadata"].get("usage", {}).get("total_tokens"),
             status="completed",
+            prompt_version=PROMPT_VERSION,
         )
         
         # 메트릭 업데이트
@@ -301,14 +372,15 @@ async def analyze_log(request: AnalyzeRequest, background_tasks: BackgroundTasks
             duration_seconds=round(duration, 2),
             model=result["metadata"]["model"],
             cached=False,
+            coalesced=coalesced,
         )
     
     except Exception as e:
         # 에러 저장
         db.save_analysis(
             source=request.source,
-            model=request.model or "unknown",
-            log_content=request.log_content,
+            model=model_name,
+            log_content=payload,
             response="",
             duration=time.time() - start_time,
             status="failed",
@@ -319,18 +391,28 @@ async def analyze_log(request: AnalyzeRequest, background_tasks: BackgroundTasks
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
-@app.post("/history", response_model=List[dict])
+@app.post("/history", response_model=Union[List[dict], HistoryPage])
 async def get_history(query: HistoryQuery, _: bool = Depends(verify_api_key)):
-    """분석 히스토리 조회"""
+    """분석 히스토리 조회
+    
+    cursor 필드를 보내면 키셋 페이지({items, next_cursor})로, 없으면 기존처럼 목록으로 응답한다.
+    """
     db = get_database()
-    results = db.list_analyses(
-        limit=query.limit,
-        offset=query.offset,
-        service_name=query.service_name,
-        model=query.model,
-        status=query.status,
-    )
-    return results
+    try:
+        page = db.list_analyses_page(
+            limit=query.limit,
+            cursor=query.cursor,
+            offset=query.offset,
+            service_name=query.service_name,
+            model=query.model,
+            status=query.status,
+            fields=query.fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if "cursor" in query.model_fields_set:
+        return page
+    return page["items"]
 
 
 @app.get("/history/{analysis_id}", response_model=dict)
@@ -377,18 +459,22 @@ async def websocket_analyze(websocket: WebSocket):
                 await websocket.send_json({"error": "log_content is required"})
                 continue
             
-            # 전처리
-            preprocessor = LogPreprocessor()
-            log_content = preprocessor.process(log_content)
+            from bifrost.main import MASTER_PROMPT, PROMPT_VERSION
+            payload = LogPayload(log_content)
             
-            from bifrost.main import MASTER_PROMPT
-            prompt = MASTER_PROMPT.format(log_content=log_content)
+            async def analyze() -> dict:
+                # 전처리
+                preprocessor = LogPreprocessor()
+                prompt = MASTER_PROMPT.format(log_content=preprocessor.process(payload))
+                return await run_analysis(prompt, source, model)
             
             # 스트리밍 분석
             if source == "local":
-                client = OllamaClient(model=model or "mistral")
                 # TODO: WebSocket용 스트리밍 구현
-                result = client.analyze(prompt, stream=False)
+                # 같은 분석이 진행 중이면 함께 기다림 (/analyze 요청과도 합쳐짐)
+                result, _ = await analysis_flight.do(
+                    (payload.sha256, source, resolve_model(source, model), PROMPT_VERSION), analyze, channel="websocket",
+                )
                 await websocket.send_json({
                     "type": "complete",
                     "response": result["response"],
@@ -421,15 +507,17 @@ async def list_api_keys():
 # Kafka 통합 관련 전역 변수
 kafka_consumer_manager = None
 kafka_producer_manager = None
+integration_service = None
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시"""
-    global kafka_consumer_manager, kafka_producer_manager
+    global kafka_consumer_manager, kafka_producer_manager, integration_service
     
     # Database 초기화
     db = get_database()
     db.init_db()
+    metrics.track_result_cache(db.result_cache)
     print("🌈 Bifrost API Server started!")
     
     # Kafka 통합 활성화 (설정 기반)
@@ -478,13 +566,19 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시"""
-    global kafka_consumer_manager, kafka_producer_manager
+    global kafka_consumer_manager, kafka_producer_manager, integration_service
+    
+    # Ollama 커넥션 풀 정리
+    await client_registry.aclose()
     
     # Kafka 리소스 정리
     if kafka_consumer_manager:
         await kafka_consumer_manager.stop()
         print("🛑 Kafka consumer stopped")
     
+    if integration_service:
+        await integration_service.close()  # 저장 대기 중인 분석 결과 flush
+    
     if kafka_producer_manager:
         await kafka_producer_manager.stop()
         print("🛑 Kafka producer stopped")
@@ -526,12 +620,7 @@ async def analyze_web(
         preprocessor = LogPreprocessor()
         processed_log = preprocessor.process(filtered_log)
         
-        if source == "local":
-            client = OllamaClient()
-        else:
-            client = BedrockClient()
-        
-        result = client.analyze(processed_log)
+        result = await run_analysis(processed_log, "local" if source == "local" else "cloud")
         
         # DB 저장
         db = get_database()
@@ -539,6 +628,8 @@ async def analyze_web(
             log_content=log_content,
             response=result.get("response", ""),
             source=source,
+            model=result["metadata"]["model"],
+            duration=result["metadata"]["duration"],
             service_name=service_name,
             environment=environment,
         )
@@ -554,7 +645,7 @@ async def analyze_web(
             
             <div class="stats">
                 <div class="stat-card">
-                    <div class="number">{result.get('model', 'N/A')}</div>
+                    <div class="number">{result['metadata'].get('model', 'N/A')}</div>
                     <div class="label">모델</div>
                 </div>
                 <div class="stat-card">
@@ -582,55 +673,140 @@ async def analyze_web(
         return HTMLResponse(content=error_html, status_code=400)
 
 
+def _export_rows(limit: Optional[int], cursor: Optional[str]):
+    """export 행 스트림 (서버 측 커서) + 다음 커서 (limit이 있고 남은 행이 있을 때)"""
+    db = get_database()
+    try:
+        rows = db.iter_analyses(limit=limit, cursor=cursor)
+        next_cursor = db.cursor_after(limit, cursor) if limit else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return rows, next_cursor
+
+
+def _export_headers(extension: str, next_cursor: Optional[str]) -> Dict[str, str]:
+    headers = {
+        "Content-Disposition": f"attachment; filename=bifrost_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    }
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
+
+
 @app.get("/api/export/csv")
 async def export_csv(
-    limit: int = 100,
+    limit: Optional[int] = Query(None, ge=1, description="최대 행 수 (기본 전체)"),
+    cursor: Optional[str] = None,
     api_key: str = Depends(verify_api_key)
 ):
-    """분석 결과를 CSV로 export"""
-    db = get_database()
-    results = db.get_analysis_history(limit=limit)
-    
-    csv_content = DataExporter.to_csv(results)
-    
+    """분석 결과를 CSV로 export (행 단위 스트리밍, 다음 페이지는 X-Next-Cursor 헤더의 cursor로)"""
+    rows, next_cursor = _export_rows(limit, cursor)
     return StreamingResponse(
-        iter([csv_content]),
+        DataExporter.iter_csv(rows),
         media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=bifrost_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-        }
+        headers=_export_headers("csv", next_cursor),
     )
 
 
 @app.get("/api/export/json")
 async def export_json(
-    limit: int = 100,
+    limit: Optional[int] = Query(None, ge=1, description="최대 행 수 (기본 전체)"),
     pretty: bool = True,
+    cursor: Optional[str] = None,
     api_key: str = Depends(verify_api_key)
 ):
-    """분석 결과를 JSON으로 export"""
-    db = get_database()
-    results = db.get_analysis_history(limit=limit)
+    """분석 결과를 JSON 배열로 export (원소 단위 스트리밍)"""
+    rows, next_cursor = _export_rows(limit, cursor)
+    return StreamingResponse(
+        DataExporter.iter_json(rows, pretty=pretty),
+        media_type="application/json",
+        headers=_export_headers("json", next_cursor),
+    )
+
+
+@app.get("/api/export/ndjson")
+async def export_ndjson(
+    limit: Optional[int] = Query(None, ge=1, description="최대 행 수 (기본 전체)"),
+    cursor: Optional[str] = None,
+    api_key: str = Depends(verify_api_key)
+):
+    """분석 결과를 NDJSON(한 줄에 한 행)으로 export"""
+    rows, next_cursor = _export_rows(limit, cursor)
+    return StreamingResponse(
+        DataExporter.iter_ndjson(rows),
+        media_type="application/x-ndjson",
+        headers=_export_headers("ndjson", next_cursor),
+    )
+
+
+COLUMNAR_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+
+def _iter_file(f, chunk_size: int = 64 * 1024):
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+async def _export_columnar(table: str, fields: Optional[List[str]], format: str) -> StreamingResponse:
+    """Parquet/Arrow 파일을 임시 파일에 레코드 배치 단위로 쓴 뒤 스트리밍
     
-    json_content = DataExporter.to_json(results, pretty=pretty)
+    Parquet 푸터는 끝에 오므로 다 쓴 다음 보낸다. 메모리는 배치 하나 분량.
+    """
+    if not is_columnar_available():
+        raise HTTPException(status_code=503, detail="pyarrow not available. Install with: pip install pyarrow")
+    db = get_database()
+    try:
+        columns = db.export_columns(table, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
+    f = tempfile.TemporaryFile()
+    try:
+        await asyncio.to_thread(
+            DataExporter.write_columnar, columns, db.iter_column_batches(table, fields), f, format
+        )
+        f.seek(0)
+    except BaseException:
+        f.close()
+        raise
     return StreamingResponse(
-        iter([json_content]),
-        media_type="application/json",
-        headers={
-            "Content-Disposition": f"attachment; filename=bifrost_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-        }
+        _iter_file(f),
+        media_type=COLUMNAR_MEDIA_TYPES[format],
+        headers=_export_headers(f"{table}.{format}", None),
     )
 
 
+@app.get("/api/export/parquet")
+async def export_parquet(
+    table: str = "analyses",
+    fields: Optional[List[str]] = Query(None),
+    api_key: str = Depends(verify_api_key)
+):
+    """분석 결과(table=analyses) 또는 메트릭(table=metrics)을 Parquet(zstd)으로 export"""
+    return await _export_columnar(table, fields, "parquet")
+
+
+@app.get("/api/export/arrow")
+async def export_arrow(
+    table: str = "analyses",
+    fields: Optional[List[str]] = Query(None),
+    api_key: str = Depends(verify_api_key)
+):
+    """분석 결과 또는 메트릭을 Arrow IPC 파일로 export"""
+    return await _export_columnar(table, fields, "arrow")
+
+
 @app.post("/api/filter/severity")
 async def filter_by_severity(
     request: FilterSeverityRequest,
     api_key: str = Depends(verify_api_key)
 ):
     """심각도로 필터링"""
-    filtered = LogFilter.filter_by_severity(request.log_content, request.min_level)
-    stats = LogFilter.get_log_statistics(filtered)
+    filtered, stats = LogFilter.filter_with_statistics(request.log_content, request.min_level)
     
     return {
         "filtered_log": filtered,
@@ -644,11 +820,64 @@ async def filter_errors_only(
     api_key: str = Depends(verify_api_key)
 ):
     """에러만 추출"""
-    filtered = LogFilter.extract_errors_only(request.log_content)
+    filtered = LogFilter.pipeline().errors_only().filter(request.log_content)
+    
+    return {
+        "filtered_log": filtered,
+        "line_count": filtered.count('\n') + 1
+    }
+
+
+@app.post("/api/filter/keywords")
+async def filter_by_keywords(
+    request: FilterKeywordsRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """키워드로 필터링"""
+    try:
+        pipeline = LogFilter.pipeline().keywords(
+            request.keywords, request.case_sensitive, request.patterns
+        )
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid pattern: {e}")
+    filtered, stats = pipeline.filter_with_statistics(request.log_content)
+    
+    result = {
+        "filtered_log": filtered,
+        "statistics": stats
+    }
+    if request.include_matches:
+        result["matches"] = [
+            match._asdict() for match in pipeline.keyword_matcher.finditer(request.log_content)
+        ]
+    return result
+
+
+@app.post("/api/filter/query")
+async def filter_query(
+    request: FilterQueryRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """심각도/키워드/시간 범위 복합 필터링 (단일 패스)"""
+    pipeline = LogFilter.pipeline()
+    if request.min_level:
+        pipeline.severity(request.min_level)
+    if request.keywords or request.patterns:
+        try:
+            pipeline.keywords(request.keywords or [], request.case_sensitive, request.patterns)
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid pattern: {e}")
+    if request.start_time or request.end_time:
+        try:
+            pipeline.time_range(request.start_time, request.end_time)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    filtered, stats = pipeline.filter_with_statistics(request.log_content)
     
     return {
         "filtered_log": filtered,
-        "line_count": len(filtered.split('\n'))
+        "statistics": stats
     }
 
 
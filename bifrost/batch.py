@@ -1,20 +1,182 @@
 """배치 로그 분석"""
 
 import asyncio
-import aiofiles
+import hashlib
+import itertools
+import os
+import uuid
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from functools import partial
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Sized, Tuple
 from concurrent.futures import ThreadPoolExecutor
 import time
 
-from bifrost.ollama import OllamaClient
+from bifrost.ollama import OllamaClient, get_ollama_client
 from bifrost.bedrock import BedrockClient, is_bedrock_available
 from bifrost.preprocessor import LogPreprocessor
-from bifrost.database import get_database
+from bifrost.logsource import LogSource, uncompressed_path
+from bifrost.database import Database, get_database
+from bifrost.discovery import FileDiscovery
+from bifrost.writer import AnalysisWriter
+from bifrost.config import Config
+from bifrost.logger import logger
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 
+class _Unlimited:
+    """제한 없는 세마포어 자리 표시자"""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class BatchManifest:
+    """배치 작업 매니페스트 (DB batch_jobs / batch_job_files)
+    
+    파일마다 크기, mtime, 해시, 상태를 기록한다. 재개할 때 크기/mtime이 그대로인 완료 파일은
+    열지도 해시하지도 않고 건너뛴다. 결과는 flush_every건 또는 flush_interval초마다 모아서 저장하고,
+    writer가 아직 커밋하지 않은 분석 결과는 커밋된 뒤에 완료로 기록한다.
+    """
+    
+    DONE = ("success", "cached", "duplicate")
+    
+    def __init__(
+        self,
+        db: Database,
+        job: Dict[str, Any],
+        flush_every: int = 200,
+        flush_interval: float = 1.0,
+        register_every: int = 64,
+    ):
+        self.db = db
+        self.job = job
+        self.flush_every = flush_every
+        self.register_every = register_every
+        self.flush_interval = flush_interval
+        self.skipped = 0
+        self._ids: Dict[str, int] = {}
+        self._waiting: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+    
+    @property
+    def id(self) -> str:
+        return self.job["id"]
+    
+    @classmethod
+    def create(cls, db: Database, directory: Path, pattern: str, source: str, model: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None, **kwargs) -> "BatchManifest":
+        """새 작업 생성 (options: FileDiscovery 조건, 재개할 때 그대로 사용)"""
+        job = db.create_batch_job(
+            uuid.uuid4().hex[:12], os.path.abspath(directory), pattern, source, model, options=options,
+        )
+        return cls(db, job, **kwargs)
+    
+    @classmethod
+    def load(cls, db: Database, job_id: str, **kwargs) -> "BatchManifest":
+        """기존 작업 불러오기 (재개)"""
+        job = db.get_batch_job(job_id)
+        if job is None:
+            raise ValueError(f"배치 작업을 찾을 수 없습니다: {job_id}")
+        return cls(db, job, **kwargs)
+    
+    def plan(self, file_paths: Iterable[Path]) -> Iterator[Path]:
+        """이번에 분석할 파일 (완료된 뒤 바뀌지 않은 파일은 제외)
+        
+        입력을 순회하며 바로 내보낸다. 새 파일/바뀐 파일은 register_every개씩 pending으로
+        등록한 뒤 내보낸다 (결과를 기록할 행 id가 있어야 하므로).
+        """
+        known = self.db.get_batch_job_files(self.id)
+        self._ids = {path: entry["id"] for path, entry in known.items()}
+        self.skipped = 0
+        changes, held = [], []
+        for path in file_paths:
+            key = os.path.abspath(path)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # 탐색 후 삭제됨
+                continue
+            except OSError as e:  # 권한 없음 등: 이 파일만 건너뜀
+                logger.warning("Skipping unreadable batch file", path=key, error=str(e))
+                continue
+            state = {"size_bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            entry = known.get(key)
+            if entry is None:
+                changes.append({"path": key, **state})
+            elif entry["size_bytes"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                changes.append({
+                    "id": entry["id"], **state, "status": "pending",
+                    "log_hash": None, "analysis_id": None, "error_message": None,
+                })
+            elif entry["status"] in self.DONE:
+                self.skipped += 1
+                continue
+            else:
+                yield path
+                continue
+            held.append(path)
+            if len(changes) >= self.register_every:
+                self._register(changes)
+                yield from held
+                changes, held = [], []
+        if changes:
+            self._register(changes)
+            yield from held
+    
+    def _register(self, changes: List[Dict[str, Any]]):
+        new = [change for change in changes if "id" not in change]
+        ids = self.db.save_batch_job_files(self.id, changes)
+        self._ids.update((change["path"], file_id) for change, file_id in zip(new, ids))
+    
+    async def record(self, result: Dict[str, Any]):
+        """파일 결과 기록 (모아서 저장)"""
+        self._waiting.append(result)
+        if len(self._waiting) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            await self.flush()
+    
+    async def flush(self):
+        """커밋이 끝난 결과를 매니페스트에 저장"""
+        ready, waiting = [], []
+        for result in self._waiting:
+            change = self._change_for(result)
+            if change is None:
+                waiting.append(result)
+            elif change["id"] is not None:
+                ready.append(change)
+        self._waiting = waiting
+        self._last_flush = time.monotonic()
+        if ready:
+            await asyncio.to_thread(self.db.save_batch_job_files, self.id, ready)
+    
+    async def finish(self) -> Dict[str, int]:
+        """남은 결과 저장 후 작업 상태 확정, 상태별 파일 수 반환"""
+        await self.flush()
+        return await asyncio.to_thread(self.db.finish_batch_job, self.id, self.DONE)
+    
+    def _change_for(self, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """결과 → batch_job_files 갱신 값 (writer 커밋 대기 중이면 None)"""
+        status, error = result["status"], result.get("error")
+        analysis_id = result.get("analysis_id")
+        if isinstance(analysis_id, asyncio.Future):
+            if not analysis_id.done():
+                return None
+            if analysis_id.exception() is not None:
+                status, error = "failed", f"DB 저장 실패: {analysis_id.exception()}"
+                analysis_id = None
+            else:
+                analysis_id = analysis_id.result()
+        return {
+            "id": self._ids.get(os.path.abspath(result["file"])),
+            "status": status,
+            "analysis_id": analysis_id,
+            "log_hash": result.get("log_hash"),
+            "error_message": error,
+        }
+
+
 class BatchAnalyzer:
     """배치 로그 분석기"""
     
@@ -24,18 +186,47 @@ class BatchAnalyzer:
         model: Optional[str] = None,
         max_workers: int = 4,
         use_cache: bool = True,
+        config: Optional[Config] = None,
     ):
         self.source = source
         self.model = model
         self.max_workers = max_workers
         self.use_cache = use_cache
+        self.config = config or Config()
         self.console = Console()
         self.db = get_database()
+        self.writer = AnalysisWriter.from_settings(self.db, self.config.get("database", {}))
         self.preprocessor = LogPreprocessor()
+        
+        # analyze_files 실행 중에만 사용 (밖에서 _analyze_file을 부르면 제한 없음)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._backend_slots = _Unlimited()
+        self._read_slots = _Unlimited()
+        
+        # 실행 중 중복 제거 (log_hash → 파일 결과, 프롬프트 해시 → 모델 응답)
+        self._by_hash: Dict[str, asyncio.Future] = {}
+        self._by_prompt: Dict[str, asyncio.Future] = {}
     
-    async def analyze_files(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
-        """여러 파일 동시 분석"""
+    async def analyze_files(
+        self,
+        file_paths: Iterable[Path],
+        manifest: Optional[BatchManifest] = None,
+    ) -> List[Dict[str, Any]]:
+        """여러 파일 동시 분석 (워커 max_workers개)
+        
+        경로는 크기 max_workers * 2인 큐로 워커에 넘기므로 목록이 커도 한꺼번에 열지 않는다.
+        file_paths가 지연 이터레이터(FileDiscovery 등)면 찾는 대로 분석을 시작한다.
+        모델 호출과 파일 I/O는 공용 스레드 풀에서 실행하고, 모델 호출 수는 백엔드별 상한
+        (batch.backend_limits), 동시에 읽는 파일 수는 batch.max_open_files로 제한한다.
+        manifest를 주면 파일별 결과를 진행 중에 기록한다 (중단돼도 완료분은 남음).
+        """
         results = []
+        total = len(file_paths) if isinstance(file_paths, Sized) else None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_workers * 2)
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bifrost-batch")
+        self._backend_slots = asyncio.Semaphore(self._backend_limit())
+        self._read_slots = asyncio.Semaphore(self.config.get("batch.max_open_files", 4))
         
         with Progress(
             SpinnerColumn(),
@@ -44,116 +235,273 @@ class BatchAnalyzer:
             TaskProgressColumn(),
             console=self.console,
         ) as progress:
-            task = progress.add_task(f"[cyan]분석 중...", total=len(file_paths))
+            task = progress.add_task(f"[cyan]분석 중...", total=total)
+            
+            async def produce():
+                # 지연 이터레이터(디렉토리 탐색, 매니페스트 확인)는 이벤트 루프를 막지 않도록 스레드에서 몇 개씩
+                paths = iter(file_paths)
+                while chunk := await asyncio.to_thread(list, itertools.islice(paths, 32)):
+                    for file_path in chunk:
+                        await queue.put(file_path)  # 워커가 밀리면 대기 (backpressure)
+                for _ in range(self.max_workers):
+                    await queue.put(None)
             
-            # 비동기 태스크 생성
-            tasks = []
-            for file_path in file_paths:
-                tasks.append(self._analyze_file(file_path))
+            async def work():
+                while (file_path := await queue.get()) is not None:
+                    result = await self._analyze_file(file_path)
+                    results.append(result)
+                    progress.advance(task)
+                    if manifest is not None:
+                        await manifest.record(result)
             
-            # 동시 실행
-            for coro in asyncio.as_completed(tasks):
-                result = await coro
-                results.append(result)
-                progress.advance(task)
+            # 결과 저장은 writer가 모아서 커밋
+            tasks = [asyncio.ensure_future(produce())]
+            tasks += [asyncio.ensure_future(work()) for _ in range(self.max_workers)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # 입력 오류/중단 시 남은 워커를 멈춘 뒤에 writer를 닫음 (닫은 writer를 다시 열지 않도록)
+                for pending in tasks:
+                    pending.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await self.writer.close()
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._backend_slots = self._read_slots = _Unlimited()
+                self._by_hash, self._by_prompt = {}, {}
+                if manifest is not None:
+                    await manifest.flush()
         
+        for result in results:
+            self._resolve_saved(result)
+        if manifest is not None:
+            await manifest.finish()
         return results
     
+    @staticmethod
+    def _resolve_saved(result: Dict[str, Any]):
+        """저장 대기 future → 커밋된 id (저장 실패는 failed로)"""
+        pending = result.get("analysis_id")
+        if not isinstance(pending, asyncio.Future):
+            return
+        if pending.exception() is not None:
+            result.update(status="failed", analysis_id=None, error=f"DB 저장 실패: {pending.exception()}")
+        else:
+            result["analysis_id"] = pending.result()
+    
+    def _backend_limit(self) -> int:
+        """백엔드별 동시 모델 호출 상한 (설정 없으면 워커 수)"""
+        limit = self.config.get(f"batch.backend_limits.{self.source}") or self.max_workers
+        return max(1, min(limit, self.max_workers))
+    
+    async def _run_blocking(self, func, *args):
+        """블로킹 호출을 공용 스레드 풀에서 실행 (analyze_files 밖에서는 기본 풀)"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+    
+    def _model_name(self) -> str:
+        """분석에 사용할 모델명 (캐시 키에도 사용)"""
+        if self.model:
+            return self.model
+        if self.source == "cloud":
+            return "anthropic.claude-3-sonnet-20240229-v1:0"
+        return self.config.get("ollama.model", "mistral")
+    
+    def _ollama_client(self) -> OllamaClient:
+        """공용 풀의 Ollama 클라이언트 (워커 수만큼 커넥션 확보)"""
+        return get_ollama_client(
+            url=self.config.get("ollama.url", "http://localhost:11434"),
+            model=self._model_name(),
+            timeout=self.config.get("ollama.timeout", 120),
+            max_retries=self.config.get("ollama.max_retries", 3),
+            pool_size=max(self.max_workers, self.config.get("ollama.pool_size", 10)),
+        )
+    
     async def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
-        """단일 파일 분석"""
+        """단일 파일 분석
+        
+        같은 실행에서 내용(해시)이 같은 파일을 이미 분석 중이거나 분석했으면 그 결과를
+        공유한다 (status "duplicate", 결과 행 저장 없음). 해시는 달라도 전처리 결과가 같으면
+        모델 호출만 공유하고 결과 행은 각자 저장한다 (shared_call).
+        """
         start_time = time.time()
+        outcome: Optional[asyncio.Future] = None  # 같은 내용 파일들이 기다리는 이 파일의 결과
         
         try:
-            # 파일 읽기 (비동기)
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                log_content = await f.read()
+            from bifrost.main import MASTER_PROMPT, PROMPT_VERSION
             
-            # 캐시 확인
-            if self.use_cache:
-                import hashlib
-                log_hash = hashlib.sha256(log_content.encode()).hexdigest()
-                cached = self.db.get_duplicate_analyses(log_hash, hours=24)
-                
-                if cached:
-                    return {
-                        "file": str(file_path),
-                        "status": "cached",
-                        "analysis_id": cached[0]["id"],
-                        "response": cached[0]["response"],
-                        "duration": time.time() - start_time,
-                        "cached": True,
-                    }
+            # 파일은 mmap으로 열고 해시/전처리/저장 시점에만 필요한 만큼 읽음 (I/O는 스레드에서)
+            shared = None
+            async with self._read_slots:
+                # 압축 로그는 여는 시점에 풀므로 열기/닫기도 스레드에서
+                source = await self._run_blocking(LogSource.open, file_path)
+                try:
+                    log_hash = await self._run_blocking(source.sha256)
+                    
+                    shared = self._by_hash.get(log_hash)
+                    if shared is None:
+                        outcome = self._by_hash[log_hash] = asyncio.get_running_loop().create_future()
+                        
+                        # 캐시 확인 (히트면 본문을 디코딩하지 않음)
+                        cached = None
+                        if self.use_cache:
+                            cached = self.db.get_cached_analysis(log_hash, self._model_name(), PROMPT_VERSION, hours=24)
+                        
+                        if not cached:
+                            # 전처리 (큰 파일은 잘릴 중간 구간을 읽지 않음)
+                            log_content = await self._run_blocking(
+                                lambda: "".join(self.preprocessor.process_source(source))
+                            )
+                            # DB에는 원본 전체를 저장 (원본 기준 해시로 저장해야 다음 실행에서 캐시 히트)
+                            payload = await self._run_blocking(source.payload, log_hash)
+                finally:
+                    await self._run_blocking(source.close)
             
-            # 전처리
-            log_content = self.preprocessor.process(log_content)
+            if shared is not None:
+                # 같은 내용 파일의 결과를 기다림 (파일은 닫고 읽기 슬롯도 놓은 뒤)
+                return self._duplicate_of(file_path, await shared, start_time)
+            
+            if cached:
+                return self._settle(outcome, {
+                    "file": str(file_path),
+                    "status": "cached",
+                    "analysis_id": cached["id"],
+                    "log_hash": log_hash,
+                    "response": cached["response"],
+                    "duration": time.time() - start_time,
+                    "cached": True,
+                })
             
             # 프롬프트
-            from bifrost.main import MASTER_PROMPT
             prompt = MASTER_PROMPT.format(log_content=log_content)
             
-            # 분석 (동기 함수를 비동기로 실행)
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                if self.source == "local":
-                    client = OllamaClient(model=self.model or "mistral")
-                    result = await loop.run_in_executor(
-                        executor,
-                        lambda: client.analyze(prompt, stream=False)
-                    )
-                elif self.source == "cloud":
-                    if not is_bedrock_available():
-                        raise Exception("Bedrock not available")
-                    client = BedrockClient(model_id=self.model or "anthropic.claude-3-sonnet-20240229-v1:0")
-                    result = await loop.run_in_executor(
-                        executor,
-                        lambda: client.analyze(prompt)
-                    )
-                else:
-                    raise ValueError(f"Invalid source: {self.source}")
+            # 분석 (백엔드 상한 안에서 공용 스레드 풀로, 같은 프롬프트는 한 번만)
+            result, shared_call = await self._call_backend_once(prompt)
             
             duration = time.time() - start_time
             
-            # DB 저장
-            analysis_id = self.db.save_analysis(
+            # DB 저장 (다른 파일 결과와 묶어서 커밋, id는 analyze_files가 끝날 때 채움)
+            analysis_id = await self.writer.enqueue_analysis(
                 source=self.source,
                 model=result["metadata"]["model"],
-                log_content=log_content,
+                log_content=payload,
                 response=result["response"],
                 duration=duration,
-                tags=[file_path.stem],
-                service_name=file_path.stem,
+                tags=[uncompressed_path(file_path).stem],
+                service_name=uncompressed_path(file_path).stem,
                 status="completed",
+                prompt_version=PROMPT_VERSION,
             )
             
-            return {
+            return self._settle(outcome, {
                 "file": str(file_path),
                 "status": "success",
                 "analysis_id": analysis_id,
+                "log_hash": log_hash,
                 "response": result["response"],
                 "duration": duration,
                 "cached": False,
-            }
+                "shared_call": shared_call,
+            })
         
         except Exception as e:
-            return {
+            if outcome is not None:
+                del self._by_hash[log_hash]  # 이후 같은 내용 파일은 다시 시도
+            return self._settle(outcome, {
                 "file": str(file_path),
                 "status": "failed",
                 "error": str(e),
                 "duration": time.time() - start_time,
-            }
+            })
+        
+        finally:
+            if outcome is not None and not outcome.done():
+                # 취소됨: 기다리던 같은 내용 파일도 취소
+                del self._by_hash[log_hash]
+                outcome.cancel()
+    
+    @staticmethod
+    def _settle(outcome: Optional[asyncio.Future], result: Dict[str, Any]) -> Dict[str, Any]:
+        """기다리던 같은 내용 파일들에 결과 전달"""
+        if outcome is not None:
+            outcome.set_result(result)
+        return result
     
-    def analyze_directory(self, directory: Path, pattern: str = "*.log") -> List[Dict[str, Any]]:
-        """디렉토리 내 로그 파일 일괄 분석"""
-        log_files = list(directory.glob(pattern))
+    @staticmethod
+    def _duplicate_of(file_path: Path, shared: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """같은 내용 파일의 결과 → 이 파일 결과 (분석/저장 없음)"""
+        result = {
+            **shared,
+            "file": str(file_path),
+            "duration": time.time() - start_time,
+            "duplicate_of": shared["file"],
+            "shared_call": False,
+        }
+        if shared["status"] != "failed":
+            result.update(status="duplicate", cached=False)
+        return result
+    
+    async def _call_backend_once(self, prompt: str) -> Tuple[Dict[str, Any], bool]:
+        """같은 프롬프트 호출이 진행 중이거나 끝났으면 결과 공유, (결과, 공유 여부)"""
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        shared = self._by_prompt.get(key)
+        if shared is not None:
+            return await shared, True
         
-        if not log_files:
-            self.console.print(f"[yellow]⚠️  {directory}에서 {pattern} 파일을 찾을 수 없습니다.[/yellow]")
-            return []
+        call = self._by_prompt[key] = asyncio.get_running_loop().create_future()
+        try:
+            async with self._backend_slots:
+                result = await self._call_backend(prompt)
+        except BaseException as e:
+            # 기다리던 호출에는 같은 예외 (취소면 취소), 이후 같은 프롬프트는 다시 호출
+            del self._by_prompt[key]
+            if isinstance(e, Exception):
+                call.set_exception(e)
+                call.exception()  # 기다리는 쪽이 없어도 "never retrieved" 경고 없음
+            else:
+                call.cancel()
+            raise
+        call.set_result(result)
+        return result, False
+    
+    async def _call_backend(self, prompt: str) -> Dict[str, Any]:
+        """모델 호출 (동기 클라이언트를 스레드에서 실행)"""
+        if self.source == "local":
+            client = self._ollama_client()
+            return await self._run_blocking(lambda: client.analyze(prompt, stream=False))
+        if self.source == "cloud":
+            if not is_bedrock_available():
+                raise Exception("Bedrock not available")
+            client = BedrockClient(model_id=self._model_name())
+            return await self._run_blocking(client.analyze, prompt)
+        raise ValueError(f"Invalid source: {self.source}")
+    
+    def analyze_directory(
+        self,
+        directory: Path,
+        pattern: str = "*.log",
+        manifest: Optional[BatchManifest] = None,
+        **discovery_options,
+    ) -> List[Dict[str, Any]]:
+        """디렉토리 아래 로그 파일 일괄 분석
         
-        self.console.print(f"[cyan]📁 {len(log_files)}개 파일 발견[/cyan]")
+        하위 디렉토리까지 찾는 대로 분석한다 (discovery_options: FileDiscovery 조건).
+        manifest가 있으면 이전 실행에서 완료된 파일은 건너뛴다.
+        """
+        discovery = FileDiscovery(directory, include=[pattern], **discovery_options)
+        log_files: Iterable[Path] = discovery
+        if manifest is not None:
+            log_files = manifest.plan(log_files)
         
         # asyncio 실행
-        return asyncio.run(self.analyze_files(log_files))
+        results = asyncio.run(self.analyze_files(log_files, manifest=manifest))
+        
+        if not discovery.files:
+            self.console.print(f"[yellow]⚠️  {directory}에서 {pattern} 파일을 찾을 수 없습니다.[/yellow]")
+            return []
+        self.console.print(f"[cyan]📁 {discovery.files}개 파일 발견 (디렉토리 {discovery.directories}개)[/cyan]")
+        if manifest is not None and manifest.skipped:
+            self.console.print(f"[blue]⏭️  이전 실행에서 완료된 {manifest.skipped}개 건너뜀[/blue]")
+        return results
 
 
 async def analyze_stream(log_stream: asyncio.Queue, source: str = "local", model: Optional[str] = None):
@@ -162,7 +510,7 @@ async def analyze_stream(log_stream: asyncio.Queue, source: str = "local", model
     preprocessor = LogPreprocessor()
     
     if source == "local":
-        client = OllamaClient(model=model or "mistral")
+        client = get_ollama_client(model=model or "mistral")
     elif source == "cloud":
         client = BedrockClient(model_id=model or "anthropic.claude-3-sonnet-20240229-v1:0")
     else:
@@ -1,7 +1,9 @@
 """AWS Bedrock API 통신 모듈 (v0.2 준비)"""
 
+import asyncio
 import json
 import time
+from concurrent.futures import Executor
 from typing import Dict, Any, Optional
 
 # boto3는 선택적 의존성
@@ -121,6 +123,34 @@ class BedrockClient:
             return False
 
 
+class AsyncBedrockClient:
+    """BedrockClient 비동기 래퍼
+    
+    boto3에는 async API가 없으므로 invoke_model 호출을 executor 스레드로 넘긴다.
+    """
+    
+    def __init__(
+        self,
+        region: str = "us-east-1",
+        model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0",
+        profile: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.client = BedrockClient(region=region, model_id=model_id, profile=profile)
+        self.model_id = model_id
+        self.executor = executor  # None이면 이벤트 루프 기본 executor 사용
+    
+    async def analyze(self, prompt: str) -> Dict[str, Any]:
+        """로그 분석 (executor에서 실행)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.client.analyze, prompt)
+    
+    async def health_check(self) -> bool:
+        """Bedrock 사용 가능 여부 확인"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.client.health_check)
+
+
 def is_bedrock_available() -> bool:
     """Bedrock 사용 가능 여부 (boto3 설치 확인)"""
     return BEDROCK_AVAILABLE
@@ -2,89 +2,391 @@
 
 import hashlib
 import json
-from typing import Optional, Any, Dict
-from datetime import datetime, timedelta
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Dict, Hashable, Iterator, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
 
+from bifrost.logger import logger
+
+
+# 레코드 헤더: 종류(1=값, 0=삭제), cached_at(epoch 초), 키 SHA-256, 값 길이
+_RECORD_HEADER = struct.Struct('<Bd32sI')
+_LIVE, _TOMBSTONE = 1, 0
+
+
+class _Shard:
+    """추가 전용 세그먼트 파일 하나 (레코드 = 헤더 + 압축 없는 JSON 값)
+    
+    index/live_bytes/dead_bytes는 이 샤드의 lock을 잡고만 바꾼다.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        # 키 해시 → (값 오프셋, 값 길이, cached_at)
+        self.index: Dict[bytes, Tuple[int, int, float]] = {}
+        self.size = 0
+        self.live_bytes = 0
+        self.dead_bytes = 0  # 덮어쓰기/삭제로 더 이상 참조되지 않는 바이트
+        self.compacting = False
+    
+    def append(self, kind: int, cached_at: float, digest: bytes, value: bytes) -> int:
+        """레코드 추가 → 값 오프셋"""
+        os.write(self.fd, _RECORD_HEADER.pack(kind, cached_at, digest, len(value)) + value)
+        offset = self.size + _RECORD_HEADER.size
+        self.size += _RECORD_HEADER.size + len(value)
+        return offset
+    
+    def forget(self, digest: bytes) -> bool:
+        """인덱스에서 빼고 죽은 바이트로 계산 (있었으면 True)"""
+        previous = self.index.pop(digest, None)
+        if previous is None:
+            return False
+        size = _RECORD_HEADER.size + previous[1]
+        self.live_bytes -= size
+        self.dead_bytes += size
+        return True
+    
+    def scan(self) -> Iterator[Tuple[int, float, bytes, int, int]]:
+        """(종류, cached_at, 키, 값 오프셋, 값 길이) 순회. 잘린 마지막 레코드는 잘라냄"""
+        file_size = os.fstat(self.fd).st_size
+        pos = 0
+        with open(self.path, 'rb') as f:
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                kind, cached_at, digest, length = _RECORD_HEADER.unpack(header)
+                offset = pos + _RECORD_HEADER.size
+                if f.seek(length, os.SEEK_CUR) > file_size:
+                    break
+                yield kind, cached_at, digest, offset, length
+                pos = offset + length
+        if pos < file_size:
+            # 쓰다 중단된 레코드
+            os.truncate(self.path, pos)
+        self.size = pos
+    
+    def read(self, offset: int, length: int) -> bytes:
+        return os.pread(self.fd, length, offset)
+    
+    def close(self):
+        os.close(self.fd)
+
 
 class CacheManager:
-    """파일 기반 캐시 (Redis 대안)"""
+    """파일 기반 캐시 (Redis 대안)
+    
+    키마다 JSON 파일을 만들지 않고, 키 해시로 나눈 샤드별 추가 전용 파일에
+    (바이너리 헤더 + 값) 레코드를 이어 쓴다. 시작할 때 헤더만 읽어 샤드별 메모리 인덱스
+    (키 해시 → 오프셋, 길이, cached_at)를 만들고, 이후 조회는 pread 한 번,
+    통계와 만료 정리는 인덱스만 본다. 덮어쓰기/삭제로 샤드의 죽은 바이트가
+    절반을 넘으면 백그라운드 스레드에서 살아있는 레코드만 새 파일로 옮긴다.
+    예전 형식(키별 *.json 파일)은 처음 열 때 샤드로 옮긴다.
+    
+    키 해시 → 샤드 배정은 샤드 수에 따라 정해지므로 샤드 수를 디렉토리(SHARDS 파일)에
+    기록한다. shards=를 생략하면 기록된 수를 쓰고, 다른 수를 주면 ValueError
+    (다른 샤드 수로 열면 기존 레코드와 삭제 표시가 엉뚱한 샤드에 남기 때문).
+    """
+    
+    SHARDS = 16
+    SHARDS_FILE = "SHARDS"
+    COMPACT_MIN_BYTES = 1024 * 1024  # 이보다 작은 샤드는 압축하지 않음
     
-    def __init__(self, cache_dir: str = ".cache", ttl_hours: int = 24):
+    def __init__(self, cache_dir: str = ".cache", ttl_hours: int = 24, shards: Optional[int] = None):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.ttl_hours = ttl_hours
+        self.ttl_seconds = ttl_hours * 3600
+        self._shards = [
+            _Shard(self.cache_dir / f"shard-{i:02x}.dat") for i in range(self._shard_count(shards))
+        ]
+        
+        for shard in self._shards:
+            self._load(shard)
+        self._import_legacy()
+    
+    def _shard_count(self, shards: Optional[int]) -> int:
+        """디렉토리에 기록된 샤드 수 확인 (처음 여는 디렉토리면 기록)"""
+        path = self.cache_dir / self.SHARDS_FILE
+        try:
+            stored = int(path.read_text())
+        except FileNotFoundError:
+            # SHARDS 파일 이전에 만든 디렉토리는 샤드 파일 수로 판단
+            stored = len(list(self.cache_dir.glob("shard-*.dat"))) or None
+        if stored is not None and shards is not None and shards != stored:
+            raise ValueError(
+                f"캐시 디렉토리 {self.cache_dir}는 샤드 {stored}개로 만들어졌습니다 (요청: {shards}개). "
+                f"같은 샤드 수로 열거나 디렉토리를 비우세요"
+            )
+        count = shards or stored or self.SHARDS
+        if not path.exists():
+            path.write_text(str(count))
+        return count
     
-    def _get_cache_path(self, key: str) -> Path:
-        """캐시 파일 경로"""
-        hash_key = hashlib.sha256(key.encode()).hexdigest()
-        return self.cache_dir / f"{hash_key}.json"
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.sha256(key.encode()).digest()
+    
+    def _shard_of(self, digest: bytes) -> int:
+        return digest[0] % len(self._shards)
+    
+    @staticmethod
+    def _load(shard: _Shard):
+        """샤드 헤더를 훑어 인덱스 구성 (나중 레코드가 앞 레코드를 덮음)"""
+        for kind, cached_at, digest, offset, length in shard.scan():
+            shard.forget(digest)
+            if kind == _LIVE:
+                shard.index[digest] = (offset, length, cached_at)
+                shard.live_bytes += _RECORD_HEADER.size + length
+            else:
+                shard.dead_bytes += _RECORD_HEADER.size
+    
+    def _import_legacy(self):
+        """키별 JSON 파일(이전 형식, 파일명 = 키 SHA-256 hex) → 샤드
+        
+        옮긴 파일만 지운다. 샤드에 이미 같은 키가 있으면 샤드 쪽이 최신이므로 옮긴 것으로 본다.
+        형식이 다르거나 읽지 못한 파일은 경고만 남기고 그대로 둔다.
+        """
+        for legacy in self.cache_dir.glob("*.json"):
+            if not _is_sha256_hex(legacy.stem):
+                continue
+            digest = bytes.fromhex(legacy.stem)
+            try:
+                if digest not in self._shards[self._shard_of(digest)].index:
+                    with open(legacy, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    cached_at = datetime.fromisoformat(data["cached_at"]).replace(tzinfo=timezone.utc).timestamp()
+                    self._put(digest, data["value"], cached_at)
+            except Exception as e:
+                logger.warning("Skipping unreadable legacy cache file", path=str(legacy), error=str(e))
+                continue
+            legacy.unlink()
+    
+    def _expired(self, cached_at: float) -> bool:
+        return time.time() - cached_at > self.ttl_seconds
     
     def get(self, key: str) -> Optional[Any]:
         """캐시 조회"""
-        cache_file = self._get_cache_path(key)
-        
-        if not cache_file.exists():
-            return None
-        
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        digest = self._digest(key)
+        shard = self._shards[self._shard_of(digest)]
+        while True:
+            entry = shard.index.get(digest)
+            if entry is None:
+                return None
             
+            offset, length, cached_at = entry
             # TTL 확인
-            cached_at = datetime.fromisoformat(data["cached_at"])
-            if datetime.utcnow() - cached_at > timedelta(hours=self.ttl_hours):
-                cache_file.unlink()  # 만료된 캐시 삭제
+            if self._expired(cached_at):
+                self._delete(digest, expected=entry)  # 만료된 캐시 삭제
                 return None
             
-            return data["value"]
-        
-        except Exception:
-            return None
+            try:
+                with shard.lock:
+                    if shard.index.get(digest) is not entry:
+                        continue  # 읽는 사이 덮어쓰기/압축됨 (lock을 놓고 다시 조회)
+                    data = shard.read(offset, length)
+                return json.loads(data)
+            except Exception:
+                return None
     
     def set(self, key: str, value: Any):
         """캐시 저장"""
-        cache_file = self._get_cache_path(key)
-        
-        data = {
-            "cached_at": datetime.utcnow().isoformat(),
-            "value": value,
-        }
-        
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._put(self._digest(key), value, time.time())
+    
+    def _put(self, digest: bytes, value: Any, cached_at: float):
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        number = self._shard_of(digest)
+        shard = self._shards[number]
+        with shard.lock:
+            offset = shard.append(_LIVE, cached_at, digest, data)
+            shard.forget(digest)
+            shard.index[digest] = (offset, len(data), cached_at)
+            shard.live_bytes += _RECORD_HEADER.size + len(data)
+        self._maybe_compact(number)
     
     def delete(self, key: str):
         """캐시 삭제"""
-        cache_file = self._get_cache_path(key)
-        if cache_file.exists():
-            cache_file.unlink()
+        self._delete(self._digest(key))
+    
+    def _delete(self, digest: bytes, expected: Optional[Tuple[int, int, float]] = None):
+        """삭제 (expected를 주면 인덱스 항목이 그대로일 때만)"""
+        number = self._shard_of(digest)
+        shard = self._shards[number]
+        with shard.lock:
+            if expected is not None and shard.index.get(digest) is not expected:
+                return  # 그사이 새 값이 저장됨
+            if not shard.forget(digest):
+                return
+            shard.append(_TOMBSTONE, 0.0, digest, b"")
+            shard.dead_bytes += _RECORD_HEADER.size
+        self._maybe_compact(number)
     
     def clear_expired(self):
-        """만료된 캐시 정리"""
-        count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                cached_at = datetime.fromisoformat(data["cached_at"])
-                if datetime.utcnow() - cached_at > timedelta(hours=self.ttl_hours):
-                    cache_file.unlink()
-                    count += 1
-            except:
-                cache_file.unlink()
-                count += 1
-        
-        return count
+        """만료된 캐시 정리 (인덱스의 cached_at만 확인, 파일은 읽지 않음)"""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [(digest, entry) for digest, entry in shard.index.items() if self._expired(entry[2])]
+            for digest, entry in expired:
+                self._delete(digest, expected=entry)
+            removed += len(expired)
+        return removed
     
     def stats(self) -> Dict[str, int]:
-        """캐시 통계"""
-        files = list(self.cache_dir.glob("*.json"))
-        total_size = sum(f.stat().st_size for f in files)
-        
+        """캐시 통계 (인덱스 카운터, O(샤드 수))"""
         return {
-            "total_entries": len(files),
-            "total_size_bytes": total_size,
+            "total_entries": sum(len(shard.index) for shard in self._shards),
+            "total_size_bytes": sum(shard.live_bytes for shard in self._shards),
+            "file_size_bytes": sum(shard.size for shard in self._shards),
+            "shards": len(self._shards),
             "cache_dir": str(self.cache_dir),
         }
+    
+    def _maybe_compact(self, number: int):
+        """죽은 바이트가 절반을 넘으면 백그라운드 압축"""
+        shard = self._shards[number]
+        if shard.compacting or shard.size < self.COMPACT_MIN_BYTES or shard.dead_bytes * 2 < shard.size:
+            return
+        shard.compacting = True
+        threading.Thread(target=self._compact, args=(number,), daemon=True, name=f"cache-compact-{number}").start()
+    
+    def compact(self):
+        """모든 샤드 즉시 압축"""
+        for number in range(len(self._shards)):
+            self._compact(number)
+    
+    def _compact(self, number: int):
+        """살아있는 레코드만 새 파일로 옮긴 뒤 원자적으로 교체
+        
+        샤드 인덱스는 이 샤드의 lock 아래에서만 바뀌므로 다른 샤드 쓰기와 겹쳐도 안전하다.
+        """
+        shard = self._shards[number]
+        try:
+            with shard.lock:
+                tmp_path = shard.path.with_suffix(".compact")
+                moved = {}
+                with open(tmp_path, 'wb') as out:
+                    pos = 0
+                    for digest, (offset, length, cached_at) in shard.index.items():
+                        out.write(_RECORD_HEADER.pack(_LIVE, cached_at, digest, length))
+                        out.write(shard.read(offset, length))
+                        moved[digest] = (pos + _RECORD_HEADER.size, length, cached_at)
+                        pos += _RECORD_HEADER.size + length
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(tmp_path, shard.path)
+                
+                shard.close()
+                shard.fd = os.open(shard.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+                shard.size = pos
+                shard.dead_bytes = 0
+                shard.index.update(moved)
+        finally:
+            shard.compacting = False
+    
+    def close(self):
+        """샤드 파일 닫기"""
+        for shard in self._shards:
+            with shard.lock:
+                shard.close()
+
+
+def _is_sha256_hex(name: str) -> bool:
+    return len(name) == 64 and all(c in "0123456789abcdefABCDEF" for c in name)
+
+
+class LRUCache:
+    """메모리 LRU 캐시 (항목 수 / 바이트 예산 / TTL 제한)
+    
+    DB 조회 앞단의 프로세스 내 캐시. 항목 수나 바이트 예산을 넘으면
+    가장 오래 사용되지 않은 항목부터 제거한다.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 24 * 3600,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (value, size_bytes, stored_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (히트 시 최근 사용으로 갱신)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, size, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, size: int = 0):
+        """캐시 저장 (size: 바이트 예산 계산용 크기)"""
+        if size > self.max_bytes:
+            return  # 예산보다 큰 항목은 캐시하지 않음
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = (value, size, time.monotonic())
+            self.total_bytes += size
+            
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def delete(self, key: Hashable):
+        """캐시 삭제"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
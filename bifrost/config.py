@@ -12,6 +12,7 @@ DEFAULT_CONFIG = {
         "model": "mistral",
         "timeout": 120,
         "max_retries": 3,
+        "pool_size": 10,  # (url, model)별 keep-alive 커넥션 수
     },
     "bedrock": {
         "region": "us-east-1",
@@ -22,6 +23,42 @@ DEFAULT_CONFIG = {
         "max_size_mb": 5,
         "truncate": True,
         "remove_timestamps": False,
+        "timestamp_formats": {},  # 추가 타임스탬프 포맷 (이름: 정규식)
+    },
+    # 분석 결과 메모리 캐시 (DB 조회 앞단 LRU)
+    "cache": {
+        "memory_entries": 1024,
+        "memory_max_mb": 64,
+        "ttl_hours": 24,
+    },
+    # 데이터베이스 연결 튜닝 + 분석 결과 저장 (write-behind 버퍼: 배치/Kafka 경로)
+    "database": {
+        # SQLite 연결 프라그마 (값을 null로 두면 SQLite 기본값)
+        "sqlite": {
+            "journal_mode": "WAL",     # 읽기/쓰기 동시 진행
+            "synchronous": "NORMAL",
+            "busy_timeout": 15000,     # ms
+            "cache_size": -65536,      # 음수는 KiB (64 MB)
+            "mmap_size": 268435456,    # 256 MB
+            "temp_store": "MEMORY",
+        },
+        # PostgreSQL 커넥션 풀
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_recycle": 1800,          # 초, 이보다 오래된 커넥션은 다시 연결
+        "pool_timeout": 30,            # 초, 풀이 가득 찼을 때 대기
+        "write_batch": 500,            # 한 트랜잭션에 모을 최대 행 수
+        "write_delay_ms": 50,          # 첫 행 이후 최대 대기 시간
+        "write_durability": "commit",  # commit: 커밋 후 반환 / buffered: 즉시 반환 (종료 시 유실 가능)
+        "write_max_pending": 10000,    # 버퍼 상한 (가득 차면 저장 호출이 대기)
+    },
+    # 배치 분석 (bifrost batch)
+    "batch": {
+        "backend_limits": {  # 백엔드별 동시 모델 호출 상한 (--workers보다 크면 워커 수)
+            "local": 4,
+            "cloud": 16,
+        },
+        "max_open_files": 4,  # 동시에 읽는(해시/전처리) 파일 수
     },
     "output": {
         "format": "markdown",  # markdown, json, plain
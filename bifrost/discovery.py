@@ -0,0 +1,124 @@
+"""배치 입력 파일 탐색 (os.scandir 기반, 찾는 대로 내보냄)"""
+
+import os
+import re
+from fnmatch import translate
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Optional, Sequence, Union
+
+from bifrost.logger import logger
+from bifrost.logsource import COMPRESSED_SUFFIXES
+
+
+class FileDiscovery:
+    """디렉토리 아래 로그 파일 순회
+
+    전체 목록을 만들지 않고 os.scandir로 디렉토리를 하나씩 읽으며 조건에 맞는 파일을
+    바로 내보낸다. 배치 분석은 첫 파일이 나오는 즉시 시작한다.
+
+    - include: 파일명(패턴에 '/'가 있으면 루트 기준 상대 경로의 끝부분)에 맞출 glob.
+      압축 로그(.gz/.zst)는 확장자를 뗀 이름으로도 맞춘다 (app.log.gz ← *.log)
+    - exclude: 맞으면 파일은 건너뛰고 디렉토리는 내려가지 않음
+    - min_size / max_size: 디스크상 바이트 크기 (압축 파일은 압축된 크기)
+    - newer_than / older_than: mtime (epoch 초)
+
+    심볼릭 링크 디렉토리는 따라가지 않는다 (순환 방지). 읽을 수 없는 디렉토리는 경고 후 건너뜀.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        include: Sequence[str] = ("*.log",),
+        exclude: Sequence[str] = (),
+        recursive: bool = True,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        newer_than: Optional[float] = None,
+        older_than: Optional[float] = None,
+    ):
+        self.root = Path(root)
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self._include = _compile(self.include)
+        self._exclude = _compile(self.exclude)
+        self.recursive = recursive
+        self.min_size = min_size
+        self.max_size = max_size
+        self.newer_than = newer_than
+        self.older_than = older_than
+
+        # 탐색 통계
+        self.files = 0
+        self.directories = 0
+        self.errors = 0
+
+    def __iter__(self) -> Iterator[Path]:
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            self.directories += 1
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.recursive and not self._excluded(entry):
+                                    subdirs.append(entry.path)
+                            elif entry.is_file() and self._accepts(entry):
+                                self.files += 1
+                                yield Path(entry.path)
+                        except OSError as e:
+                            # 탐색 중 사라진 파일 등
+                            self.errors += 1
+                            logger.warning("Skipping unreadable entry", path=entry.path, error=str(e))
+            except OSError as e:
+                self.errors += 1
+                logger.warning("Skipping unreadable directory", path=str(directory), error=str(e))
+                continue
+            # 이름순으로 내려가도록 역순으로 쌓음
+            stack.extend(sorted(subdirs, reverse=True))
+
+    def _relative(self, entry: os.DirEntry) -> str:
+        return os.path.relpath(entry.path, self.root).replace(os.sep, "/")
+
+    def _matches(self, entry: os.DirEntry, patterns) -> bool:
+        name_pattern, path_patterns = patterns
+        names = [entry.name]
+        if entry.name.endswith(COMPRESSED_SUFFIXES):
+            names.append(os.path.splitext(entry.name)[0])
+        if name_pattern is not None and any(name_pattern.match(name) for name in names):
+            return True
+        if path_patterns:
+            # 경로 패턴: 구분자 단위로 뒤에서부터 맞춤 (*는 '/'를 넘지 않음)
+            relative = self._relative(entry)
+            candidates = [relative] + ([os.path.splitext(relative)[0]] if len(names) > 1 else [])
+            return any(PurePosixPath(c).match(p) for c in candidates for p in path_patterns)
+        return False
+
+    def _excluded(self, entry: os.DirEntry) -> bool:
+        return bool(self.exclude) and self._matches(entry, self._exclude)
+
+    def _accepts(self, entry: os.DirEntry) -> bool:
+        if not self._matches(entry, self._include) or self._excluded(entry):
+            return False
+        if self.min_size is None and self.max_size is None and self.newer_than is None and self.older_than is None:
+            return True
+
+        stat = entry.stat()  # DirEntry가 캐시 (필터가 있을 때만 stat)
+        if self.min_size is not None and stat.st_size < self.min_size:
+            return False
+        if self.max_size is not None and stat.st_size > self.max_size:
+            return False
+        if self.newer_than is not None and stat.st_mtime < self.newer_than:
+            return False
+        if self.older_than is not None and stat.st_mtime > self.older_than:
+            return False
+        return True
+
+
+def _compile(patterns: Sequence[str]):
+    """glob 목록 → (파일명 패턴 합친 정규식, 경로 패턴 목록)"""
+    names = [translate(pattern) for pattern in patterns if "/" not in pattern]
+    paths = [pattern for pattern in patterns if "/" in pattern]
+    return (re.compile("|".join(names)) if names else None), paths
@@ -2,59 +2,108 @@
 
 import csv
 import json
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any
 from io import StringIO
 from datetime import datetime
 
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Integer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성: 없으면 Parquet/Arrow export 불가
+    pa = None
+
+
+# CSV 필드 정의
+CSV_FIELDS = [
+    'id',
+    'created_at',
+    'source',
+    'model',
+    'service_name',
+    'environment',
+    'response_preview',
+    'duration',
+    'tokens_used',
+    'cached',
+    'tags',
+]
+
+# 스트리밍 출력 조각 크기 (행마다 보내지 않고 모아서)
+_FLUSH_BYTES = 64 * 1024
+
+# 컬럼 포맷 (Parquet, Arrow IPC 파일)
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+def is_columnar_available() -> bool:
+    """Parquet/Arrow export 가능 여부 (pyarrow 설치 확인)"""
+    return pa is not None
+
+
+def arrow_schema(columns: List[Column]):
+    """SQLAlchemy 컬럼 → Arrow 스키마 (JSON 컬럼은 JSON 문자열)"""
+    fields = []
+    for column in columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
 
 class DataExporter:
-    """데이터 export 유틸리티"""
+    """데이터 export 유틸리티
+    
+    iter_* 메서드는 행 이터레이터(Database.iter_analyses 등)를 받아 출력 조각을
+    yield 하므로 전체 문서를 메모리에 만들지 않는다. to_*는 그 결과를 합친 문자열.
+    """
     
     @staticmethod
     def to_csv(results: List[Dict[str, Any]]) -> str:
         """분석 결과를 CSV로 변환"""
         if not results:
             return ""
-        
+        return "".join(DataExporter.iter_csv(results))
+    
+    @staticmethod
+    def iter_csv(results: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """CSV 스트리밍 (헤더 먼저, 이후 행 단위)"""
         output = StringIO()
-        
-        # 필드 정의
-        fieldnames = [
-            'id',
-            'created_at',
-            'source',
-            'model',
-            'service_name',
-            'environment',
-            'log_preview',
-            'response_preview',
-            'duration',
-            'tokens_used',
-            'cached',
-            'tags',
-        ]
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
         writer.writeheader()
         
         for result in results:
-            row = {
-                'id': result.get('id', ''),
-                'created_at': result.get('created_at', ''),
-                'source': result.get('source', ''),
-                'model': result.get('model', ''),
-                'service_name': result.get('service_name', ''),
-                'environment': result.get('environment', ''),
-                'log_preview': DataExporter._truncate(result.get('log_content', ''), 100),
-                'response_preview': DataExporter._truncate(result.get('response', ''), 200),
-                'duration': result.get('duration', ''),
-                'tokens_used': result.get('tokens_used', ''),
-                'cached': result.get('cached', False),
-                'tags': ','.join(result.get('tags', [])),
-            }
-            writer.writerow(row)
-        
-        return output.getvalue()
+            writer.writerow(DataExporter._csv_row(result))
+            if output.tell() >= _FLUSH_BYTES:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
+    
+    @staticmethod
+    def _csv_row(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': result.get('id', ''),
+            'created_at': result.get('created_at', ''),
+            'source': result.get('source', ''),
+            'model': result.get('model', ''),
+            'service_name': result.get('service_name', ''),
+            'environment': result.get('environment', ''),
+            'response_preview': DataExporter._truncate(result.get('response', ''), 200),
+            'duration': result.get('duration', result.get('duration_seconds', '')),
+            'tokens_used': result.get('tokens_used', ''),
+            'cached': result.get('cached', False),
+            'tags': ','.join(result.get('tags') or []),
+        }
     
     @staticmethod
     def to_json(results: List[Dict[str, Any]], pretty: bool = True) -> str:
@@ -63,6 +112,90 @@ class DataExporter:
             return json.dumps(results, indent=2, ensure_ascii=False, default=str)
         return json.dumps(results, ensure_ascii=False, default=str)
     
+    @staticmethod
+    def iter_json(results: Iterable[Dict[str, Any]], pretty: bool = True) -> Iterator[str]:
+        """JSON 배열 스트리밍 (to_json과 같은 출력을 원소 단위로)"""
+        if pretty:
+            opening, separator, closing = "[\n  ", ",\n  ", "\n]"
+        else:
+            opening, separator, closing = "[", ", ", "]"
+        
+        encoder = json.JSONEncoder(indent=2 if pretty else None, ensure_ascii=False, default=str)
+        buffer: List[str] = []
+        size = 0
+        prefix = opening
+        for result in results:
+            item = encoder.encode(result)
+            if pretty:
+                item = item.replace("\n", "\n  ")
+            buffer.append(prefix + item)
+            size += len(item)
+            prefix = separator
+            if size >= _FLUSH_BYTES:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+        
+        if prefix is opening:
+            yield "[]"
+            return
+        buffer.append(closing)
+        yield "".join(buffer)
+    
+    @staticmethod
+    def iter_ndjson(results: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """NDJSON 스트리밍 (한 줄에 한 행)"""
+        encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+        buffer: List[str] = []
+        size = 0
+        for result in results:
+            line = encoder.encode(result) + "\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= _FLUSH_BYTES:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+    
+    @staticmethod
+    def write_columnar(
+        columns: List[Column],
+        batches: Iterable[Dict[str, list]],
+        sink: Any,
+        format: str = "parquet",
+    ) -> int:
+        """컬럼 배치(Database.iter_column_batches) → Parquet / Arrow IPC 파일
+        
+        배치마다 레코드 배치 하나(Parquet은 row group 하나)로 쓰므로 메모리는 배치 하나 분량.
+        sink는 경로 또는 바이너리 파일 객체. 쓴 행 수를 반환.
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow가 설치되지 않았습니다.\n설치: pip install pyarrow")
+        if format not in COLUMNAR_FORMATS:
+            raise ValueError(f"알 수 없는 포맷: {format} (가능: {', '.join(COLUMNAR_FORMATS)})")
+        
+        schema = arrow_schema(columns)
+        json_columns = {column.name for column in columns if isinstance(column.type, JSON)}
+        if format == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(sink, schema)
+        
+        rows = 0
+        with writer:
+            for batch in batches:
+                for name in json_columns:
+                    batch[name] = [
+                        None if value is None else json.dumps(value, ensure_ascii=False)
+                        for value in batch[name]
+                    ]
+                record = pa.RecordBatch.from_pydict(batch, schema=schema)
+                writer.write_batch(record)
+                rows += record.num_rows
+        return rows
+    
     @staticmethod
     def to_markdown_table(results: List[Dict[str, Any]]) -> str:
         """Markdown 테이블로 변환"""
@@ -1,9 +1,13 @@
 """로그 필터링"""
 
 import re
-from typing import List, Optional
+from collections import Counter
+from typing import Counter as CounterType, Iterable, Iterator, List, Optional, Tuple
 from enum import Enum
 
+from bifrost.keywords import KeywordMatcher, get_keyword_matcher
+from bifrost.timeindex import TimeValue, parse_timestamp, to_epoch
+
 
 class SeverityLevel(str, Enum):
     """로그 심각도"""
@@ -17,6 +21,13 @@ class SeverityLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+# 심각도 키워드 (대문자 변환된 줄 대상)
+# 기존 3개 패턴 중 [LEVEL]은 \bLEVEL\b에 포함되고 level= 패턴은 대문자 줄에서
+# 매칭될 수 없어 하나로 합쳤다. 대안의 첫 글자로 sre가 후보 위치만 검사한다.
+_SEVERITY_PATTERN = re.compile(
+    r'\b(?:TRACE|DEBUG|INFO|WARN(?:ING)?|ERROR|FATAL|CRITICAL)\b'
+)
+
 class LogFilter:
     """로그 필터"""
     
@@ -32,109 +43,63 @@ class LogFilter:
         "CRITICAL": 5,
     }
     
+    @staticmethod
+    def pipeline() -> "LogFilterPipeline":
+        """조건을 모아 한 번에 적용하는 필터 파이프라인
+        
+        예: LogFilter.pipeline().severity(SeverityLevel.WARN).keywords(["db"]).filter(log)
+        """
+        return LogFilterPipeline()
+    
     @staticmethod
     def filter_by_severity(
         log_content: str,
         min_level: SeverityLevel = SeverityLevel.INFO
     ) -> str:
         """심각도로 필터링"""
-        lines = log_content.split('\n')
-        filtered_lines = []
-        
-        min_priority = LogFilter.SEVERITY_PRIORITY.get(min_level.value, 2)
-        
-        for line in lines:
-            # 심각도 감지
-            severity = LogFilter._detect_severity(line)
-            
-            if severity:
-                priority = LogFilter.SEVERITY_PRIORITY.get(severity, 0)
-                if priority >= min_priority:
-                    filtered_lines.append(line)
-            else:
-                # 심각도 없는 줄은 포함 (컨텍스트)
-                filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
+        return LogFilter.pipeline().severity(min_level).filter(log_content)
+    
+    @staticmethod
+    def filter_with_statistics(
+        log_content: str,
+        min_level: SeverityLevel = SeverityLevel.INFO
+    ) -> Tuple[str, dict]:
+        """심각도로 필터링 + 결과 통계 (분류 1회)"""
+        return LogFilter.pipeline().severity(min_level).filter_with_statistics(log_content)
     
     @staticmethod
     def _detect_severity(line: str) -> Optional[str]:
         """라인에서 심각도 추출"""
-        # 대소문자 무시
-        line_upper = line.upper()
-        
-        # 패턴 매칭
-        patterns = [
-            r'\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b',
-            r'\[(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\]',
-            r'level[=:]?\s*(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, line_upper)
-            if match:
-                return match.group(1)
+        match = _SEVERITY_PATTERN.search(line.upper())
+        return match.group() if match else None
+    
+    @staticmethod
+    def classify_lines(log_content: str) -> List[Optional[str]]:
+        """전체 줄 심각도 일괄 분류 (log_content.split('\\n')과 같은 인덱스)
         
-        return None
+        버퍼 전체를 한 번에 대문자로 바꾸고, 사전 컴파일된 패턴 하나를 줄마다 적용한다.
+        """
+        search = _SEVERITY_PATTERN.search
+        return [match and match.group() for match in map(search, log_content.upper().split('\n'))]
     
     @staticmethod
     def filter_by_keyword(
         log_content: str,
         keywords: List[str],
-        case_sensitive: bool = False
+        case_sensitive: bool = False,
+        patterns: Optional[List[str]] = None
     ) -> str:
-        """키워드로 필터링"""
-        lines = log_content.split('\n')
-        filtered_lines = []
-        
-        for line in lines:
-            search_line = line if case_sensitive else line.lower()
-            search_keywords = keywords if case_sensitive else [k.lower() for k in keywords]
-            
-            if any(keyword in search_line for keyword in search_keywords):
-                filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
+        """키워드로 필터링 (patterns: 정규식 키워드)"""
+        return LogFilter.pipeline().keywords(keywords, case_sensitive, patterns).filter(log_content)
     
     @staticmethod
     def filter_by_time_range(
         log_content: str,
-        start_time: Optional[str] = None,
-        end_time: Optional[str] = None
+        start_time: Optional[TimeValue] = None,
+        end_time: Optional[TimeValue] = None
     ) -> str:
-        """시간 범위로 필터링 (간단한 구현)"""
-        # 타임스탬프 패턴 (ISO 8601, 일반적인 형식)
-        timestamp_patterns = [
-            r'\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}',
-            r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}',
-        ]
-        
-        lines = log_content.split('\n')
-        filtered_lines = []
-        
-        for line in lines:
-            # 타임스탬프 추출
-            timestamp = None
-            for pattern in timestamp_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    timestamp = match.group(0)
-                    break
-            
-            # 타임스탬프 없으면 포함
-            if not timestamp:
-                filtered_lines.append(line)
-                continue
-            
-            # 범위 체크 (간단한 문자열 비교)
-            if start_time and timestamp < start_time:
-                continue
-            if end_time and timestamp > end_time:
-                continue
-            
-            filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
+        """시간 범위로 필터링 (타임스탬프 없는 줄은 유지)"""
+        return LogFilter.pipeline().time_range(start_time, end_time).filter(log_content)
     
     @staticmethod
     def extract_errors_only(log_content: str) -> str:
@@ -147,33 +112,160 @@ class LogFilter:
     @staticmethod
     def get_log_statistics(log_content: str) -> dict:
         """로그 통계"""
-        lines = log_content.split('\n')
-        
-        stats = {
-            "total_lines": len(lines),
+        return LogFilter._statistics(LogFilter.classify_lines(log_content))
+    
+    @staticmethod
+    def _statistics(severities: List[Optional[str]]) -> dict:
+        """분류 결과 → 통계"""
+        return LogFilter._summarize(Counter(severities), len(severities))
+    
+    @staticmethod
+    def _summarize(counts: CounterType[Optional[str]], total_lines: int) -> dict:
+        """심각도별 줄 수 → 통계"""
+        return {
+            "total_lines": total_lines,
             "by_severity": {
-                "TRACE": 0,
-                "DEBUG": 0,
-                "INFO": 0,
-                "WARN": 0,
-                "ERROR": 0,
-                "FATAL": 0,
+                "TRACE": counts["TRACE"],
+                "DEBUG": counts["DEBUG"],
+                "INFO": counts["INFO"],
+                # WARNING -> WARN, CRITICAL -> FATAL 통일
+                "WARN": counts["WARN"] + counts["WARNING"],
+                "ERROR": counts["ERROR"],
+                "FATAL": counts["FATAL"] + counts["CRITICAL"],
             },
-            "unknown": 0,
+            "unknown": counts[None],
         }
+
+
+class LogFilterPipeline:
+    """단일 패스 필터 파이프라인
+    
+    filter_by_severity → filter_by_keyword → filter_by_time_range를 이어 부르면
+    단계마다 split/join으로 전체 사본이 생긴다. 파이프라인은 조건을 모아 두고
+    줄마다 모든 조건을 평가해 한 번만 훑는다. 각 필터는 줄 단위 조건이므로
+    결과는 순서대로 이어 부른 것과 같다.
+    
+    run()은 파일 객체 등 줄 이터레이터를 받아 지연 평가하고 줄을 그대로 내보낸다.
+    """
+    
+    def __init__(self):
+        self.min_priority: Optional[int] = None
+        self.keyword_matcher: Optional[KeywordMatcher] = None
+        self.start_epoch: Optional[float] = None
+        self.end_epoch: Optional[float] = None
+        # 마지막 실행에서 남은 줄의 심각도별 수 (statistics=True일 때)
+        self._counts: CounterType[Optional[str]] = Counter()
+        self._total = 0
+    
+    def severity(self, min_level: SeverityLevel = SeverityLevel.INFO) -> "LogFilterPipeline":
+        """최소 심각도 (심각도 없는 줄은 컨텍스트로 유지)"""
+        self.min_priority = LogFilter.SEVERITY_PRIORITY.get(min_level.value, 2)
+        return self
+    
+    def errors_only(self) -> "LogFilterPipeline":
+        """에러만 (ERROR, FATAL, CRITICAL)"""
+        return self.severity(SeverityLevel.ERROR)
+    
+    def keywords(
+        self,
+        keywords: List[str],
+        case_sensitive: bool = False,
+        patterns: Optional[List[str]] = None
+    ) -> "LogFilterPipeline":
+        """키워드(또는 정규식 patterns) 중 하나라도 포함된 줄"""
+        self.keyword_matcher = get_keyword_matcher(keywords, patterns, case_sensitive)
+        return self
+    
+    def time_range(
+        self,
+        start_time: Optional[TimeValue] = None,
+        end_time: Optional[TimeValue] = None
+    ) -> "LogFilterPipeline":
+        """시간 범위 (타임스탬프 없는 줄은 유지, epoch 비교)"""
+        self.start_epoch = None if start_time is None else to_epoch(start_time)
+        self.end_epoch = None if end_time is None else to_epoch(end_time)
+        return self
+    
+    def filter(self, log_content: str) -> str:
+        """문자열 전체 필터링"""
+        return '\n'.join(self._scan_content(log_content, statistics=False))
+    
+    def filter_with_statistics(self, log_content: str) -> Tuple[str, dict]:
+        """필터링 + 남은 줄 통계"""
+        filtered = '\n'.join(self._scan_content(log_content, statistics=True))
+        return filtered, self.statistics
+    
+    def run(self, lines: Iterable[str], statistics: bool = False) -> Iterator[str]:
+        """줄 이터레이터 지연 필터링 (줄 끝 개행은 그대로 유지)"""
+        return self._scan(lines, None, None, statistics)
+    
+    @property
+    def statistics(self) -> dict:
+        """마지막 실행에서 남은 줄의 통계"""
+        return LogFilter._summarize(self._counts, self._total)
+    
+    def _scan_content(self, log_content: str, statistics: bool) -> Iterator[str]:
+        lines = log_content.split('\n')
+        # 심각도가 필요하면 버퍼 전체를 한 번에 대문자로
+        upper_lines = None
+        if self.min_priority is not None or statistics:
+            upper_lines = log_content.upper().split('\n')
+        # 키워드 대소문자 무시도 마찬가지
+        lower_lines = None
+        if self.keyword_matcher is not None and not self.keyword_matcher.case_sensitive:
+            lower_lines = log_content.lower().split('\n')
+        return self._scan(lines, upper_lines, lower_lines, statistics)
+    
+    def _scan(
+        self,
+        lines: Iterable[str],
+        upper_lines: Optional[List[str]],
+        lower_lines: Optional[List[str]],
+        statistics: bool
+    ) -> Iterator[str]:
+        self._counts = Counter()
+        self._total = 0
+        
+        classify = self.min_priority is not None or statistics
+        search_severity = _SEVERITY_PATTERN.search
+        priority = LogFilter.SEVERITY_PRIORITY
+        min_priority = self.min_priority
+        matcher = self.keyword_matcher
+        check_time = self.start_epoch is not None or self.end_epoch is not None
+        
+        for index, line in enumerate(lines):
+            severity = None
+            if classify:
+                upper = upper_lines[index] if upper_lines is not None else line.upper()
+                match = search_severity(upper)
+                severity = match and match.group()
+                if min_priority is not None and severity is not None and priority[severity] < min_priority:
+                    continue
+            
+            if matcher is not None:
+                if lower_lines is not None:
+                    if not matcher.search(lower_lines[index]):
+                        continue
+                elif not matcher.matches(line):
+                    continue
+            
+            if check_time and not self._in_time_range(line):
+                continue
+            
+            if statistics:
+                self._counts[severity] += 1
+                self._total += 1
+            yield line
+    
+    def _in_time_range(self, line: str) -> bool:
+        epoch = parse_timestamp(line)
         
-        for line in lines:
-            severity = LogFilter._detect_severity(line)
-            if severity:
-                # WARNING -> WARN 통일
-                if severity == "WARNING":
-                    severity = "WARN"
-                if severity == "CRITICAL":
-                    severity = "FATAL"
-                
-                if severity in stats["by_severity"]:
-                    stats["by_severity"][severity] += 1
-            else:
-                stats["unknown"] += 1
+        # 타임스탬프 없으면 포함
+        if epoch is None:
+            return True
         
-        return stats
+        if self.start_epoch is not None and epoch < self.start_epoch:
+            return False
+        if self.end_epoch is not None and epoch > self.end_epoch:
+            return False
+        return True
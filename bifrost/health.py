@@ -72,7 +72,7 @@ def check_ollama_health(ollama: OllamaClient) -> Dict[str, Any]:
 async def health_check():
     """전체 헬스 체크"""
     config = Config()
-    db = Database(config.get("database.url", "sqlite:///bifrost.db"))
+    db = Database.from_config(config)
     ollama = OllamaClient(config=config)
     
     return {
@@ -96,7 +96,7 @@ async def liveness():
 async def readiness():
     """Kubernetes readiness probe"""
     config = Config()
-    db = Database(config.get("database.url", "sqlite:///bifrost.db"))
+    db = Database.from_config(config)
     
     db_health = check_database_health(db)
     
@@ -10,10 +10,13 @@ from bifrost.kafka_events import (
     AnalysisResultData
 )
 from bifrost.kafka_producer import KafkaProducerManager
-from bifrost.ollama import OllamaClient
-from bifrost.bedrock import BedrockClient, is_bedrock_available
+from bifrost.ollama import get_async_ollama_client
+from bifrost.bedrock import AsyncBedrockClient, is_bedrock_available
 from bifrost.preprocessor import LogPreprocessor
+from bifrost.payload import LogPayload
 from bifrost.database import get_database
+from bifrost.writer import AnalysisWriter
+from bifrost.singleflight import analysis_flight
 from bifrost.logger import logger
 
 
@@ -45,6 +48,8 @@ class HeimdallIntegrationService:
         self.producer_manager = producer_manager
         self.preprocessor = LogPreprocessor()
         self.db = get_database()
+        # 요청마다 커밋하지 않고 모아서 저장 (커밋 후 id를 받아 결과 이벤트에 실음)
+        self.writer = AnalysisWriter.from_settings(self.db, config.get("database", {}), durability="commit")
     
     async def process_analysis_request(self, event: AnalysisRequestEvent):
         """
@@ -65,23 +70,37 @@ class HeimdallIntegrationService:
         )
         
         try:
-            # 1. 로그 전처리
-            processed_log = self.preprocessor.process(event.log_content)
+            # 인코딩/해시는 payload에서 1회만 계산
+            payload = LogPayload(event.log_content)
+            source = self._get_source_from_config()
             
-            # 2. 프롬프트 생성
-            prompt = MASTER_PROMPT.format(log_content=processed_log)
+            async def analyze() -> dict:
+                # 1. 로그 전처리
+                processed_log = self.preprocessor.process(payload)
+                
+                # 2. 프롬프트 생성
+                prompt = MASTER_PROMPT.format(log_content=processed_log)
+                
+                # 3. AI 분석 수행
+                return await self._analyze_with_ai(prompt=prompt, source=source)
             
-            # 3. AI 분석 수행
-            analysis_response = await self._analyze_with_ai(
-                prompt=prompt,
-                source=self._get_source_from_config()
+            # 같은 로그 분석이 진행 중이면 (같은 장애로 들어온 중복 이벤트) 함께 기다림
+            analysis_response, coalesced = await analysis_flight.do(
+                (payload.sha256, source, self._model_name(source), "heimdall"), analyze, channel="heimdall",
             )
+            if coalesced:
+                logger.info(
+                    "Coalesced with in-flight analysis",
+                    request_id=event.request_id,
+                    log_id=event.log_id,
+                )
             
             # 4. 분석 결과 저장 (Bifrost DB)
-            bifrost_analysis_id = self._save_analysis_to_db(
+            bifrost_analysis_id = await self._save_analysis_to_db(
                 event=event,
                 response=analysis_response,
-                duration=time.time() - start_time
+                duration=time.time() - start_time,
+                payload=payload
             )
             
             # 5. 분석 결과를 AnalysisResultData로 변환
@@ -128,41 +147,50 @@ class HeimdallIntegrationService:
             )
             raise
     
+    def _model_name(self, source: str) -> str:
+        """소스별 분석 모델명"""
+        if source == "cloud":
+            return self.config.get("bedrock", {}).get("model", "anthropic.claude-3-sonnet-20240229-v1:0")
+        return self.config.get("ollama", {}).get("model", "mistral")
+    
     async def _analyze_with_ai(self, prompt: str, source: str) -> dict:
         """AI 모델로 로그 분석"""
         if source == "local":
-            client = OllamaClient(
-                url=self.config.get("ollama", {}).get("url", "http://localhost:11434"),
-                model=self.config.get("ollama", {}).get("model", "mistral")
+            ollama_config = self.config.get("ollama", {})
+            client = get_async_ollama_client(
+                url=ollama_config.get("url", "http://localhost:11434"),
+                model=self._model_name(source),
+                timeout=ollama_config.get("timeout", 120),
+                max_retries=ollama_config.get("max_retries", 3),
+                pool_size=ollama_config.get("pool_size", 10),
             )
-            result = client.analyze(prompt, stream=False)
+            result = await client.analyze(prompt, stream=False)
         elif source == "cloud":
             if not is_bedrock_available():
                 raise RuntimeError("Bedrock not available (boto3 not installed)")
             
-            client = BedrockClient(
+            client = AsyncBedrockClient(
                 region=self.config.get("bedrock", {}).get("region", "us-east-1"),
-                model_id=self.config.get("bedrock", {}).get(
-                    "model", "anthropic.claude-3-sonnet-20240229-v1:0"
-                )
+                model_id=self._model_name(source),
             )
-            result = client.analyze(prompt)
+            result = await client.analyze(prompt)
         else:
             raise ValueError(f"Invalid source: {source}")
         
         return result
     
-    def _save_analysis_to_db(
+    async def _save_analysis_to_db(
         self,
         event: AnalysisRequestEvent,
         response: dict,
-        duration: float
+        duration: float,
+        payload: Optional[LogPayload] = None
     ) -> int:
-        """분석 결과를 Bifrost DB에 저장"""
-        analysis_id = self.db.save_analysis(
+        """분석 결과를 Bifrost DB에 저장 (write-behind 그룹 커밋)"""
+        analysis_id = await self.writer.save_analysis(
             source=self._get_source_from_config(),
             model=response["metadata"]["model"],
-            log_content=event.log_content,
+            log_content=payload or event.log_content,
             response=response["response"],
             duration=duration,
             tags=[
@@ -229,6 +257,10 @@ class HeimdallIntegrationService:
             confidence=Decimal(str(confidence))
         )
     
+    async def close(self):
+        """저장 대기 중인 분석 결과 flush"""
+        await self.writer.close()
+    
     def _get_source_from_config(self) -> str:
         """설정에서 AI 소스 결정"""
         return self.config.get("heimdall", {}).get("ai_source", "local")
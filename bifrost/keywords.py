@@ -0,0 +1,187 @@
+"""다중 키워드 매칭 (트라이 결합 정규식)"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """키워드 매칭 위치 (원문 기준 오프셋)"""
+    start: int
+    end: int
+    keyword: str
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """키워드 목록 → 공통 접두사를 공유하는 트라이 정규식
+
+    'error', 'err', 'errno' → err(?:no|or)?
+    대안을 접두사별로 나눠 두면 sre가 위치마다 키워드 수만큼 비교하지 않고
+    트라이를 따라 한 글자씩 내려간다. 최상위 대안이 모두 리터럴로 시작하므로
+    첫 글자 집합으로 후보 위치를 빠르게 건너뛴다. 같은 위치에서는 가장 긴 키워드를 잡는다.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        optional = '' in node
+        children = [(char, child) for char, child in sorted(node.items()) if char]
+        if not children:
+            return ''
+
+        # 자식이 모두 끝 글자면 문자 집합으로
+        if all(list(child) == [''] for _, child in children) and len(children) > 1:
+            body = '[' + ''.join(re.escape(char) for char, _ in children) + ']'
+            return body + ('?' if optional else '')
+
+        alternatives = [re.escape(char) + build(child) for char, child in children]
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')' + ('?' if optional else '')
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """다중 키워드 매처
+
+    리터럴 키워드는 트라이 정규식 하나로, 정규식 키워드(patterns)는 이름 있는
+    그룹으로 같은 패턴에 결합해 본문을 한 번만 훑는다. 대소문자 무시 시
+    키워드와 본문 모두 lower()로 비교한다 (기존 filter_by_keyword와 동일).
+    그룹(역참조 대상)이나 전역 인라인 플래그((?i) 등)가 있는 정규식은 결합하면
+    뜻이 바뀌거나 컴파일되지 않으므로 따로 컴파일해 검사한다.
+    빌드 비용이 있으므로 get_keyword_matcher()로 키워드 집합별 캐시를 쓴다.
+    """
+
+    def __init__(
+        self,
+        keywords: Sequence[str] = (),
+        patterns: Sequence[str] = (),
+        case_sensitive: bool = False,
+    ):
+        self.case_sensitive = case_sensitive
+        self.patterns = list(patterns)
+
+        # 정규화된 키워드 → 원래 키워드 (매칭 결과 표시용)
+        self._keywords: Dict[str, str] = {}
+        for keyword in keywords:
+            self._keywords.setdefault(keyword if case_sensitive else keyword.lower(), keyword)
+
+        # 빈 키워드는 모든 줄에 포함됨 (`'' in line`)
+        self.matches_everything = '' in self._keywords
+        literals = [keyword for keyword in self._keywords if keyword]
+
+        alternatives = []
+        if literals:
+            alternatives.append(_trie_pattern(literals))
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        default_flags = re.compile('').flags
+        # 따로 검사할 정규식 키워드 (patterns 인덱스, 컴파일된 패턴)
+        self._separate: List[Tuple[int, Pattern]] = []
+        for index, pattern in enumerate(self.patterns):
+            compiled = re.compile(pattern, flags)  # 잘못된 정규식은 여기서 re.error
+            if compiled.groups or re.compile(pattern).flags != default_flags:
+                self._separate.append((index, compiled))
+            else:
+                alternatives.append(f'(?P<_p{index}>{pattern})')
+
+        source = '|'.join(alternatives) or r'(?!)'
+        # 정규식 키워드는 대소문자 무시 플래그로, 리터럴은 lower() 본문으로 비교
+        self._pattern = re.compile(source, flags if self.patterns else 0)
+
+    def search(self, line: str) -> bool:
+        """키워드가 하나라도 포함됐는지 (대소문자 무시 시 line은 이미 lower()된 값)"""
+        if self.matches_everything or self._pattern.search(line) is not None:
+            return True
+        return any(pattern.search(line) is not None for _, pattern in self._separate)
+
+    def matches(self, line: str) -> bool:
+        """키워드 포함 여부 (원문 줄)"""
+        return self.search(line if self.case_sensitive else line.lower())
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        """매칭 위치 (겹치지 않게 왼쪽부터, 같은 위치에서는 가장 긴 키워드)"""
+        target = text
+        if not self.case_sensitive:
+            lowered = text.lower()
+            # lower()로 길이가 바뀌는 문자(İ 등)가 있으면 오프셋 보존을 위해 원문 사용
+            target = lowered if len(lowered) == len(text) else text
+
+        pattern = self._pattern
+        if target is text and not self.case_sensitive and not self.patterns:
+            pattern = re.compile(pattern.pattern, re.IGNORECASE)
+
+        for match, index in self._merged(pattern, target):
+            if index is None and match.lastgroup is not None:
+                index = int(match.lastgroup[2:])
+            if index is not None:
+                keyword = self.patterns[index]
+            else:
+                found = match.group()
+                keyword = self._keywords.get(found if self.case_sensitive else found.lower(), found)
+            yield KeywordMatch(match.start(), match.end(), keyword)
+
+    def _merged(self, pattern: Pattern, target: str) -> Iterator[Tuple[re.Match, Optional[int]]]:
+        """결합 패턴과 따로 컴파일한 패턴의 매칭을 결합 정규식처럼 합침
+
+        가장 왼쪽 매칭부터, 같은 위치면 결합 순서(리터럴 → patterns 순)가 앞선 쪽.
+        (매칭, 따로 검사한 패턴의 인덱스 또는 None)
+        """
+        if not self._separate:
+            for match in pattern.finditer(target):
+                yield match, None
+            return
+
+        # 순서: 리터럴(-1) → patterns 인덱스. 결합 패턴 매칭의 순서는 매칭된 그룹으로 정함
+        def rank(match: re.Match, index: Optional[int]) -> int:
+            if index is not None:
+                return index
+            return int(match.lastgroup[2:]) if match.lastgroup else -1
+
+        searchers = [(None, pattern)] + self._separate
+        pending: List[Optional[re.Match]] = [p.search(target) for _, p in searchers]
+        pos = 0
+        empty_at = -1  # 직전 빈 매칭 위치 (그 위치에서는 빈 매칭을 다시 내지 않음)
+        while True:
+            best = None
+            for slot, match in enumerate(pending):
+                if match is not None and match.start() < pos:
+                    # 이전 매칭과 겹침: 현재 위치부터 다시 찾음
+                    match = pending[slot] = searchers[slot][1].search(target, pos)
+                if match is not None and match.start() == match.end() == empty_at:
+                    match = pending[slot] = searchers[slot][1].search(target, pos + 1) if pos < len(target) else None
+                if match is None:
+                    continue
+                key = (match.start(), rank(match, searchers[slot][0]))
+                if best is None or key < best[0]:
+                    best = (key, slot)
+            if best is None:
+                return
+            match = pending[best[1]]
+            yield match, searchers[best[1]][0]
+            pos = match.end()
+            empty_at = pos if match.start() == match.end() else -1
+
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """매칭 위치 목록"""
+        return list(self.finditer(text))
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(keywords: tuple, patterns: tuple, case_sensitive: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, patterns, case_sensitive)
+
+
+def get_keyword_matcher(
+    keywords: Sequence[str] = (),
+    patterns: Optional[Sequence[str]] = None,
+    case_sensitive: bool = False,
+) -> KeywordMatcher:
+    """키워드 집합별 캐시된 매처 (같은 집합이면 트라이를 다시 만들지 않음)"""
+    return _cached_matcher(tuple(keywords), tuple(patterns or ()), case_sensitive)
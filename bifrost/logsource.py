@@ -0,0 +1,218 @@
+"""mmap 기반 로그 입력 (파일 전체를 문자열로 올리지 않는 읽기)"""
+
+import gzip
+import hashlib
+import mmap
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import IO, Iterator, Optional, Tuple, Union
+
+from bifrost.payload import LogPayload
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 .zst 로그를 열 수 없음
+    zstandard = None
+
+
+# madvise(DONTNEED) 구간 정렬 단위 (PMD 크기)
+_RELEASE_ALIGN = 2 * 1024 * 1024
+
+# 압축 로그 확장자 (열 때 투명하게 해제)
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+def uncompressed_path(path: Union[str, Path]) -> Path:
+    """압축 확장자를 뗀 경로 (app.log.gz → app.log)"""
+    path = Path(path)
+    return path.with_suffix("") if path.suffix in COMPRESSED_SUFFIXES else path
+
+
+def _decompress(path: Union[str, Path]) -> IO:
+    """압축 로그를 익명 임시 파일로 해제 (mmap 가능, 닫으면 삭제)"""
+    if str(path).endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 로그입니다. zstandard 패키지를 설치하세요.")
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True)
+    else:
+        stream = gzip.open(path, "rb")
+    
+    spool = tempfile.TemporaryFile(prefix="bifrost-")
+    try:
+        with stream:
+            shutil.copyfileobj(stream, spool, LogSource.CHUNK_SIZE)
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+    return spool
+
+
+class LogSource:
+    """로그 입력 추상화
+
+    일반 파일은 mmap으로 열어 줄 순회, 바이트 구간 슬라이스, 앞/뒤 읽기,
+    해시 계산을 파일 전체를 문자열로 만들지 않고 처리한다. 순차로 훑은 구간은
+    madvise(DONTNEED)로 매핑에서 내려 RSS가 파일 크기만큼 늘지 않는다
+    (페이지 캐시에는 남음). stdin/파이프/빈 파일처럼 mmap할 수 없는 입력은
+    스트림 순회(lines, chunks)만 지원한다.
+    """
+
+    CHUNK_SIZE = 1 << 20  # 순차 처리 단위 (줄 경계로 맞춤)
+
+    def __init__(self, stream: IO, name: Optional[str] = None):
+        self.name = name or getattr(stream, "name", "<stream>")
+        self._stream = stream
+        self._mapped: Optional[mmap.mmap] = None
+
+        fileno = getattr(stream, "fileno", None)
+        try:
+            if fileno is not None and stream.seekable() and stream.seek(0, 2) > 0:
+                stream.seek(0)
+                self._mapped = mmap.mmap(fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # 특수 파일 등 mmap 불가 → 스트림으로 처리
+            self._mapped = None
+
+    @classmethod
+    def open(cls, path: Optional[Union[str, Path]] = None) -> "LogSource":
+        """파일 경로로 열기 (None이면 stdin)
+        
+        .gz/.zst 파일은 임시 파일로 풀어서 연다 (해시/크기는 압축 해제된 내용 기준).
+        """
+        if path is None:
+            return cls(sys.stdin, name="<stdin>")
+        if str(path).endswith(COMPRESSED_SUFFIXES):
+            return cls(_decompress(path), name=str(path))
+        return cls(open(path, "rb"), name=str(path))
+
+    def close(self):
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        if self._stream is not sys.stdin:
+            self._stream.close()
+
+    def __enter__(self) -> "LogSource":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def mapped(self) -> bool:
+        """mmap 여부 (임의 접근 가능)"""
+        return self._mapped is not None
+
+    @property
+    def buffer(self) -> Union[mmap.mmap, bytes]:
+        """임의 접근용 버퍼 (bisect_time_range 등). 스트림 입력은 b''"""
+        return self._mapped if self._mapped is not None else b""
+
+    @property
+    def size(self) -> int:
+        """바이트 크기 (스트림 입력은 0)"""
+        return len(self._mapped) if self._mapped is not None else 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _release(self, start: int, end: int):
+        """순차로 훑은 구간의 페이지를 매핑에서 내림
+        
+        페이지 캐시의 큰 folio(최대 2 MiB)는 폴트 시 통째로 다시 매핑되므로
+        구간 시작을 페이지가 아닌 2 MiB 경계로 내려 앞 블록에 걸친 페이지까지 내린다.
+        """
+        start -= start % _RELEASE_ALIGN
+        if end > start and hasattr(self._mapped, "madvise"):
+            self._mapped.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+    def _blocks(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """[start, end)를 CHUNK_SIZE 안팎의 줄 경계 구간으로 나눔"""
+        mapped = self._mapped
+        end = len(mapped) if end is None else min(end, len(mapped))
+        while start < end:
+            stop = min(start + self.CHUNK_SIZE, end)
+            if stop < end:
+                newline = mapped.rfind(b"\n", start, stop)
+                if newline < 0:
+                    newline = mapped.find(b"\n", stop, end)
+                stop = end if newline < 0 else newline + 1
+            yield start, stop
+            self._release(start, stop)
+            start = stop
+
+    def read(self, start: int = 0, end: Optional[int] = None) -> bytes:
+        """바이트 구간 [start, end)"""
+        if self._mapped is None:
+            return self._stream.buffer.read() if self._stream is sys.stdin else self._stream.read()
+        return self._mapped[start:end]
+
+    def text(self, start: int = 0, end: Optional[int] = None) -> str:
+        """바이트 구간 [start, end)를 문자열로"""
+        data = self.read(start, end)
+        return data if isinstance(data, str) else data.decode("utf-8")
+
+    def chunks(self, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+        """줄 경계로 자른 문자열 청크 (전처리 스트림 입력용)"""
+        if self._mapped is None:
+            for line in self._stream:
+                yield line if isinstance(line, str) else line.decode("utf-8")
+            return
+        for block_start, block_end in self._blocks(start, end):
+            yield self._mapped[block_start:block_end].decode("utf-8")
+
+    def lines(self, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+        """줄 순회 (개행 포함, 파일 객체 순회와 같은 형태)"""
+        if self._mapped is None:
+            yield from self.chunks()
+            return
+        # splitlines()는 \r, \x0b 등에서도 나누므로 '\n'으로만 분리
+        for chunk in self.chunks(start, end):
+            parts = chunk.split("\n")
+            last = parts.pop()
+            for part in parts:
+                yield part + "\n"
+            if last:
+                yield last
+
+    def count_lines(self, start: int = 0, end: Optional[int] = None) -> int:
+        """[start, end) 구간의 개행 수"""
+        mapped = self._mapped
+        return sum(mapped[a:b].count(b"\n") for a, b in self._blocks(start, end))
+
+    def head(self, n_bytes: int) -> str:
+        """앞 n_bytes 안의 완전한 줄들"""
+        end = self._mapped.rfind(b"\n", 0, n_bytes) + 1 if n_bytes < self.size else self.size
+        return self.text(0, end)
+
+    def tail(self, n_bytes: int) -> str:
+        """뒤 n_bytes 안의 완전한 줄들"""
+        if n_bytes >= self.size:
+            return self.text()
+        start = self._mapped.find(b"\n", self.size - n_bytes - 1)
+        return "" if start < 0 else self.text(start + 1)
+
+    def time_range(self, start=None, end=None, default_year: Optional[int] = None) -> Tuple[int, int]:
+        """시간순 정렬된 로그의 [start, end] 구간 오프셋 (mmap 이진 탐색)"""
+        from bifrost.timeindex import bisect_time_range
+        return bisect_time_range(self.buffer, start, end, default_year)
+
+    def sha256(self) -> str:
+        """SHA-256 hex digest (LogPayload.sha256과 동일, 청크 단위 계산)
+
+        스트림 입력은 남은 내용을 읽어 계산하므로 이후 다시 읽을 수 없다.
+        """
+        if self._mapped is None:
+            return hashlib.sha256(self.read()).hexdigest()
+        digest = hashlib.sha256()
+        with memoryview(self._mapped) as view:
+            for block_start, block_end in self._blocks():
+                digest.update(view[block_start:block_end])
+        return digest.hexdigest()
+
+    def payload(self, sha256: Optional[str] = None) -> LogPayload:
+        """전체 내용 LogPayload (DB 저장용, 읽은 바이트/계산한 해시 재사용)"""
+        return LogPayload.from_bytes(self.read(), sha256)
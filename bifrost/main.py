@@ -1,18 +1,24 @@
 #!/usr/bin/env python3
 """Bifrost CLI - MLOps Log Analyzer"""
 
+import itertools
+import re
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Iterator
 
 import typer
 from rich.console import Console
 from rich.markdown import Markdown
 
-from bifrost.ollama import OllamaClient
+from bifrost.ollama import get_ollama_client
 from bifrost.bedrock import BedrockClient, is_bedrock_available
 from bifrost.config import Config
+from bifrost.logsource import LogSource
 from bifrost.preprocessor import LogPreprocessor
+from bifrost.timestamps import get_timestamp_registry
 from bifrost.formatter import OutputFormatter
 
 app = typer.Typer(
@@ -41,6 +47,9 @@ MASTER_PROMPT = """당신은 전문 MLOps SRE입니다. 아래 로그를 분석
 {log_content}
 """
 
+# MASTER_PROMPT를 수정하면 올릴 것 (분석 결과 캐시 키에 포함됨)
+PROMPT_VERSION = "1.0"
+
 
 @app.command()
 def local(
@@ -118,33 +127,32 @@ def local(
         color=config.get("output.color", True),
     )
     
-    # 입력 읽기
+    # 입력 읽기 + 전처리 (mmap/스트리밍: 원본 전체를 메모리에 올리지 않음)
     formatter.print_info("🔮 로그 읽는 중...")
-    log_content = _read_input(file_path)
-    
-    if not log_content.strip():
-        formatter.print_error("입력된 로그가 비어있습니다.")
-        raise typer.Exit(code=1)
-    
-    # 전처리
-    if not no_preprocess:
+    if no_preprocess:
+        log_content = _read_input(file_path)
+    else:
+        get_timestamp_registry(config)  # --config의 사용자 포맷
         preprocessor = LogPreprocessor(
             max_size_mb=config.get("log.max_size_mb", 5),
             truncate=config.get("log.truncate", True),
             remove_timestamps=config.get("log.remove_timestamps", False),
         )
-        
-        original_stats = preprocessor.get_stats(log_content)
-        log_content = preprocessor.process(log_content)
-        processed_stats = preprocessor.get_stats(log_content)
-        
-        if verbose:
-            formatter.print_stats({
-                "원본 라인 수": original_stats["total_lines"],
-                "처리 후 라인 수": processed_stats["total_lines"],
-                "원본 크기": f"{original_stats['total_bytes'] / 1024:.1f} KB",
-                "처리 후 크기": f"{processed_stats['total_bytes'] / 1024:.1f} KB",
-            })
+        processor = preprocessor.stream()
+        with _open_input(file_path) as source:
+            log_content = "".join(processor.process_source(source))
+    
+    if not log_content.strip():
+        formatter.print_error("입력된 로그가 비어있습니다.")
+        raise typer.Exit(code=1)
+    
+    if not no_preprocess and verbose:
+        formatter.print_stats({
+            "원본 라인 수": processor.input_lines,
+            "처리 후 라인 수": processor.output_lines,
+            "원본 크기": f"{processor.input_bytes / 1024:.1f} KB",
+            "처리 후 크기": f"{processor.output_bytes / 1024:.1f} KB",
+        })
     
     # 프롬프트 생성
     prompt = MASTER_PROMPT.format(log_content=log_content)
@@ -153,11 +161,12 @@ def local(
     formatter.print_info(f"🔮 Ollama로 분석 중... (모델: {model})")
     
     try:
-        client = OllamaClient(
+        client = get_ollama_client(
             url=ollama_url,
             model=model,
             timeout=config.get("ollama.timeout", 120),
             max_retries=config.get("ollama.max_retries", 3),
+            pool_size=config.get("ollama.pool_size", 10),
         )
         
         result = client.analyze(prompt, stream=stream)
@@ -172,8 +181,8 @@ def local(
 
 @app.command()
 def batch(
-    directory: Path = typer.Argument(
-        ...,
+    directory: Optional[Path] = typer.Argument(
+        None,
         exists=True,
         file_okay=False,
         dir_okay=True,
@@ -202,17 +211,76 @@ def batch(
         "-w",
         help="동시 실행 워커 수",
     ),
+    recursive: bool = typer.Option(
+        True,
+        "--recursive/--no-recursive",
+        help="하위 디렉토리 포함",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None,
+        "--exclude",
+        "-x",
+        help="제외할 파일/디렉토리 glob (여러 번 지정 가능)",
+    ),
+    min_size: Optional[int] = typer.Option(None, "--min-size", help="최소 파일 크기 (바이트)"),
+    max_size: Optional[int] = typer.Option(None, "--max-size", help="최대 파일 크기 (바이트)"),
+    modified_within: Optional[float] = typer.Option(
+        None,
+        "--modified-within",
+        help="최근 N시간 안에 수정된 파일만",
+    ),
+    resume: Optional[str] = typer.Option(
+        None,
+        "--resume",
+        help="중단된 작업 ID (완료된 파일은 다시 읽지 않고 이어서 분석)",
+    ),
 ):
     """
     📦 배치 모드 - 디렉토리 내 로그 일괄 분석
     
+    하위 디렉토리까지 찾는 대로 분석을 시작하고, .gz/.zst 로그는 풀어서 읽는다.
+    진행 상황은 작업 ID별로 DB에 기록된다. 중단되면 --resume으로 이어서 실행.
+    
     예시:
     \b
     - bifrost batch ./logs
     - bifrost batch ./logs --pattern "*.txt"
     - bifrost batch ./logs --workers 8
+    - bifrost batch /var/log/archive -x "debug*" --modified-within 24
+    - bifrost batch --resume 3f2a9c1d7e4b
     """
-    from bifrost.batch import BatchAnalyzer
+    from bifrost.batch import BatchAnalyzer, BatchManifest
+    from bifrost.database import get_database
+    
+    db = get_database()
+    if resume:
+        # 작업을 만들 때의 디렉토리/패턴/소스/모델 그대로
+        try:
+            manifest = BatchManifest.load(db, resume)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(code=1)
+        directory = Path(manifest.job["directory"])
+        pattern, source, model = manifest.job["pattern"], manifest.job["source"], manifest.job["model"]
+        options = manifest.job["options"]
+        if not directory.is_dir():
+            console.print(f"[red]디렉토리가 없습니다: {directory}[/red]")
+            raise typer.Exit(code=1)
+        console.print(f"[cyan]↻ 작업 {resume} 재개: {directory} ({pattern})[/cyan]")
+    elif directory is None:
+        console.print("[red]디렉토리 또는 --resume <작업 ID>를 지정하세요.[/red]")
+        raise typer.Exit(code=1)
+    else:
+        # 탐색 조건은 재개할 때도 같도록 절대 시각으로 저장
+        options = dict(
+            recursive=recursive,
+            exclude=exclude or [],
+            min_size=min_size,
+            max_size=max_size,
+            newer_than=time.time() - modified_within * 3600 if modified_within else None,
+        )
+        manifest = BatchManifest.create(db, directory, pattern, source, model, options=options)
+        console.print(f"[cyan]🆔 작업 ID: {manifest.id} (중단되면 bifrost batch --resume {manifest.id})[/cyan]")
     
     analyzer = BatchAnalyzer(
         source=source,
@@ -220,18 +288,27 @@ def batch(
         max_workers=max_workers,
     )
     
-    results = analyzer.analyze_directory(directory, pattern)
+    results = analyzer.analyze_directory(directory, pattern, manifest=manifest, **options)
     
     # 결과 요약
     total = len(results)
     success = sum(1 for r in results if r["status"] == "success")
     cached = sum(1 for r in results if r.get("cached", False))
     failed = sum(1 for r in results if r["status"] == "failed")
+    duplicates = sum(1 for r in results if r["status"] == "duplicate")
+    shared_calls = sum(1 for r in results if r.get("shared_call"))
     
     console.print(f"\n[green]✅ 완료: {success}/{total}[/green]")
     console.print(f"[blue]📦 캐시 히트: {cached}[/blue]")
+    if duplicates or shared_calls:
+        deduplicated = duplicates + shared_calls
+        console.print(
+            f"[blue]🔁 중복 제거: {deduplicated}/{total} ({deduplicated / total:.1%}) - "
+            f"같은 내용 파일 {duplicates}, 같은 전처리 결과 {shared_calls}[/blue]"
+        )
     if failed > 0:
         console.print(f"[red]❌ 실패: {failed}[/red]")
+        console.print(f"[yellow]↻ 실패한 파일만 다시: bifrost batch --resume {manifest.id}[/yellow]")
 
 
 @app.command()
@@ -333,20 +410,19 @@ def cloud(
         color=config.get("output.color", True),
     )
     
-    # 입력 읽기
+    # 입력 읽기 + 전처리 (mmap/스트리밍)
     formatter.print_info("🔮 로그 읽는 중...")
-    log_content = _read_input(file_path)
-    
-    if not log_content.strip():
-        formatter.print_error("입력된 로그가 비어있습니다.")
-        raise typer.Exit(code=1)
-    
-    # 전처리
+    get_timestamp_registry(config)  # --config의 사용자 포맷
     preprocessor = LogPreprocessor(
         max_size_mb=config.get("log.max_size_mb", 5),
         truncate=config.get("log.truncate", True),
     )
-    log_content = preprocessor.process(log_content)
+    with _open_input(file_path) as source:
+        log_content = "".join(preprocessor.process_source(source))
+    
+    if not log_content.strip():
+        formatter.print_error("입력된 로그가 비어있습니다.")
+        raise typer.Exit(code=1)
     
     if verbose:
         stats = preprocessor.get_stats(log_content)
@@ -423,9 +499,17 @@ def config(
 
 def _read_input(file_path: Optional[Path]) -> str:
     """파일 또는 stdin에서 입력 읽기"""
+    with _open_input(file_path) as source:
+        return source.text()
+
+
+@contextmanager
+def _open_input(file_path: Optional[Path]) -> Iterator[LogSource]:
+    """파일(mmap) 또는 stdin을 LogSource로 열기"""
     if file_path:
         # 파일에서 읽기
-        return file_path.read_text(encoding="utf-8")
+        with LogSource.open(file_path) as source:
+            yield source
     else:
         # stdin 체크
         if sys.stdin.isatty():
@@ -437,14 +521,21 @@ def _read_input(file_path: Optional[Path]) -> str:
             raise typer.Exit(code=1)
         else:
             # stdin에서 읽기
-            return sys.stdin.read()
+            with LogSource.open() as source:
+                yield source
 
 
 @app.command()
 def filter_log(
-    file: typer.FileText = typer.Argument(..., help="로그 파일"),
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, help="로그 파일"),
     severity: str = typer.Option("INFO", help="최소 심각도 (DEBUG/INFO/WARN/ERROR/FATAL)"),
     errors_only: bool = typer.Option(False, "--errors-only", help="에러만 추출"),
+    keyword: Optional[List[str]] = typer.Option(None, "--keyword", "-k", help="키워드 (여러 번 지정 가능, 하나라도 포함)"),
+    pattern: Optional[List[str]] = typer.Option(None, "--pattern", "-p", help="정규식 키워드 (여러 번 지정 가능)"),
+    case_sensitive: bool = typer.Option(False, "--case-sensitive", help="키워드 대소문자 구분"),
+    start: Optional[str] = typer.Option(None, help="시작 시각 (예: 2024-10-25 10:00:00)"),
+    end: Optional[str] = typer.Option(None, help="종료 시각"),
+    sorted_log: bool = typer.Option(False, "--sorted", help="시간순 정렬된 로그: 이진 탐색으로 해당 구간만 읽기"),
     output: Optional[typer.FileTextWrite] = typer.Option(None, help="출력 파일"),
 ):
     """로그 필터링
@@ -454,32 +545,59 @@ def filter_log(
     - bifrost filter-log app.log --severity ERROR
     - bifrost filter-log app.log --errors-only
     - bifrost filter-log app.log --severity WARN --output filtered.log
+    - bifrost filter-log app.log -k timeout -k refused --start "2024-10-25 10:00:00"
+    - bifrost filter-log app.log -p "E\\d{4}" -k OOMKilled
+    - bifrost filter-log huge.log --sorted --start "2024-10-25 10:00" --end "2024-10-25 10:05"
     """
     from bifrost.filters import LogFilter, SeverityLevel
-    from datetime import datetime
-    
-    log_content = file.read()
     
     if errors_only:
-        filtered = LogFilter.extract_errors_only(log_content)
+        min_level = SeverityLevel.ERROR
     else:
         try:
             min_level = SeverityLevel(severity.upper())
-            filtered = LogFilter.filter_by_severity(log_content, min_level)
         except ValueError:
             console.print(f"[red]Invalid severity level: {severity}[/red]")
             console.print("Valid values: TRACE, DEBUG, INFO, WARN, ERROR, FATAL")
             raise typer.Exit(1)
     
+    # 조건을 모아 파일을 한 번만 훑음 (줄 단위 지연 처리)
+    pipeline = LogFilter.pipeline().severity(min_level)
+    if keyword or pattern:
+        try:
+            pipeline.keywords(keyword or [], case_sensitive, pattern)
+        except re.error as e:
+            console.print(f"[red]잘못된 정규식: {e}[/red]")
+            raise typer.Exit(1)
+    source = LogSource.open(file)
+    begin, finish = 0, None
+    try:
+        if start or end:
+            if sorted_log:
+                # mmap 이진 탐색: 구간 밖은 읽지 않음 (타임스탬프 없는 줄은 앞 줄에 속함)
+                begin, finish = source.time_range(start, end)
+            else:
+                pipeline.time_range(start, end)
+    except ValueError as e:
+        source.close()
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    with source:
+        lines = pipeline.run(source.lines(begin, finish), statistics=True)
+        if output:
+            output.writelines(lines)
+        else:
+            filtered = "".join(lines)
+    
     # 통계 출력
-    stats = LogFilter.get_log_statistics(filtered)
+    stats = pipeline.statistics
     console.print(f"\n📊 Filtered Log Statistics:", style="bold")
     console.print(f"Total lines: {stats['total_lines']}")
     console.print(f"By severity: {stats['by_severity']}")
     
     # 결과 출력
     if output:
-        output.write(filtered)
         console.print(f"\n✅ Filtered log saved to: {output.name}", style="green")
     else:
         console.print(f"\n{filtered}")
@@ -487,48 +605,112 @@ def filter_log(
 
 @app.command()
 def export(
-    format: str = typer.Option("csv", help="Export 포맷 (csv/json)"),
-    limit: int = typer.Option(100, help="Export할 레코드 수"),
+    format: str = typer.Option("csv", help="Export 포맷 (csv/json/ndjson/parquet/arrow)"),
+    limit: int = typer.Option(100, help="Export할 레코드 수 (0이면 전체, parquet/arrow는 항상 전체)"),
     output: Optional[str] = typer.Option(None, help="출력 파일명"),
+    table: str = typer.Option("analyses", help="parquet/arrow 대상 테이블 (analyses/metrics)"),
 ):
     """분석 결과 export
     
+    결과를 메모리에 모으지 않고 DB 커서에서 읽는 대로 파일에 쓴다.
+    parquet/arrow는 레코드 배치 단위로 쓰며 pyarrow가 필요하다.
+    
     예시:
     \b
     - bifrost export --format csv --limit 50
     - bifrost export --format json --output results.json
+    - bifrost export --format ndjson --limit 0
+    - bifrost export --format parquet --table metrics
     """
     from bifrost.database import Database
-    from bifrost.export import DataExporter
+    from bifrost.export import COLUMNAR_FORMATS, DataExporter, is_columnar_available
     from datetime import datetime
     
+    writers = {
+        "csv": DataExporter.iter_csv,
+        "json": DataExporter.iter_json,
+        "ndjson": DataExporter.iter_ndjson,
+    }
+    if format not in writers and format not in COLUMNAR_FORMATS:
+        console.print(f"[red]Invalid format: {format}[/red]")
+        console.print(f"Valid formats: {', '.join([*writers, *COLUMNAR_FORMATS])}")
+        raise typer.Exit(1)
+    
     config = Config()
-    db = Database(config.get("database.url", "sqlite:///bifrost.db"))
+    db = Database.from_config(config)
+    output_file = output or f"bifrost_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
     
-    results = db.get_analysis_history(limit=limit)
+    if format in COLUMNAR_FORMATS:
+        if not is_columnar_available():
+            console.print("[red]pyarrow가 설치되지 않았습니다. 설치: pip install pyarrow[/red]")
+            raise typer.Exit(1)
+        try:
+            columns = db.export_columns(table)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        count = DataExporter.write_columnar(columns, db.iter_column_batches(table), output_file, format)
+        console.print(f"✅ Exported {count} {table} rows to: {output_file}", style="green")
+        return
     
-    if not results:
+    rows = db.iter_analyses(limit=limit or None)
+    first = next(rows, None)
+    if first is None:
         console.print("[yellow]No analysis results found[/yellow]")
         raise typer.Exit(0)
     
-    # Export
-    if format == "csv":
-        content = DataExporter.to_csv(results)
-        default_filename = f"bifrost_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    elif format == "json":
-        content = DataExporter.to_json(results, pretty=True)
-        default_filename = f"bifrost_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    else:
-        console.print(f"[red]Invalid format: {format}[/red]")
-        console.print("Valid formats: csv, json")
-        raise typer.Exit(1)
+    count = 0
     
-    output_file = output or default_filename
+    def counted():
+        nonlocal count
+        for row in itertools.chain([first], rows):
+            count += 1
+            yield row
     
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+        for chunk in writers[format](counted()):
+            f.write(chunk)
+    
+    console.print(f"✅ Exported {count} results to: {output_file}", style="green")
+
+
+@app.command()
+def migrate_storage(
+    batch_size: int = typer.Option(500, help="한 번에 옮길 행 수"),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="SQLite 파일 공간 회수 (VACUUM)"),
+):
+    """기존 분석 결과를 압축/중복 제거 저장으로 옮기기
     
-    console.print(f"✅ Exported {len(results)} results to: {output_file}", style="green")
+    로그 원문은 log_blobs(log_hash당 1건)로, 응답은 압축해서 다시 쓴다.
+    여러 번 실행해도 안전하다. PostgreSQL 컬럼 형식(TEXT → BYTEA)은 시작 시
+    init_db가 이미 바꾸므로, 이 명령은 기존 행의 공간 회수용이다.
+    
+    예시:
+    \b
+    - bifrost migrate-storage
+    - bifrost migrate-storage --batch-size 1000 --no-vacuum
+    """
+    from bifrost.database import Database
+    
+    config = Config()
+    db = Database.from_config(config)
+    db.init_db()
+    
+    console.print("🗜️  저장 형식 변환 중...")
+    report = db.migrate_storage(batch_size=batch_size, vacuum=vacuum)
+    
+    mb = 1024 * 1024
+    console.print(f"변환된 행: {report['rows']:,}")
+    console.print(f"새 로그 원문(log_blobs): {report['blobs_created']:,}")
+    console.print(
+        f"컬럼 크기: {report['bytes_before'] / mb:.1f} MB → {report['bytes_after'] / mb:.1f} MB "
+        f"({report['bytes_saved'] / mb:.1f} MB 절약)"
+    )
+    if report["file_bytes_before"] is not None:
+        console.print(
+            f"DB 파일: {report['file_bytes_before'] / mb:.1f} MB → {report['file_bytes_after'] / mb:.1f} MB"
+        )
+    console.print("✅ 완료", style="green")
 
 
 @app.command()
@@ -556,7 +738,7 @@ def slack(
         preprocessor = LogPreprocessor()
         processed = preprocessor.process(log_content)
         
-        client = OllamaClient()
+        client = get_ollama_client()
         result = client.analyze(processed)
         
         success = notifier.send_analysis_result(result, service_name)
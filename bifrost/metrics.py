@@ -1,6 +1,82 @@
 """Prometheus 메트릭"""
 
-from prometheus_client import Counter, Histogram, Gauge, Info
+from typing import Optional
+
+from prometheus_client import Counter, Histogram, Gauge, Info, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from bifrost.ollama import client_registry
+from bifrost.singleflight import analysis_flight
+
+
+class OllamaPoolCollector:
+    """Ollama 클라이언트 레지스트리 hit/miss (스크랩 시점에 레지스트리 카운터를 읽음)"""
+    
+    def collect(self):
+        stats = client_registry.stats()
+        yield CounterMetricFamily(
+            'bifrost_ollama_pool_hits',
+            'Ollama client registry lookups served by an existing pooled client',
+            value=stats["hits"],
+        )
+        yield CounterMetricFamily(
+            'bifrost_ollama_pool_misses',
+            'Ollama client registry lookups that created a new client',
+            value=stats["misses"],
+        )
+
+
+class SingleFlightCollector:
+    """같은 분석 요청 합치기 (channel별 실제 실행/합류 수, 진행 중 작업 수)"""
+    
+    def collect(self):
+        stats = analysis_flight.stats()
+        leaders = CounterMetricFamily(
+            'bifrost_singleflight_leaders',
+            'Analyses actually executed by the single-flight layer',
+            labels=['channel'],
+        )
+        for channel, count in stats["leaders"].items():
+            leaders.add_metric([channel], count)
+        yield leaders
+        coalesced = CounterMetricFamily(
+            'bifrost_singleflight_coalesced',
+            'Requests that awaited an identical in-flight analysis instead of calling the model',
+            labels=['channel'],
+        )
+        for channel, count in stats["coalesced"].items():
+            coalesced.add_metric([channel], count)
+        yield coalesced
+        yield GaugeMetricFamily(
+            'bifrost_singleflight_in_flight',
+            'Distinct analyses currently in flight',
+            value=stats["in_flight"],
+        )
+
+
+class ResultCacheCollector:
+    """분석 결과 메모리 캐시 상태 (eviction 수, 항목 수, 사용 바이트)"""
+    
+    def __init__(self, cache):
+        self.cache = cache
+    
+    def collect(self):
+        stats = self.cache.stats()
+        yield CounterMetricFamily(
+            'bifrost_cache_evictions',
+            'Total number of in-memory result cache evictions',
+            value=stats["evictions"],
+        )
+        yield GaugeMetricFamily(
+            'bifrost_cache_entries',
+            'Number of entries in the in-memory result cache',
+            value=stats["entries"],
+        )
+        yield GaugeMetricFamily(
+            'bifrost_cache_bytes',
+            'Bytes held by the in-memory result cache',
+            value=stats["total_bytes"],
+        )
 
 
 class PrometheusMetrics:
@@ -22,12 +98,20 @@ class PrometheusMetrics:
             buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0]
         )
         
-        # 캐시 히트
+        # 캐시 히트 (tier: memory / database)
         self.cache_hits = Counter(
             'bifrost_cache_hits_total',
-            'Total number of cache hits'
+            'Total number of cache hits',
+            ['tier']
         )
         
+        # 캐시 미스
+        self.cache_misses = Counter(
+            'bifrost_cache_misses_total',
+            'Total number of cache misses'
+        )
+        self.result_cache_collector: Optional[ResultCacheCollector] = None
+        
         # 에러 카운터
         self.error_count = Counter(
             'bifrost_errors_total',
@@ -56,6 +140,14 @@ class PrometheusMetrics:
             buckets=[1024, 10240, 102400, 1024000]
         )
         
+        # Ollama 커넥션 풀 hit/miss
+        self.ollama_pool = OllamaPoolCollector()
+        REGISTRY.register(self.ollama_pool)
+        
+        # 같은 분석 요청 합치기
+        self.single_flight = SingleFlightCollector()
+        REGISTRY.register(self.single_flight)
+        
         # 시스템 정보
         self.info = Info('bifrost_info', 'Bifrost system information')
         self.info.info({
@@ -71,9 +163,19 @@ class PrometheusMetrics:
         """분석 소요 시간 기록"""
         self.analysis_duration.labels(source=source).observe(duration)
     
-    def increment_cache_hits(self):
+    def increment_cache_hits(self, tier: str = "database"):
         """캐시 히트 증가"""
-        self.cache_hits.inc()
+        self.cache_hits.labels(tier=tier).inc()
+    
+    def increment_cache_misses(self):
+        """캐시 미스 증가"""
+        self.cache_misses.inc()
+    
+    def track_result_cache(self, cache):
+        """메모리 결과 캐시 상태를 스크랩 대상으로 등록 (한 번만)"""
+        if self.result_cache_collector is None:
+            self.result_cache_collector = ResultCacheCollector(cache)
+            REGISTRY.register(self.result_cache_collector)
     
     def increment_error_count(self, source: str, error_type: str = "unknown"):
         """에러 카운트 증가"""
@@ -1,17 +1,91 @@
 """데이터베이스 모델"""
 
+import zlib
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from sqlalchemy import (
-    Column, Integer, String, Text, Float, DateTime, 
-    Boolean, JSON, ForeignKey, Index
+    Column, Integer, BigInteger, String, Text, Float, DateTime, 
+    Boolean, JSON, ForeignKey, Index, LargeBinary
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 zlib
+    zstandard = None
 
 Base = declarative_base()
 
 
+# 압축 값 앞 1바이트 코덱 표시
+CODEC_RAW = b'='
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b'Z'
+COMPRESS_MIN_BYTES = 256  # 이보다 작으면 무압축
+
+_zstd_compressor = zstandard.ZstdCompressor(level=6) if zstandard else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def compress_text(text: str) -> bytes:
+    """텍스트 → 코덱 표시 + 압축 바이트 (zstd, 없으면 zlib. 이득 없으면 무압축)"""
+    data = text.encode('utf-8')
+    if len(data) >= COMPRESS_MIN_BYTES:
+        if _zstd_compressor is not None:
+            packed = CODEC_ZSTD + _zstd_compressor.compress(data)
+        else:
+            packed = CODEC_ZLIB + zlib.compress(data, 6)
+        if len(packed) < len(data):
+            return packed
+    return CODEC_RAW + data
+
+
+def decompress_text(value: Union[str, bytes, memoryview]) -> str:
+    """compress_text 역변환 (압축 도입 전에 평문으로 저장된 행은 그대로)"""
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    codec, data = value[:1], value[1:]
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode('utf-8')
+    if codec == CODEC_ZSTD:
+        if _zstd_decompressor is None:
+            raise RuntimeError("zstd로 압축된 값입니다. zstandard 패키지를 설치하세요.")
+        return _zstd_decompressor.decompress(data).decode('utf-8')
+    if codec == CODEC_RAW:
+        return data.decode('utf-8')
+    # 코덱 표시 없는 바이트 (PostgreSQL 타입 변환 직후 등)
+    return value.decode('utf-8')
+
+
+class CompressedText(TypeDecorator):
+    """압축 저장 텍스트 컬럼 (파이썬 쪽에서는 str)
+    
+    BLOB/BYTEA에 compress_text 결과를 저장한다. SQLite의 기존 TEXT 컬럼에
+    평문으로 남아 있는 행도 읽을 수 있어 스키마 변경 없이 섞여 있어도 된다.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else compress_text(value)
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else decompress_text(value)
+
+
+class LogBlob(Base):
+    """로그 원문 (log_hash 기준 중복 제거, 같은 로그는 한 번만 저장)"""
+    __tablename__ = "log_blobs"
+    
+    log_hash = Column(String(64), primary_key=True)  # SHA256
+    content = Column(CompressedText, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class AnalysisResult(Base):
     """로그 분석 결과"""
     __tablename__ = "analysis_results"
@@ -23,8 +97,9 @@ class AnalysisResult(Base):
     source = Column(String(50), nullable=False)  # "local" or "cloud"
     model = Column(String(100), nullable=False, index=True)
     
-    # 입력
-    log_content = Column(Text, nullable=False)
+    # 입력 (원문은 log_blobs에 log_hash로 저장, 이 컬럼은 이전 행 호환용으로 빈 값)
+    # 이전 행은 수 MB일 수 있으므로 접근할 때만 로드
+    log_content = deferred(Column(CompressedText, nullable=False, default=""))
     log_hash = Column(String(64), nullable=False, index=True)  # SHA256
     log_size_bytes = Column(Integer, nullable=False)
     log_lines = Column(Integer, nullable=False)
@@ -34,7 +109,7 @@ class AnalysisResult(Base):
     prompt_version = Column(String(20), default="1.0")
     
     # 출력
-    response = Column(Text, nullable=False)
+    response = Column(CompressedText, nullable=False)
     response_size_bytes = Column(Integer, nullable=False)
     
     # 성능 메트릭
@@ -59,27 +134,28 @@ class AnalysisResult(Base):
     # 인덱스
     __table_args__ = (
         Index('idx_created_service', 'created_at', 'service_name'),
+        Index('idx_created_id', 'created_at', 'id'),  # 키셋 페이지네이션
         Index('idx_model_status', 'model', 'status'),
+        Index('idx_hash_status_created', 'log_hash', 'status', 'created_at'),  # 캐시 조회
+    )
+    
+    # to_dict() 필드 (목록 조회 fields= 프로젝션에 쓸 수 있는 이름)
+    DICT_FIELDS = (
+        "id", "created_at", "source", "model", "log_hash", "log_size_bytes", "log_lines",
+        "response", "duration_seconds", "tokens_used", "tags", "service_name", "environment", "status",
     )
     
     def to_dict(self):
         """딕셔너리로 변환"""
-        return {
-            "id": self.id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "source": self.source,
-            "model": self.model,
-            "log_hash": self.log_hash,
-            "log_size_bytes": self.log_size_bytes,
-            "log_lines": self.log_lines,
-            "response": self.response,
-            "duration_seconds": self.duration_seconds,
-            "tokens_used": self.tokens_used,
-            "tags": self.tags,
-            "service_name": self.service_name,
-            "environment": self.environment,
-            "status": self.status,
-        }
+        return row_to_dict(self, self.DICT_FIELDS)
+
+
+def row_to_dict(row, fields) -> dict:
+    """ORM 객체 또는 컬럼 조회 행 → to_dict() 형식"""
+    result = {field: getattr(row, field) for field in fields}
+    if result.get("created_at") is not None:
+        result["created_at"] = result["created_at"].isoformat()
+    return result
 
 
 class AnalysisMetric(Base):
@@ -102,6 +178,64 @@ class AnalysisMetric(Base):
     )
 
 
+class BatchJob(Base):
+    """배치 작업 (bifrost batch --resume용 매니페스트)"""
+    __tablename__ = "batch_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 실행 인자 (재개할 때 그대로 사용)
+    directory = Column(Text, nullable=False)
+    pattern = Column(String(200), nullable=False)
+    source = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=True)
+    options = Column(JSON, nullable=True)  # 파일 탐색 조건 (exclude, 크기/시간 필터 등)
+    
+    status = Column(String(20), default="running")  # running, completed, incomplete
+    
+    files = relationship("BatchJobFile", back_populates="job", cascade="all, delete-orphan")
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "directory": self.directory,
+            "pattern": self.pattern,
+            "source": self.source,
+            "model": self.model,
+            "options": self.options or {},
+            "status": self.status,
+        }
+
+
+class BatchJobFile(Base):
+    """배치 작업의 파일별 진행 상태"""
+    __tablename__ = "batch_job_files"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String(32), ForeignKey("batch_jobs.id"), nullable=False)
+    path = Column(Text, nullable=False)
+    
+    # 등록 시점 파일 상태 (재개 시 같으면 다시 읽지 않음)
+    size_bytes = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    log_hash = Column(String(64), nullable=True)
+    
+    status = Column(String(20), default="pending")  # pending, success, cached, failed
+    analysis_id = Column(Integer, nullable=True)
+    error_message = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    job = relationship("BatchJob", back_populates="files")
+    
+    __table_args__ = (
+        Index('idx_job_path', 'job_id', 'path', unique=True),
+        Index('idx_job_status', 'job_id', 'status'),
+    )
+
+
 class PromptTemplate(Base):
     """프롬프트 템플릿 관리"""
     __tablename__ = "prompt_templates"
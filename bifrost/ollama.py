@@ -1,11 +1,20 @@
 """Ollama API 통신 모듈"""
 
+import asyncio
+import json
+import ssl
+import threading
 import time
 import requests
-from typing import Optional, Dict, Any, Iterator
+import httpx
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, Tuple
 from rich.console import Console
 
 
+DEFAULT_POOL_SIZE = 10
+
+
 class OllamaClient:
     """Ollama API 클라이언트"""
     
@@ -15,12 +24,24 @@ class OllamaClient:
         model: str = "mistral",
         timeout: int = 120,
         max_retries: int = 3,
+        pool_size: int = DEFAULT_POOL_SIZE,
     ):
         self.url = url.rstrip('/')
         self.model = model
         self.timeout = timeout
         self.max_retries = max_retries
+        self.pool_size = pool_size
         self.console = Console()
+        
+        # keep-alive 커넥션 풀 (요청마다 TCP 핸드셰이크 방지)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def close(self):
+        """커넥션 풀 정리"""
+        self.session.close()
     
     def analyze(
         self,
@@ -75,7 +96,7 @@ class OllamaClient:
         }
         
         start_time = time.time()
-        response = requests.post(
+        response = self.session.post(
             api_endpoint,
             json=payload,
             timeout=self.timeout,
@@ -105,7 +126,7 @@ class OllamaClient:
         }
         
         start_time = time.time()
-        response = requests.post(
+        response = self.session.post(
             api_endpoint,
             json=payload,
             stream=True,
@@ -117,7 +138,6 @@ class OllamaClient:
         full_response = []
         for line in response.iter_lines():
             if line:
-                import json
                 chunk = json.loads(line)
                 if text := chunk.get("response"):
                     full_response.append(text)
@@ -139,12 +159,324 @@ class OllamaClient:
     def health_check(self) -> bool:
         """Ollama 서버 헬스 체크"""
         try:
-            response = requests.get(f"{self.url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.url}/api/tags", timeout=5)
             return response.status_code == 200
         except:
             return False
 
 
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _shared_ssl_context() -> ssl.SSLContext:
+    """프로세스 공용 SSL 컨텍스트
+    
+    httpx.AsyncClient는 생성할 때마다 CA 번들을 다시 읽는데(수십 ms, 동기 I/O),
+    요청마다 클라이언트를 만들면 그만큼 이벤트 루프가 막힌다.
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+class AsyncOllamaClient:
+    """Ollama API 비동기 클라이언트 (httpx 기반)
+    
+    FastAPI 핸들러, WebSocket, Kafka consumer 처럼 이벤트 루프 위에서 도는 경로용.
+    모델 응답을 기다리는 동안 루프를 막지 않는다.
+    """
+    
+    def __init__(
+        self,
+        url: str = "http://localhost:11434",
+        model: str = "mistral",
+        timeout: int = 120,
+        max_retries: int = 3,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url.rstrip('/')
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """내부 httpx 클라이언트 (지연 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                timeout=self.timeout,
+                verify=_shared_ssl_context(),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+    
+    async def aclose(self):
+        """커넥션 정리"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def analyze(
+        self,
+        prompt: str,
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        로그 분석 (재시도 로직 포함)
+        
+        Returns:
+            {"response": str, "metadata": dict}
+        """
+        for attempt in range(self.max_retries):
+            try:
+                if stream:
+                    return await self._analyze_stream(prompt)
+                else:
+                    return await self._analyze_blocking(prompt)
+            
+            except httpx.ConnectError:
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)  # exponential backoff
+                else:
+                    raise Exception(
+                        f"Ollama 서버에 연결할 수 없습니다. ({self.url})\n"
+                        "Ollama가 실행 중인지 확인하세요: ollama serve"
+                    )
+            
+            except httpx.TimeoutException:
+                if attempt >= self.max_retries - 1:
+                    raise Exception(f"Ollama 응답 시간 초과 ({self.timeout}초)")
+            
+            except Exception as e:
+                raise Exception(f"Ollama API 요청 실패: {e}")
+    
+    async def _analyze_blocking(self, prompt: str) -> Dict[str, Any]:
+        """비스트리밍 요청 (응답 전체를 한 번에 수신)"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+        }
+        
+        start_time = time.time()
+        response = await self.client.post("/api/generate", json=payload)
+        response.raise_for_status()
+        duration = time.time() - start_time
+        
+        result = response.json()
+        
+        return {
+            "response": result.get("response", ""),
+            "metadata": {
+                "model": self.model,
+                "duration": round(duration, 2),
+                "done": result.get("done", False),
+            }
+        }
+    
+    async def _analyze_stream(self, prompt: str) -> Dict[str, Any]:
+        """스트리밍 요청 (청크를 모아서 반환)"""
+        start_time = time.time()
+        full_response = [chunk async for chunk in self.stream(prompt)]
+        duration = time.time() - start_time
+        
+        return {
+            "response": ''.join(full_response),
+            "metadata": {
+                "model": self.model,
+                "duration": round(duration, 2),
+                "done": True,
+            }
+        }
+    
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """응답 텍스트 청크를 도착하는 대로 yield"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+        }
+        
+        async with self.client.stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    chunk = json.loads(line)
+                    if text := chunk.get("response"):
+                        yield text
+    
+    async def health_check(self) -> bool:
+        """Ollama 서버 헬스 체크"""
+        try:
+            response = await self.client.get("/api/tags", timeout=5)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+
+class OllamaClientRegistry:
+    """프로세스 공용 Ollama 클라이언트 레지스트리
+    
+    (url, model, timeout, max_retries, pool_size)마다 클라이언트 하나를 유지해 CLI, 배치,
+    API, Kafka 경로가 keep-alive 커넥션 풀을 공유하게 한다. 설정이 다르면
+    (예: 배치의 워커 수만큼 큰 풀) 별도 클라이언트를 만든다.
+    
+    비동기 클라이언트는 생성된 이벤트 루프에 묶인다. 루프마다 정리 태스크를 하나 띄워
+    루프가 끝날 때(asyncio.run의 남은 태스크 취소) 그 루프 위에서 커넥션을 닫는다.
+    다른 루프에서 같은 키를 요청하면 이전 클라이언트를 그 루프에서 닫게 하고 새로 만든다.
+    """
+    
+    def __init__(self):
+        self._clients: Dict[Tuple, OllamaClient] = {}
+        # 키 → (루프, 클라이언트, 정리 태스크)
+        self._async_clients: Dict[Tuple, Tuple[Any, AsyncOllamaClient, asyncio.Task]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(url: str, model: str, timeout: int, max_retries: int, pool_size: int) -> Tuple:
+        return (url.rstrip('/'), model, timeout, max_retries, pool_size)
+    
+    def get(
+        self,
+        url: str = "http://localhost:11434",
+        model: str = "mistral",
+        timeout: int = 120,
+        max_retries: int = 3,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> OllamaClient:
+        """동기 클라이언트 조회 (없으면 생성)"""
+        key = self._key(url, model, timeout, max_retries, pool_size)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            
+            self.misses += 1
+            client = OllamaClient(
+                url=url,
+                model=model,
+                timeout=timeout,
+                max_retries=max_retries,
+                pool_size=pool_size,
+            )
+            self._clients[key] = client
+            return client
+    
+    def get_async(
+        self,
+        url: str = "http://localhost:11434",
+        model: str = "mistral",
+        timeout: int = 120,
+        max_retries: int = 3,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> AsyncOllamaClient:
+        """비동기 클라이언트 조회 (현재 이벤트 루프 기준, 없으면 생성)"""
+        key = self._key(url, model, timeout, max_retries, pool_size)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is not None and entry[0] is loop:
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._retire(entry)
+            
+            self.misses += 1
+            client = AsyncOllamaClient(
+                url=url,
+                model=model,
+                timeout=timeout,
+                max_retries=max_retries,
+                pool_size=pool_size,
+            )
+            closer = loop.create_task(self._close_with_loop(key, client))
+            self._async_clients[key] = (loop, client, closer)
+            return client
+    
+    async def _close_with_loop(self, key: Tuple, client: AsyncOllamaClient):
+        """루프가 끝나거나 교체/정리될 때(태스크 취소) 클라이언트 닫기"""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            with self._lock:
+                entry = self._async_clients.get(key)
+                if entry is not None and entry[1] is client:
+                    del self._async_clients[key]
+            await client.aclose()
+    
+    @staticmethod
+    def _retire(entry: Tuple[Any, AsyncOllamaClient, asyncio.Task]):
+        """다른 루프의 클라이언트를 그 루프에서 닫게 함 (이미 닫힌 루프면 정리 태스크가 처리함)"""
+        loop, _, closer = entry
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(closer.cancel)
+    
+    def stats(self) -> Dict[str, int]:
+        """풀 hit/miss 통계"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "clients": len(self._clients) + len(self._async_clients),
+            }
+    
+    def close(self):
+        """동기 클라이언트 정리"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+    
+    async def aclose(self):
+        """모든 클라이언트 정리 (현재 루프의 비동기 클라이언트는 닫힐 때까지 대기)"""
+        self.close()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entries = list(self._async_clients.values())
+            self._async_clients.clear()
+        closing = []
+        for entry in entries:
+            if entry[0] is loop:
+                entry[2].cancel()
+                closing.append(entry[2])
+            else:
+                self._retire(entry)
+        await asyncio.gather(*closing, return_exceptions=True)
+
+
+client_registry = OllamaClientRegistry()
+
+
+def get_ollama_client(**kwargs) -> OllamaClient:
+    """공용 동기 클라이언트 (OllamaClientRegistry.get 참고)"""
+    return client_registry.get(**kwargs)
+
+
+def get_async_ollama_client(**kwargs) -> AsyncOllamaClient:
+    """공용 비동기 클라이언트 (OllamaClientRegistry.get_async 참고)"""
+    return client_registry.get_async(**kwargs)
+
+
 # 하위 호환성을 위한 레거시 함수
 def analyze_with_ollama(
     prompt: str,
@@ -153,6 +485,6 @@ def analyze_with_ollama(
     stream: bool = False,
 ) -> str:
     """레거시 함수 (하위 호환성)"""
-    client = OllamaClient(url=ollama_url, model=model)
+    client = get_ollama_client(url=ollama_url, model=model)
     result = client.analyze(prompt, stream=stream)
     return result["response"]
@@ -0,0 +1,57 @@
+"""로그 페이로드 (인코딩/해시/크기/줄 수 1회 계산)"""
+
+import hashlib
+from functools import cached_property
+from typing import Optional, Union
+
+
+class LogPayload:
+    """로그 본문과 파생값 묶음
+    
+    요청 하나가 전처리 → 캐시 조회 → DB 저장을 거치는 동안
+    UTF-8 인코딩, SHA-256 해시, 바이트 크기, 줄 수를 한 번씩만 계산하도록
+    이 객체를 그대로 넘긴다. 각 값은 처음 접근할 때 계산된다.
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    @classmethod
+    def of(cls, log: Union[str, "LogPayload"]) -> "LogPayload":
+        """str이면 감싸고, 이미 LogPayload면 그대로 반환"""
+        return log if isinstance(log, LogPayload) else cls(log)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, sha256: Optional[str] = None) -> "LogPayload":
+        """UTF-8 바이트로 생성 (파일/mmap 입력: 다시 인코딩하지 않음, 이미 계산한 해시 재사용)"""
+        payload = cls(data.decode('utf-8'))
+        payload.data = data
+        if sha256 is not None:
+            payload.sha256 = sha256
+        return payload
+    
+    @cached_property
+    def data(self) -> bytes:
+        """UTF-8 인코딩 바이트"""
+        return self.text.encode('utf-8')
+    
+    @cached_property
+    def sha256(self) -> str:
+        """SHA-256 hex digest (캐시 키, DB log_hash)"""
+        return hashlib.sha256(self.data).hexdigest()
+    
+    @property
+    def size_bytes(self) -> int:
+        """UTF-8 바이트 크기"""
+        return len(self.data)
+    
+    @cached_property
+    def line_count(self) -> int:
+        """줄 수 (len(text.split('\\n'))와 동일, 리스트 생성 없음)"""
+        return self.text.count('\n') + 1
+    
+    def __len__(self) -> int:
+        return len(self.text)
+    
+    def __str__(self) -> str:
+        return self.text
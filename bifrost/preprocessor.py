@@ -1,7 +1,16 @@
 """로그 전처리 모듈"""
 
 import re
-from typing import List
+from collections import deque
+from typing import List, Optional, Union, Iterable, Iterator, AsyncIterable, AsyncIterator, Deque, Tuple
+
+from bifrost.logsource import LogSource
+from bifrost.payload import LogPayload
+from bifrost.timestamps import TimestampRegistry, get_timestamp_registry
+
+
+# 사전 컴파일 패턴
+_BLANK_RUN = re.compile(r'\n\s*\n\s*\n+')
 
 
 class LogPreprocessor:
@@ -12,15 +21,20 @@ class LogPreprocessor:
         max_size_mb: float = 5.0,
         truncate: bool = True,
         remove_timestamps: bool = False,
+        timestamps: Optional[TimestampRegistry] = None,
     ):
         self.max_size_bytes = int(max_size_mb * 1024 * 1024)
         self.truncate = truncate
         self.remove_timestamps = remove_timestamps
+        self.timestamps = timestamps or get_timestamp_registry()
     
-    def process(self, log_content: str) -> str:
-        """로그 전처리 파이프라인"""
+    def process(self, log_content: Union[str, LogPayload]) -> str:
+        """로그 전처리 파이프라인 (LogPayload를 넘기면 크기 계산 재사용)"""
+        payload = LogPayload.of(log_content)
+        log_content = payload.text
+        
         # 1. 크기 제한
-        if self.truncate and len(log_content.encode('utf-8')) > self.max_size_bytes:
+        if self.truncate and payload.size_bytes > self.max_size_bytes:
             log_content = self._truncate_log(log_content)
         
         # 2. 타임스탬프 제거 (선택)
@@ -53,28 +67,32 @@ class LogPreprocessor:
         return truncated
     
     def _remove_timestamps(self, content: str) -> str:
-        """일반적인 타임스탬프 패턴 제거"""
-        patterns = [
-            r'\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?',  # ISO
-            r'\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}',  # Apache
-            r'\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}',  # Syslog
-        ]
-        
-        result = content
-        for pattern in patterns:
-            result = re.sub(pattern, '', result)
-        
-        return result
+        """타임스탬프 제거 (등록된 포맷 전체를 한 번에)"""
+        return self.timestamps.strip(content)
     
     def _clean_log(self, content: str) -> str:
         """기본 정리: 빈 줄 정리, 공백 정리"""
         # 연속된 빈 줄을 하나로
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+        content = _BLANK_RUN.sub('\n\n', content)
         
-        # 각 줄의 앞뒤 공백 제거
-        lines = [line.rstrip() for line in content.split('\n')]
-        
-        return '\n'.join(lines)
+        # 각 줄의 끝 공백 제거 (정규식 [ \t]+$ 치환보다 split/join이 빠름)
+        return '\n'.join(map(str.rstrip, content.split('\n')))
+    
+    def stream(self) -> "StreamingLogProcessor":
+        """스트리밍 처리기 생성 (청크 단위 입력, O(출력) 메모리)"""
+        return StreamingLogProcessor(self)
+    
+    def process_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """줄/청크 이터레이터(파일, stdin 등)를 전처리해 출력 조각을 yield"""
+        return self.stream().process(chunks)
+    
+    def aprocess_stream(self, chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+        """비동기 이터레이터(aiofiles 등)용 process_stream"""
+        return self.stream().aprocess(chunks)
+    
+    def process_source(self, source: "LogSource") -> Iterator[str]:
+        """LogSource 전처리 (mmap 입력은 잘릴 중간 구간을 읽지 않음)"""
+        return self.stream().process_source(source)
     
     def get_stats(self, content: str) -> dict:
         """로그 통계"""
@@ -85,3 +103,205 @@ class LogPreprocessor:
             "total_chars": len(content),
             "non_empty_lines": len([l for l in lines if l.strip()]),
         }
+
+
+def _byte_len(text: str) -> int:
+    """UTF-8 바이트 길이 (ASCII면 인코딩 생략)"""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+class _BlankLineCollapser:
+    r"""_clean_log의 빈 줄 압축을 줄 단위로 재현
+    
+    r'\n\s*\n\s*\n+' → '\n\n' 치환은 개행이 3개 이상 연속된 구간을 2개로 줄인다.
+    빈 줄 r개가 이어질 때 구간의 개행 수는 위치에 따라 다르다:
+    내용 줄 사이 r+1, 처음/끝 r, 전체가 빈 줄이면 r-1.
+    """
+    
+    def __init__(self):
+        self.pending = 0  # 아직 내보내지 않은 빈 줄 수
+        self.seen_content = False
+    
+    def push(self, line: str) -> List[str]:
+        if not line:
+            self.pending += 1
+            return []
+        
+        blanks = self.pending
+        if self.seen_content and blanks >= 2:
+            blanks = 1
+        elif not self.seen_content and blanks >= 3:
+            blanks = 2
+        self.pending = 0
+        self.seen_content = True
+        return [""] * blanks + [line]
+    
+    def finish(self) -> List[str]:
+        blanks = self.pending
+        if self.seen_content and blanks >= 3:
+            blanks = 2
+        elif not self.seen_content and blanks >= 4:
+            blanks = 3
+        self.pending = 0
+        return [""] * blanks
+
+
+class StreamingLogProcessor:
+    """스트리밍 로그 전처리 (한 번의 순회, O(출력) 메모리)
+    
+    입력을 줄 단위로 한 번만 훑으면서 앞부분은 바로 내보내고 뒷부분은
+    링 버퍼(deque)에 바이트 예산만큼만 유지한다. 수 GB 로그도 전체를
+    메모리에 올리지 않는다.
+    
+    자르기 기준은 process()와 다르다. 전체 줄 수를 미리 알 수 없으므로
+    줄 비율(앞뒤 40%) 대신 max_size_bytes의 앞 40% / 뒤 40% 바이트 예산을 쓴다.
+    입력이 max_size_bytes 이하면 process()와 결과가 같다.
+    """
+    
+    HEAD_RATIO = 0.4
+    TAIL_RATIO = 0.4
+    
+    def __init__(self, preprocessor: LogPreprocessor):
+        self.preprocessor = preprocessor
+        
+        # 줄마다 개행 1바이트를 더해 세므로 마지막 줄 몫 +1
+        self._limit = preprocessor.max_size_bytes + 1 if preprocessor.truncate else None
+        self._head_budget = int(preprocessor.max_size_bytes * self.HEAD_RATIO) if self._limit else None
+        self._tail_budget_truncated = int(preprocessor.max_size_bytes * self.TAIL_RATIO)
+        
+        self._carry = ""
+        self._head_bytes = 0
+        self._head_full = False
+        self._tail: Deque[Tuple[str, int]] = deque()
+        self._tail_bytes = 0
+        self._tail_budget = 0
+        self._dropped = 0
+        self._collapser = _BlankLineCollapser()
+        self._closed = False
+        
+        # 통계
+        self.input_lines = 0
+        self.input_bytes = 0
+        self.output_lines = 0
+        self.output_bytes = 0
+    
+    def feed(self, chunk: str) -> List[str]:
+        """청크 입력 → 지금 내보낼 수 있는 출력 조각"""
+        self.input_bytes += _byte_len(chunk)
+        lines = (self._carry + chunk).split('\n')
+        self._carry = lines.pop()
+        
+        out: List[str] = []
+        for line in lines:
+            self._push(line, out)
+        return out
+    
+    def skip(self, lines: int, size: int):
+        """중간 구간을 읽지 않고 생략 처리 (앞부분 예산을 채운 직후, 줄 경계에서만)"""
+        self.input_lines += lines
+        self.input_bytes += size
+        self._head_full = True
+        self._dropped += lines
+        self._tail_budget = self._tail_budget_truncated
+    
+    def close(self) -> List[str]:
+        """입력 종료 → 남은 출력 조각 (뒷부분 + 생략 표시)"""
+        if self._closed:
+            return []
+        self._closed = True
+        
+        out: List[str] = []
+        self._push(self._carry, out)
+        self._carry = ""
+        
+        if self._dropped:
+            for line in ("", f"... [중간 {self._dropped}줄 생략] ...", ""):
+                self._emit(line, out, raw=True)
+        for line, _ in self._tail:
+            self._emit(line, out)
+        self._tail.clear()
+        
+        for line in self._collapser.finish():
+            self._write(line, out)
+        return out
+    
+    def process(self, chunks: Iterable[str]) -> Iterator[str]:
+        """전체 입력 처리 (출력 조각을 순서대로 yield)"""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+    
+    def process_source(self, source: LogSource) -> Iterator[str]:
+        """LogSource 입력 처리 (process(source.chunks())와 결과 동일)
+        
+        크기를 미리 아는 mmap 입력이 잘릴 만큼 크면 앞부분 예산과 뒷부분 예산에
+        들어가는 줄만 디코딩하고, 중간은 개행 수만 센다.
+        """
+        limit = self._limit
+        if not source.mapped or limit is None or source.size + 1 <= limit or self.input_lines:
+            yield from self.process(source.chunks())
+            return
+        
+        buffer = source.buffer
+        size = source.size
+        # 앞부분: 누적 (줄 바이트 + 1) <= head_budget 인 줄들 = 오프셋 head_budget 이전 마지막 개행까지
+        head_end = buffer.rfind(b'\n', 0, self._head_budget) + 1
+        # 뒷부분: 합이 예산 이하인 가장 긴 접미 줄들 (마지막 줄도 +1로 셈)
+        tail_start = buffer.find(b'\n', size - self._tail_budget_truncated) + 1
+        if tail_start == 0:
+            # 마지막 줄 하나가 뒷부분 예산보다 큼: 일반 스트리밍으로
+            yield from self.process(source.chunks())
+            return
+        
+        for chunk in source.chunks(0, head_end):
+            yield from self.feed(chunk)
+        self.skip(source.count_lines(head_end, tail_start), tail_start - head_end)
+        for chunk in source.chunks(tail_start):
+            yield from self.feed(chunk)
+        yield from self.close()
+    
+    async def aprocess(self, chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+        """비동기 입력 처리"""
+        async for chunk in chunks:
+            for piece in self.feed(chunk):
+                yield piece
+        for piece in self.close():
+            yield piece
+    
+    def _push(self, line: str, out: List[str]):
+        self.input_lines += 1
+        
+        if self._limit is None:
+            self._emit(line, out)
+            return
+        
+        size = _byte_len(line) + 1
+        if not self._head_full:
+            if self._head_bytes + size <= self._head_budget:
+                self._head_bytes += size
+                self._emit(line, out)
+                return
+            self._head_full = True
+            self._tail_budget = self._limit - self._head_bytes
+        
+        self._tail.append((line, size))
+        self._tail_bytes += size
+        while self._tail_bytes > self._tail_budget:
+            _, dropped_size = self._tail.popleft()
+            self._tail_bytes -= dropped_size
+            self._dropped += 1
+            # 한 번이라도 버리면 자르기 모드: 뒷부분 예산을 40%로 축소
+            self._tail_budget = self._tail_budget_truncated
+    
+    def _emit(self, line: str, out: List[str], raw: bool = False):
+        """타임스탬프 제거 → 공백 정리 → 빈 줄 압축"""
+        if not raw and self.preprocessor.remove_timestamps:
+            line = self.preprocessor._remove_timestamps(line)
+        for cleaned in self._collapser.push(line.rstrip()):
+            self._write(cleaned, out)
+    
+    def _write(self, line: str, out: List[str]):
+        piece = line if self.output_lines == 0 else '\n' + line
+        self.output_lines += 1
+        self.output_bytes += _byte_len(piece)
+        out.append(piece)
@@ -0,0 +1,59 @@
+"""같은 분석 요청 합치기 (single-flight)
+
+장애 때 여러 클라이언트가 같은 로그를 거의 동시에 보내면 아직 아무것도 저장되지 않아
+모두 캐시 미스가 나고 각자 모델을 호출한다. 같은 키(로그 해시 + 소스 + 모델 + 프롬프트)의
+분석이 진행 중이면 새로 호출하지 않고 그 결과를 함께 기다린다.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """진행 중인 같은 키 작업을 하나로 합침
+
+    처음 요청한 쪽(leader)의 작업을 별도 태스크로 실행하고 모두 shield로 기다린다.
+    기다리던 요청 하나가 취소돼도(클라이언트 연결 끊김 등) 공유 작업은 계속된다.
+    작업이 끝나면 키를 지우므로 결과를 보관하지 않는다 (이후 요청은 결과 캐시에서).
+    실패는 그때 기다리던 요청 모두에 같은 예외로 전달된다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders: Counter = Counter()  # channel별 실제 실행 수
+        self.coalesced: Counter = Counter()  # channel별 합쳐진 요청 수
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], channel: str = "api") -> Tuple[Any, bool]:
+        """key의 작업 결과 (진행 중이면 합류), (결과, 합류 여부)"""
+        call = self._calls.get(key)
+        shared = call is not None
+        if shared:
+            self.coalesced[channel] += 1
+        else:
+            self.leaders[channel] += 1
+            call = self._calls[key] = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(call), shared
+
+    def _finish(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()  # 기다리던 요청이 모두 취소돼도 "never retrieved" 경고 없음
+
+    def in_flight(self) -> int:
+        """진행 중인 작업 수"""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """channel별 실행/합류 수"""
+        return {
+            "in_flight": self.in_flight(),
+            "leaders": dict(self.leaders),
+            "coalesced": dict(self.coalesced),
+        }
+
+
+# 프로세스 공용 (키가 같으면 API/WebSocket/Heimdall 채널이 달라도 합쳐짐)
+analysis_flight = SingleFlight()
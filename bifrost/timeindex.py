@@ -0,0 +1,251 @@
+"""타임스탬프 파싱 & 시간 범위 인덱스 (이진 탐색 슬라이싱)"""
+
+import mmap
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+
+Buffer = Union[bytes, bytearray, mmap.mmap, str]
+TimeValue = Union[str, datetime, int, float]
+
+# 필드를 이름 있는 그룹으로 잡는 파싱용 패턴 (왼쪽에서 처음 나오는 것 사용)
+_TEXT_TIMESTAMP_SOURCE = (
+    # ISO 8601: 2024-10-25 10:15:32, 2024-10-25T10:15:32.123+09:00
+    r'(?P<iy>\d{4})-(?P<im>\d{2})-(?P<id>\d{2})[T ](?P<iH>\d{2}):(?P<iM>\d{2}):(?P<iS>\d{2})'
+    r'(?:[.,](?P<if>\d+))?(?P<iz>Z|[+-]\d{2}:?\d{2})?'
+    # Apache: 25/Oct/2024:10:15:32 +0000
+    r'|(?P<ad>\d{2})/(?P<ab>[A-Za-z]{3})/(?P<ay>\d{4}):(?P<aH>\d{2}):(?P<aM>\d{2}):(?P<aS>\d{2})'
+    r'(?: (?P<az>[+-]\d{4}))?'
+    # 미국식: 10/25/2024 10:15:32
+    r'|(?P<um>\d{2})/(?P<ud>\d{2})/(?P<uy>\d{4})\s+(?P<uH>\d{2}):(?P<uM>\d{2}):(?P<uS>\d{2})'
+    # syslog: Oct 25 10:15:32 (연도 없음)
+    r'|(?P<sb>[A-Z][a-z]{2})\s+(?P<sd>\d{1,2}) (?P<sH>\d{2}):(?P<sM>\d{2}):(?P<sS>\d{2})'
+)
+# epoch millis (2001 ~ 2033): 다른 포맷이 없을 때만 사용 (ID 숫자 오인 방지)
+_EPOCH_MS_SOURCE = r'(?<![0-9])(?P<ms>1[0-9]{12})(?![0-9])'
+
+_TEXT_PATTERNS = {
+    str: re.compile(_TEXT_TIMESTAMP_SOURCE, re.ASCII),
+    bytes: re.compile(_TEXT_TIMESTAMP_SOURCE.encode(), re.ASCII),
+}
+_EPOCH_MS_PATTERNS = {
+    str: re.compile(_EPOCH_MS_SOURCE, re.ASCII),
+    bytes: re.compile(_EPOCH_MS_SOURCE.encode(), re.ASCII),
+}
+
+_MONTHS = {
+    name: index
+    for index, name in enumerate(
+        ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1
+    )
+}
+_MONTHS.update({name.encode(): index for name, index in list(_MONTHS.items())})
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _day_epoch(year: int, month: int, day: int) -> int:
+    """날짜 → 그날 0시 epoch (UTC)"""
+    return (date(year, month, day).toordinal() - _EPOCH_ORDINAL) * 86400
+
+
+def _offset_seconds(zone) -> int:
+    """'Z', '+09:00', '-0500' → 초"""
+    if not zone:
+        return 0
+    if isinstance(zone, bytes):
+        zone = zone.decode()
+    if zone == 'Z':
+        return 0
+    digits = zone[1:].replace(':', '')
+    seconds = int(digits[:2]) * 3600 + int(digits[2:4]) * 60
+    return -seconds if zone[0] == '-' else seconds
+
+
+def _match_epoch(match: re.Match, default_year: Optional[int]) -> Optional[float]:
+    group = match.group
+    try:
+        if group('iy') is not None:
+            epoch = _day_epoch(int(group('iy')), int(group('im')), int(group('id')))
+            epoch += int(group('iH')) * 3600 + int(group('iM')) * 60 + int(group('iS'))
+            fraction = group('if')
+            if fraction:
+                epoch += int(fraction) / 10 ** len(fraction)
+            return epoch - _offset_seconds(group('iz'))
+        if group('ad') is not None:
+            epoch = _day_epoch(int(group('ay')), _MONTHS[group('ab')], int(group('ad')))
+            epoch += int(group('aH')) * 3600 + int(group('aM')) * 60 + int(group('aS'))
+            return epoch - _offset_seconds(group('az'))
+        if group('um') is not None:
+            epoch = _day_epoch(int(group('uy')), int(group('um')), int(group('ud')))
+            return epoch + int(group('uH')) * 3600 + int(group('uM')) * 60 + int(group('uS'))
+        if group('sb') is not None:
+            year = default_year or datetime.utcnow().year
+            epoch = _day_epoch(year, _MONTHS[group('sb')], int(group('sd')))
+            return epoch + int(group('sH')) * 3600 + int(group('sM')) * 60 + int(group('sS'))
+    except (KeyError, ValueError):
+        # 잘못된 날짜(13월 등), 알 수 없는 월 이름
+        return None
+    return None
+
+
+def parse_timestamp(line: Union[str, bytes], default_year: Optional[int] = None) -> Optional[float]:
+    """줄의 첫 타임스탬프 → epoch 초 (UTC, 시간대 없으면 UTC로 간주)
+
+    ISO 8601, Apache, 미국식(MM/DD/YYYY), syslog(연도는 default_year, 기본 올해),
+    epoch millis를 인식한다. str/bytes(mmap 줄) 모두 받는다.
+    """
+    kind = bytes if isinstance(line, (bytes, bytearray)) else str
+    match = _TEXT_PATTERNS[kind].search(line)
+    while match is not None:
+        epoch = _match_epoch(match, default_year)
+        if epoch is not None:
+            return epoch
+        match = _TEXT_PATTERNS[kind].search(line, match.end())
+
+    match = _EPOCH_MS_PATTERNS[kind].search(line)
+    if match is not None:
+        return int(match.group('ms')) / 1000
+    return None
+
+
+def to_epoch(value: TimeValue) -> float:
+    """시간 범위 경계 → epoch 초 (문자열은 로그와 같은 포맷 또는 ISO 일부: '2024-10-25 10:30')"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+    epoch = parse_timestamp(value)
+    if epoch is not None:
+        return epoch
+    try:
+        return to_epoch(datetime.fromisoformat(value.strip()))
+    except ValueError:
+        raise ValueError(f"시간 형식을 해석할 수 없습니다: {value!r}")
+
+
+def _newline(buffer: Buffer):
+    return '\n' if isinstance(buffer, str) else b'\n'
+
+
+def _next_timestamp(buffer: Buffer, pos: int, default_year: Optional[int]) -> Tuple[Optional[float], int]:
+    """pos 이후(줄 경계로 맞춤) 첫 타임스탬프 줄 → (epoch, 줄 시작). 없으면 (None, 끝)"""
+    newline = _newline(buffer)
+    end = len(buffer)
+    if 0 < pos < end and buffer[pos - 1:pos] != newline:
+        line_end = buffer.find(newline, pos)
+        pos = end if line_end < 0 else line_end + 1
+
+    while pos < end:
+        line_end = buffer.find(newline, pos)
+        if line_end < 0:
+            line_end = end
+        epoch = parse_timestamp(buffer[pos:line_end], default_year)
+        if epoch is not None:
+            return epoch, pos
+        pos = line_end + 1
+    return None, end
+
+
+def _bisect_offset(buffer: Buffer, target: float, inclusive: bool, default_year: Optional[int]) -> int:
+    """타임스탬프가 target 이상(inclusive=False면 초과)인 첫 줄의 시작 오프셋"""
+    lo, hi = 0, len(buffer)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        epoch, line_start = _next_timestamp(buffer, mid, default_year)
+        if epoch is None or (epoch >= target if inclusive else epoch > target):
+            hi = mid
+        else:
+            # mid ~ line_start 사이 어디서 찾아도 같은 줄이 나옴
+            lo = line_start + 1
+    return _next_timestamp(buffer, lo, default_year)[1]
+
+
+def bisect_time_range(
+    buffer: Buffer,
+    start: Optional[TimeValue] = None,
+    end: Optional[TimeValue] = None,
+    default_year: Optional[int] = None,
+) -> Tuple[int, int]:
+    """시간순 정렬된 로그에서 [start, end] 구간의 (시작, 끝) 오프셋
+
+    인덱스 없이 버퍼(mmap)를 직접 이진 탐색하므로 O(log 크기)번의 줄 파싱만 한다.
+    타임스탬프 없는 줄(스택 트레이스 등)은 앞의 타임스탬프 줄에 속한다.
+    """
+    begin = 0 if start is None else _bisect_offset(buffer, to_epoch(start), True, default_year)
+    finish = len(buffer) if end is None else _bisect_offset(buffer, to_epoch(end), False, default_year)
+    return begin, max(begin, finish)
+
+
+def read_time_range(
+    path: Union[str, Path],
+    start: Optional[TimeValue] = None,
+    end: Optional[TimeValue] = None,
+    default_year: Optional[int] = None,
+) -> str:
+    """로그 파일에서 시간 구간만 읽기 (mmap, 해당 구간 페이지만 접근)"""
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            begin, finish = bisect_time_range(mapped, start, end, default_year)
+            return mapped[begin:finish].decode('utf-8', errors='replace')
+
+
+class TimeIndex:
+    """(epoch, 오프셋) 정렬 표
+
+    버퍼를 한 번 훑어 타임스탬프 줄마다 epoch을 한 번만 파싱해 둔다.
+    같은 로그에 시간 구간 질의를 여러 번 할 때 bisect로 바로 답한다.
+    시간이 역행하는 줄은 그때까지의 최댓값으로 기록해 표를 정렬 상태로 유지한다.
+    """
+
+    def __init__(self, buffer: Buffer, default_year: Optional[int] = None):
+        self.buffer = buffer
+        self.epochs = array('d')
+        self.offsets = array('q')
+
+        newline = _newline(buffer)
+        end = len(buffer)
+        latest = float('-inf')
+        pos = 0
+        while pos < end:
+            line_end = buffer.find(newline, pos)
+            if line_end < 0:
+                line_end = end
+            epoch = parse_timestamp(buffer[pos:line_end], default_year)
+            if epoch is not None:
+                latest = max(latest, epoch)
+                self.epochs.append(latest)
+                self.offsets.append(pos)
+            pos = line_end + 1
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def range(self, start: Optional[TimeValue] = None, end: Optional[TimeValue] = None) -> Tuple[int, int]:
+        """[start, end] 구간의 (시작, 끝) 오프셋"""
+        size = len(self.buffer)
+        begin = 0
+        if start is not None:
+            index = bisect_left(self.epochs, to_epoch(start))
+            begin = self.offsets[index] if index < len(self.offsets) else size
+        finish = size
+        if end is not None:
+            index = bisect_right(self.epochs, to_epoch(end))
+            finish = self.offsets[index] if index < len(self.offsets) else size
+        return begin, max(begin, finish)
+
+    def slice(self, start: Optional[TimeValue] = None, end: Optional[TimeValue] = None) -> Buffer:
+        """[start, end] 구간 내용"""
+        begin, finish = self.range(start, end)
+        return self.buffer[begin:finish]
@@ -0,0 +1,171 @@
+"""타임스탬프 패턴 레지스트리 (사전 컴파일, 단일 패스)"""
+
+import re
+from threading import Lock
+from typing import Dict, List, Mapping, Optional, Pattern, Tuple
+
+
+# 기본 포맷 (등록 순서 = 같은 위치에서 매칭 우선순위)
+BUILTIN_TIMESTAMP_FORMATS: Dict[str, str] = {
+    "iso": r'\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?',
+    "apache": r'\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}',
+    "syslog": r'\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}',
+}
+
+# HH:MM:SS의 ":MM:SS" 부분 (리터럴 ':'로 시작해 정규식 엔진이 빠르게 건너뜀)
+_TIME_ANCHOR = re.compile(r':\d\d:\d\d')
+# 앵커(HH) 앞으로 타임스탬프 시작을 찾아볼 최대 거리
+ANCHOR_LOOKBACK = 32
+
+_NEVER = re.compile(r'(?!)')
+
+
+def _combine(formats: List[Tuple[str, str]]) -> Pattern:
+    """(?P<이름>...) 대안으로 결합 (포맷이 없으면 아무것도 매칭하지 않음)"""
+    if not formats:
+        return _NEVER
+    return re.compile('|'.join(f'(?P<{name}>{regex})' for name, regex in formats))
+
+
+class TimestampRegistry:
+    """타임스탬프 포맷 레지스트리
+
+    등록된 포맷을 (?P<이름>...) 대안으로 묶은 정규식으로 컴파일해 두고
+    등록/해제 시에만 다시 컴파일한다. 매칭된 포맷은 match.lastgroup으로 알 수 있다.
+
+    anchored=True 포맷(기본 포맷 포함)은 HH:MM:SS를 포함하고 같은 줄에서
+    그 앞 ANCHOR_LOOKBACK자 안에서 시작해야 한다 (줄을 넘는 타임스탬프는 제거하지 않음). 이런 포맷은 본문 전체를
+    결합 정규식으로 훑지 않고, ':MM:SS' 리터럴 검색으로 후보 위치를 찾은 뒤
+    그 주변만 매칭한다. 앵커가 없는 사용자 포맷은 한 번의 결합 패스로 처리한다.
+    """
+
+    def __init__(self, formats: Optional[Mapping[str, str]] = None, anchored: bool = True):
+        self._formats: Dict[str, Tuple[str, bool]] = {}
+        self._compiled: Optional[Tuple[Pattern, Pattern, Pattern]] = None
+        self._lock = Lock()
+        formats = BUILTIN_TIMESTAMP_FORMATS if formats is None else formats
+        for name, pattern in formats.items():
+            self.register(name, pattern, anchored=anchored)
+
+    def register(self, name: str, pattern: str, anchored: bool = False):
+        """포맷 등록 (같은 이름이면 교체)"""
+        if not name.isidentifier():
+            raise ValueError(f"타임스탬프 포맷 이름은 식별자여야 합니다: {name!r}")
+        if re.compile(pattern).match(''):
+            raise ValueError(f"빈 문자열과 매칭되는 타임스탬프 포맷입니다: {name}")
+        with self._lock:
+            self._formats[name] = (pattern, anchored)
+            self._compiled = None
+
+    def register_many(self, formats: Mapping[str, str]):
+        """여러 포맷 등록 (설정의 log.timestamp_formats 등)"""
+        for name, pattern in formats.items():
+            self.register(name, pattern)
+
+    def unregister(self, name: str):
+        """포맷 해제"""
+        with self._lock:
+            if self._formats.pop(name, None) is not None:
+                self._compiled = None
+
+    @property
+    def formats(self) -> Dict[str, str]:
+        """등록된 포맷 (이름 → 정규식)"""
+        return {name: pattern for name, (pattern, _) in self._formats.items()}
+
+    def _patterns(self) -> Tuple[Pattern, Pattern, Pattern]:
+        """(전체, 앵커 포맷, 앵커 없는 포맷) 결합 정규식 (지연 컴파일)"""
+        compiled = self._compiled
+        if compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    items = [(name, pattern) for name, (pattern, _) in self._formats.items()]
+                    anchored = [(name, pattern) for name, (pattern, a) in self._formats.items() if a]
+                    free = [(name, pattern) for name, (pattern, a) in self._formats.items() if not a]
+                    self._compiled = (_combine(items), _combine(anchored), _combine(free))
+                compiled = self._compiled
+        return compiled
+
+    @property
+    def pattern(self) -> Pattern:
+        """전체 포맷 결합 정규식"""
+        return self._patterns()[0]
+
+    def search(self, text: str, pos: int = 0) -> Optional[re.Match]:
+        """첫 번째 타임스탬프 (match.lastgroup = 포맷 이름)"""
+        return self.pattern.search(text, pos)
+
+    def strip(self, text: str) -> str:
+        """모든 타임스탬프 제거"""
+        _, anchored, free = self._patterns()
+        if anchored is not _NEVER:
+            text = self._strip_anchored(anchored, text)
+        if free is not _NEVER:
+            text = free.sub('', text)
+        return text
+
+    @staticmethod
+    def _strip_anchored(pattern: Pattern, text: str) -> str:
+        """앵커 후보 주변만 매칭해서 제거"""
+        out = []
+        pos = 0
+        end = len(text)
+        find_anchor = _TIME_ANCHOR.search
+        search = pattern.search
+
+        while True:
+            anchor = find_anchor(text, pos)
+            if anchor is None:
+                break
+
+            hour = anchor.start() - 2
+            window = max(pos, hour - ANCHOR_LOOKBACK)
+            if hour > window:
+                window = max(window, text.rfind('\n', window, hour) + 1)
+            line_end = text.find('\n', anchor.end())
+            if line_end < 0:
+                line_end = end
+
+            match = search(text, window, line_end)
+            if match is None:
+                # 이 줄 나머지에는 타임스탬프 없음
+                out.append(text[pos:line_end])
+                pos = line_end
+                continue
+
+            out.append(text[pos:match.start()])
+            pos = match.end()
+
+        if not out:
+            return text
+        out.append(text[pos:])
+        return ''.join(out)
+
+
+# 전역 레지스트리 (LogPreprocessor 기본값)
+timestamp_registry = TimestampRegistry()
+_configured = False
+_configure_lock = Lock()
+
+
+def get_timestamp_registry(config=None) -> TimestampRegistry:
+    """전역 레지스트리 (처음 쓸 때 한 번 설정의 log.timestamp_formats 등록)
+
+    CLI/API/배치/Heimdall 어느 경로로 먼저 쓰이든 같은 사용자 포맷이 적용된다.
+    config를 넘기면 (CLI --config) 그 설정을, 아니면 기본 Config()를 읽는다.
+    """
+    global _configured
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                if config is None:
+                    from bifrost.config import Config
+                    config = Config()
+                timestamp_registry.register_many(config.get("log.timestamp_formats", {}) or {})
+                _configured = True
+    return timestamp_registry
+
+
+def register_timestamp_format(name: str, pattern: str, anchored: bool = False):
+    """전역 레지스트리에 타임스탬프 포맷 추가"""
+    get_timestamp_registry().register(name, pattern, anchored=anchored)
@@ -0,0 +1,188 @@
+"""분석 결과 쓰기 지연(write-behind) 버퍼
+
+save_analysis / save_metric 호출을 모아 bulk_save_analyses / bulk_save_metrics로
+한 트랜잭션에 저장한다. 행마다 세션 생성/커밋하던 비용을 max_batch건당 한 번으로 줄인다.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bifrost.database import Database
+from bifrost.logger import logger
+
+
+DURABILITY_MODES = ("commit", "buffered")
+
+
+class AnalysisWriter:
+    """비동기 쓰기 지연 버퍼 + 백그라운드 flusher
+
+    max_batch건이 모이거나 첫 건 이후 max_delay초가 지나면 한 번에 저장한다.
+
+    durability:
+        - "commit": 호출한 코루틴은 배치가 커밋된 뒤 id를 받는다 (그룹 커밋, 기본)
+        - "buffered": 큐에 넣고 바로 None 반환. 저장 실패나 프로세스 종료 시
+          아직 flush 되지 않은 행은 잃을 수 있다 (로그만 남김)
+
+    flusher는 첫 저장 때 현재 이벤트 루프에서 시작한다. 종료 전에 close()로 남은 행을 저장할 것.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        max_batch: int = 500,
+        max_delay: float = 0.05,
+        durability: str = "commit",
+        max_pending: int = 10000,
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"알 수 없는 durability: {durability} (가능: {', '.join(DURABILITY_MODES)})")
+        if max_batch < 1:
+            raise ValueError("max_batch는 1 이상이어야 합니다")
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.durability = durability
+        self.max_pending = max_pending
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.rows_written = 0
+        self.flushes = 0
+        self.failures = 0
+
+    @classmethod
+    def from_settings(cls, db: Database, settings: Dict[str, Any], **overrides) -> "AnalysisWriter":
+        """설정 database 섹션 (write_batch, write_delay_ms, write_durability, write_max_pending)"""
+        options = dict(
+            max_batch=settings.get("write_batch", 500),
+            max_delay=settings.get("write_delay_ms", 50) / 1000,
+            durability=settings.get("write_durability", "commit"),
+            max_pending=settings.get("write_max_pending", 10000),
+        )
+        options.update(overrides)
+        return cls(db, **options)
+
+    async def save_analysis(self, **kwargs) -> Optional[int]:
+        """Database.save_analysis와 같은 인자. durability="commit"이면 id, 아니면 None"""
+        future = await self.enqueue_analysis(**kwargs)
+        return None if future is None else await future
+
+    async def enqueue_analysis(self, **kwargs) -> Optional[asyncio.Future]:
+        """버퍼에 넣기만 하고 커밋을 기다리지 않음 (commit이면 id를 받을 future, 아니면 None)
+
+        버퍼가 가득 찼을 때만 대기한다. 호출 측이 다른 일을 계속하다 나중에 id를 모을 때 사용.
+        """
+        kwargs.setdefault("created_at", datetime.utcnow())  # flush 시각이 아니라 호출 시각
+        return await self._submit("analysis", kwargs)
+
+    async def save_metric(
+        self,
+        analysis_id: int,
+        metric_name: str,
+        metric_value: float,
+        metric_unit: Optional[str] = None,
+    ) -> None:
+        """Database.save_metric과 같은 인자 (같은 배치의 분석 결과 뒤에 저장)"""
+        future = await self._submit("metric", dict(
+            analysis_id=analysis_id, metric_name=metric_name,
+            metric_value=metric_value, metric_unit=metric_unit,
+        ))
+        if future is not None:
+            await future
+
+    async def flush(self):
+        """지금까지 넣은 행이 모두 저장될 때까지 대기"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """남은 행 저장 후 flusher 종료"""
+        if self._task is None:
+            return
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    async def __aenter__(self) -> "AnalysisWriter":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """flush 통계"""
+        return {
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch": self.rows_written / self.flushes if self.flushes else 0.0,
+        }
+
+    async def _submit(self, kind: str, values: Dict[str, Any]) -> Optional[asyncio.Future]:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future() if self.durability == "commit" else None
+        await self._queue.put((kind, values, future))  # 가득 차면 flush 될 때까지 대기 (backpressure)
+        if self._queue.qsize() >= self.max_batch:
+            self._full.set()
+        return future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # max_batch건이 모이거나 max_delay가 지날 때까지 대기
+            if self._queue.qsize() < self.max_batch - 1:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[Tuple[str, Dict[str, Any], Optional[asyncio.Future]]]):
+        analyses = [item for item in batch if item[0] == "analysis"]
+        metrics = [item for item in batch if item[0] == "metric"]
+        if analyses:
+            ids = await self._flush(self.db.bulk_save_analyses, analyses)
+            for (_, _, future), analysis_id in zip(analyses, ids or []):
+                if future is not None and not future.done():
+                    future.set_result(analysis_id)
+        if metrics:
+            if await self._flush(self.db.bulk_save_metrics, metrics) is not None:
+                for _, _, future in metrics:
+                    if future is not None and not future.done():
+                        future.set_result(None)
+
+    async def _flush(self, save, items):
+        """한 트랜잭션으로 저장 (실패하면 대기 중인 호출에 예외 전달 후 None)"""
+        try:
+            result = await asyncio.to_thread(save, [values for _, values, _ in items])
+        except Exception as e:
+            self.failures += 1
+            logger.error("Write-behind flush failed", rows=len(items), error=str(e))
+            for _, _, future in items:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return None
+        self.flushes += 1
+        self.rows_written += len(items)
+        return result
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""비동기 분석 경로 벤치마크
+
+느린 가짜 Ollama 서버를 띄워 두고 동시 요청 N개를 처리할 때
+- 동기 OllamaClient를 이벤트 루프에서 직접 호출 (기존 /analyze 방식)
+- AsyncOllamaClient 사용 (요청마다 새 클라이언트)
+- 공용 레지스트리의 AsyncOllamaClient 사용 (keep-alive 풀 재사용)
+각 경우의 처리량과 이벤트 루프 지연(heartbeat lag)을 비교한다.
+
+실행: python scripts/bench_async_analyze.py --requests 20 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bifrost.ollama import OllamaClient, AsyncOllamaClient, client_registry, get_async_ollama_client
+
+
+def start_fake_ollama(delay: float) -> ThreadingHTTPServer:
+    """응답마다 delay초 걸리는 가짜 Ollama 서버"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            body = json.dumps({"response": "ok", "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 1024  # 동시 접속 시 SYN 드롭 방지
+    
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프가 얼마나 오래 막혔는지 측정 (최대 지연, 초)"""
+    max_lag = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - expected)
+    return max_lag
+
+
+async def run_sync(url: str, n: int):
+    """기존 방식: async 핸들러 안에서 동기 클라이언트 호출"""
+    async def handler(i: int):
+        client = OllamaClient(url=url)
+        return client.analyze(f"log {i}")
+    
+    return await asyncio.gather(*(handler(i) for i in range(n)))
+
+
+async def run_async(url: str, n: int):
+    """새 방식: AsyncOllamaClient"""
+    async def handler(i: int):
+        async with AsyncOllamaClient(url=url) as client:
+            return await client.analyze(f"log {i}")
+    
+    return await asyncio.gather(*(handler(i) for i in range(n)))
+
+
+async def run_pooled(url: str, n: int):
+    """공용 레지스트리: (url, model)당 클라이언트 하나, 커넥션 재사용"""
+    async def handler(i: int):
+        client = get_async_ollama_client(url=url, pool_size=n)
+        return await client.analyze(f"log {i}")
+    
+    try:
+        return await asyncio.gather(*(handler(i) for i in range(n)))
+    finally:
+        await client_registry.aclose()
+
+
+async def measure(label: str, runner, url: str, n: int):
+    stop = asyncio.Event()
+    hb = asyncio.create_task(heartbeat(stop))
+    start = time.perf_counter()
+    await runner(url, n)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    max_lag = await hb
+    print(
+        f"{label:<8} {n}건 {elapsed:6.2f}s  "
+        f"{n / elapsed:6.1f} req/s  루프 최대 지연 {max_lag * 1000:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.5, help="가짜 모델 응답 지연 (초)")
+    args = parser.parse_args()
+    
+    server = start_fake_ollama(args.delay)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"🌈 가짜 Ollama: {url} (지연 {args.delay}s)\n")
+    
+    asyncio.run(measure("sync", run_sync, url, args.requests))
+    asyncio.run(measure("async", run_async, url, args.requests))
+    asyncio.run(measure("pooled", run_pooled, url, args.requests))
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""배치 실행 중 중복 제거 벤치마크 (가짜 백엔드)
+
+로테이션된 로그처럼 --unique종류 내용을 --files개 파일에 나눠 쓰고
+(절반은 그대로 복사, 나머지 절반은 줄 끝 공백만 달라 전처리 결과가 같음)
+- 중복 제거 끔: 파일마다 전처리 + 모델 호출
+- 중복 제거: 같은 해시는 결과 공유, 같은 전처리 결과는 모델 호출 공유
+의 처리 시간, 모델 호출 수, 저장된 결과 행 수를 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_batch_dedup.py --files 400 --unique 40
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+
+from bifrost import batch
+from bifrost.batch import BatchAnalyzer
+from bifrost.database import Database
+
+
+class _NoMemo(dict):
+    """기억하지 않는 dict (중복 제거 끔)"""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def write_files(directory: Path, files: int, unique: int, size_kb: int):
+    for i in range(files):
+        kind = i % unique
+        line = f"2024-10-25 10:15:33 ERROR [service-{kind}] Connection refused to db:5432"
+        body = "\n".join([line] * (size_kb * 1024 // len(line)))
+        if (i // unique) % 2:
+            body = body.replace("\n", "  \n")  # 해시는 다르고 전처리 결과는 같음
+        (directory / f"service-{kind}.log.{i}").write_text(body + "\n")
+
+
+def run(directory: Path, dedup: bool, workers: int, latency: float):
+    db = Database(f"sqlite:///{directory / ('dedup.db' if dedup else 'plain.db')}")
+    db.init_db()
+    batch.get_database = lambda: db
+
+    analyzer = BatchAnalyzer(source="local", model="fake", max_workers=workers, use_cache=False)
+    analyzer.console = Console(file=open(os.devnull, "w"))
+    calls = 0
+
+    async def fake_backend(prompt):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(latency)
+        return {"response": "## 근본 원인\nfake", "metadata": {"model": "fake"}}
+
+    analyzer._call_backend = fake_backend
+    if not dedup:
+        analyzer._by_hash, analyzer._by_prompt = _NoMemo(), _NoMemo()
+
+    files = sorted(directory.glob("service-*"))
+    start = time.perf_counter()
+    results = asyncio.run(analyzer.analyze_files(files))
+    elapsed = time.perf_counter() - start
+
+    rows = db.get_metrics_summary(hours=1)["total_analyses"]
+    deduplicated = sum(1 for r in results if r["status"] == "duplicate" or r.get("shared_call"))
+    label = "중복 제거" if dedup else "중복 제거 끔"
+    print(f"  {label:<8} {elapsed:6.2f}s  모델 호출 {calls:>5}  결과 행 {rows:>5}  "
+          f"중복 제거율 {deduplicated / len(results):6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--unique", type=int, default=40)
+    parser.add_argument("--size-kb", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="가짜 모델 호출 시간 (초)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_files(directory, args.files, args.unique, args.size_kb)
+        print(f"📁 파일 {args.files:,}개 (내용 {args.unique}종), 워커 {args.workers}, 가짜 호출 {args.latency}s\n")
+        run(directory, False, args.workers, args.latency)
+        run(directory, True, args.workers, args.latency)
+
+
+if __name__ == "__main__":
+    main()
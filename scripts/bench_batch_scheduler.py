@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""배치 스케줄러 벤치마크 (가짜 백엔드)
+
+로그 파일 N개를 만들고 모델 호출을 --latency초 걸리는 가짜 동기 백엔드로 바꿔
+- 기존 방식: 파일마다 코루틴을 한꺼번에 시작, 파일마다 1-스레드 ThreadPoolExecutor
+- 워커 풀: analyze_files() (워커 --workers개 + 공용 스레드 풀 + 백엔드 상한 + 파일 읽기 상한)
+  기존 방식의 처리량은 백엔드가 무제한 동시 호출을 받아 준다는 가정에서만 나온다.
+의 처리 시간, 동시 모델 호출 최대값, 열린 fd 최대값, 최대 RSS를 비교한다.
+방식마다 자식 프로세스에서 따로 잰다.
+
+실행: PYTHONPATH=. python scripts/bench_batch_scheduler.py --files 2000 --workers 8
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from rich.console import Console
+
+from bifrost import batch
+from bifrost.batch import BatchAnalyzer, _Unlimited
+from bifrost.config import Config
+from bifrost.database import Database
+
+
+MODES = ["legacy", "pool"]
+
+
+class Gauge:
+    """동시 실행 수 / 열린 fd 최대값"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak_active = 0
+        self.peak_fds = 0
+        self.running = True
+
+    def sample_fds(self):
+        while self.running:
+            self.peak_fds = max(self.peak_fds, len(os.listdir("/proc/self/fd")))
+            time.sleep(0.005)
+
+
+def fake_backend(gauge: Gauge, latency: float):
+    def analyze(prompt: str) -> dict:
+        with gauge.lock:
+            gauge.active += 1
+            gauge.peak_active = max(gauge.peak_active, gauge.active)
+        time.sleep(latency)
+        with gauge.lock:
+            gauge.active -= 1
+        return {"response": "## 근본 원인\nfake", "metadata": {"model": "fake"}}
+    return analyze
+
+
+class PoolAnalyzer(BatchAnalyzer):
+    """현재 스케줄러 + 가짜 백엔드"""
+
+    def __init__(self, analyze, **kwargs):
+        super().__init__(**kwargs)
+        self.fake_analyze = analyze
+
+    async def _call_backend(self, prompt: str) -> dict:
+        return await self._run_blocking(self.fake_analyze, prompt)
+
+
+class LegacyAnalyzer(PoolAnalyzer):
+    """기존 analyze_files 재현 (전 파일 동시 시작, 호출마다 1-스레드 executor)"""
+
+    async def analyze_files(self, file_paths):
+        self._backend_slots = self._read_slots = _Unlimited()
+        results = []
+        try:
+            for coro in asyncio.as_completed([self._analyze_file(path) for path in file_paths]):
+                results.append(await coro)
+        finally:
+            await self.writer.close()
+        return results
+
+    async def _run_blocking(self, func, *args):
+        if func is self.fake_analyze:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        return await asyncio.to_thread(func, *args)
+
+
+def write_files(directory: Path, count: int, size_kb: int):
+    line = "2024-10-25 10:15:33 ERROR [worker-7] Connection refused to db:5432\n"
+    body = line * (size_kb * 1024 // len(line))
+    for i in range(count):
+        (directory / f"service-{i}.log").write_text(f"{i}\n{body}")
+
+
+def child(mode: str, directory: Path, workers: int, latency: float, backend_limit: int):
+    db = Database(f"sqlite:///{directory / f'{mode}.db'}")
+    db.init_db()
+    batch.get_database = lambda: db
+
+    gauge = Gauge()
+    sampler = threading.Thread(target=gauge.sample_fds, daemon=True)
+    sampler.start()
+
+    config = Config()
+    config.data = {**config.data, "batch": {"backend_limits": {"local": backend_limit}, "max_open_files": 4}}
+    cls = LegacyAnalyzer if mode == "legacy" else PoolAnalyzer
+    analyzer = cls(fake_backend(gauge, latency), source="local", model="fake", max_workers=workers,
+                   use_cache=False, config=config)
+    analyzer.console = Console(file=open(os.devnull, "w"))
+
+    files = sorted(directory.glob("*.log"))
+    start = time.perf_counter()
+    results = asyncio.run(analyzer.analyze_files(files))
+    elapsed = time.perf_counter() - start
+    gauge.running = False
+
+    ok = sum(1 for r in results if r["status"] == "success")
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed} {ok} {gauge.peak_active} {gauge.peak_fds} {max_rss_kb}")
+
+
+def measure(mode: str, directory: Path, args):
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--dir", str(directory),
+         "--workers", str(args.workers), "--latency", str(args.latency),
+         "--backend-limit", str(args.backend_limit or args.workers)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(f"  {mode:<8} 실패 (종료 코드 {proc.returncode})\n{proc.stderr[-500:]}")
+        return
+    elapsed, ok, peak_active, peak_fds, max_rss_kb = proc.stdout.split()
+    elapsed = float(elapsed)
+    print(f"  {mode:<8} {elapsed:7.2f}s  {int(ok) / elapsed:7.1f} 파일/s  동시 호출 최대 {peak_active:>5}  "
+          f"fd 최대 {peak_fds:>5}  최대 RSS {int(max_rss_kb) / 1024:7.1f} MB  (성공 {ok})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size-kb", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 모델 호출 시간 (초)")
+    parser.add_argument("--backend-limit", type=int, help="batch.backend_limits.local (기본: 워커 수)")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.dir, args.workers, args.latency, args.backend_limit)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_files(directory, args.files, args.size_kb)
+        print(f"📁 {args.files:,}개 × {args.size_kb} KB, 워커 {args.workers}, "
+              f"백엔드 상한 {args.backend_limit or args.workers}, 가짜 호출 {args.latency}s\n")
+        for mode in MODES:
+            measure(mode, directory, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""파일 캐시(CacheManager) 벤치마크
+
+항목 N개에 대해
+- 기존 방식: 키마다 indent=2 JSON 파일, stats/clear_expired가 파일 전체를 glob/파싱
+- 현재: 샤드별 추가 전용 파일 + 메모리 인덱스
+의 set / get / stats / clear_expired / 재시작(인덱스 로드) 시간과 파일 수를 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_cache_manager.py --entries 100000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bifrost.cache import CacheManager
+
+
+class LegacyCacheManager:
+    """기존 CacheManager 재현 (키별 JSON 파일)"""
+
+    def __init__(self, cache_dir: str, ttl_hours: int = 24):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True)
+        self.ttl_hours = ttl_hours
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if datetime.utcnow() - datetime.fromisoformat(data["cached_at"]) > timedelta(hours=self.ttl_hours):
+            path.unlink()
+            return None
+        return data["value"]
+
+    def set(self, key: str, value):
+        with open(self._path(key), 'w', encoding='utf-8') as f:
+            json.dump({"cached_at": datetime.utcnow().isoformat(), "value": value}, f, ensure_ascii=False, indent=2)
+
+    def clear_expired(self):
+        count = 0
+        for path in self.cache_dir.glob("*.json"):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if datetime.utcnow() - datetime.fromisoformat(data["cached_at"]) > timedelta(hours=self.ttl_hours):
+                path.unlink()
+                count += 1
+        return count
+
+    def stats(self):
+        files = list(self.cache_dir.glob("*.json"))
+        return {"total_entries": len(files), "total_size_bytes": sum(f.stat().st_size for f in files)}
+
+
+def timed(label: str, fn, count: int = 0):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    rate = f"  ({count / elapsed:,.0f}/s)" if count else ""
+    print(f"  {label:<14} {elapsed:8.3f}s{rate}")
+    return result
+
+
+def run(label: str, factory, entries: int):
+    value = {"response": "## 근본 원인\nConnection pool exhausted " * 8, "duration_seconds": 3.2}
+    keys = [f"analysis:{i}" for i in range(entries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(label)
+        cache = factory(tmp)
+        timed("set", lambda: [cache.set(key, value) for key in keys], entries)
+        timed("get", lambda: [cache.get(key) for key in keys], entries)
+        stats = timed("stats", cache.stats)
+        timed("clear_expired", cache.clear_expired)
+        if isinstance(cache, CacheManager):
+            cache.close()
+        cache = timed("재시작", lambda: factory(tmp))
+        print(f"  파일 {len(os.listdir(tmp)):,}개, {stats['total_size_bytes'] / 1024 / 1024:.1f} MB\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100000)
+    args = parser.parse_args()
+
+    run("기존 (키별 JSON 파일)", LegacyCacheManager, args.entries)
+    run("샤드 + 인덱스", CacheManager, args.entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""컬럼 export 벤치마크 (JSON vs Parquet vs Arrow IPC)
+
+분석 결과 N행과 메트릭 N×3행을 SQLite에 넣고
+- JSON: iter_analyses() → iter_json (기존 오프라인 분석 경로)
+- Parquet(zstd) / Arrow: iter_column_batches() → write_columnar
+으로 파일을 써서 쓰기 시간, 파일 크기, 다시 읽어 수치 컬럼(지연/토큰 등)을 얻는 시간을 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_columnar_export.py --rows 200000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import insert
+
+from bifrost.database import Database
+from bifrost.export import DataExporter
+from bifrost.models import AnalysisMetric, AnalysisResult
+
+
+def populate(db: Database, rows: int):
+    now = datetime.utcnow()
+    response = "## 근본 원인\nConnection pool exhausted\n" * 4
+    with db.engine.begin() as conn:
+        for start in range(0, rows, 10000):
+            batch = range(start, min(start + 10000, rows))
+            conn.execute(insert(AnalysisResult), [
+                dict(
+                    id=i + 1,
+                    created_at=now - timedelta(seconds=i),
+                    source="cloud" if i % 3 else "local",
+                    model="mistral" if i % 3 else "anthropic.claude-3-sonnet",
+                    log_content="",
+                    log_hash=f"{i:064x}",
+                    log_size_bytes=1000 + i % 5000,
+                    log_lines=10 + i % 100,
+                    response=response,
+                    response_size_bytes=len(response.encode()),
+                    duration_seconds=0.5 + (i % 1000) / 100,
+                    tokens_used=500 + i % 3000 if i % 3 else None,
+                    tags=["k8s", "error"],
+                    service_name=f"service-{i % 50}",
+                    status="completed",
+                )
+                for i in batch
+            ])
+            conn.execute(insert(AnalysisMetric), [
+                dict(analysis_id=i + 1, timestamp=now - timedelta(seconds=i), metric_name=name,
+                     metric_value=float(i % 997), metric_unit="ms")
+                for i in batch
+                for name in ("latency", "tokens", "queue_wait")
+            ])
+
+
+def read_json(path: Path):
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+    return [r["duration_seconds"] for r in rows], [r["tokens_used"] for r in rows]
+
+
+def read_columnar(path: Path, fmt: str, columns):
+    if fmt == "parquet":
+        return pq.read_table(path, columns=columns)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all().select(columns)
+
+
+def report(label: str, write_s: float, path: Path, read_s: float):
+    size = os.path.getsize(path)
+    print(f"  {label:<10} 쓰기 {write_s:7.2f}s  크기 {size / 1024 / 1024:8.1f} MB  "
+          f"수치 컬럼 읽기 {read_s:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.init_db()
+        populate(db, args.rows)
+        print(f"📄 분석 결과 {args.rows:,}행, 메트릭 {args.rows * 3:,}행\n")
+
+        print("analyses")
+        path = Path(tmp) / "analyses.json"
+        start = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in DataExporter.iter_json(db.iter_analyses(), pretty=False):
+                f.write(chunk)
+        write_s = time.perf_counter() - start
+        start = time.perf_counter()
+        read_json(path)
+        report("json", write_s, path, time.perf_counter() - start)
+
+        tables = {"analyses": ["duration_seconds", "tokens_used"], "metrics": ["metric_name", "metric_value"]}
+        for table, columns in tables.items():
+            if table == "metrics":
+                print("metrics")
+            for fmt in ("parquet", "arrow"):
+                path = Path(tmp) / f"{table}.{fmt}"
+                start = time.perf_counter()
+                DataExporter.write_columnar(db.export_columns(table), db.iter_column_batches(table), path, fmt)
+                write_s = time.perf_counter() - start
+                start = time.perf_counter()
+                read_columnar(path, fmt, columns)
+                read_s = time.perf_counter() - start
+                report(fmt, write_s, path, read_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""배치 파일 탐색 벤치마크 (Path.glob 목록 vs FileDiscovery 스트리밍)
+
+--dirs개 디렉토리에 --files개 로그(일부는 .log.gz, 일부는 다른 확장자)를 만들고
+- glob: 기존 방식처럼 list(root.glob("**/*.log")) (재귀를 위해 ** 사용, .gz는 못 찾음)
+- discovery: FileDiscovery (os.scandir, 압축 로그 포함)
+의 첫 파일까지 걸린 시간, 전체 시간, 찾은 파일 수, 최대 할당 메모리(tracemalloc)를 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_discovery.py --files 200000 --dirs 2000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bifrost.discovery import FileDiscovery
+
+
+def make_tree(root: Path, files: int, dirs: int):
+    for d in range(dirs):
+        (root / f"svc-{d % 50}" / f"day-{d}").mkdir(parents=True)
+    for i in range(files):
+        directory = root / f"svc-{i % dirs % 50}" / f"day-{i % dirs}"
+        suffix = (".log", ".log", ".log.gz", ".txt")[i % 4]
+        (directory / f"app-{i}{suffix}").touch()
+
+
+def measure(label: str, iterable_factory):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in iterable_factory():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    total = time.perf_counter() - start
+
+    # 메모리는 따로 한 번 더 (tracemalloc이 시간을 늘리므로)
+    tracemalloc.start()
+    for _ in iterable_factory():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} 첫 파일 {first * 1000:9.1f} ms  전체 {total:6.2f}s  "
+          f"{count:>8,}개  최대 할당 {peak / 1024 / 1024:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200000)
+    parser.add_argument("--dirs", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root, args.files, args.dirs)
+        print(f"📁 파일 {args.files:,}개 / 디렉토리 {args.dirs:,}개\n")
+        measure("glob", lambda: list(root.glob("**/*.log")))
+        measure("discovery", lambda: FileDiscovery(root, include=["*.log"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""히스토리 페이지네이션 벤치마크 (OFFSET vs 키셋 커서)
+
+N행 테이블에서 같은 위치의 페이지를
+- OFFSET: list_analyses(limit, offset)
+- 키셋: list_analyses_page(limit, cursor) — (created_at, id) < 커서 조건 + 인덱스
+로 조회해 깊이별 시간을 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_history_keyset.py --rows 100000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from bifrost.database import Database, encode_cursor
+from bifrost.models import AnalysisResult
+
+
+FIELDS = ["id", "created_at", "model", "service_name", "status", "duration_seconds"]
+
+
+def populate(db: Database, rows: int):
+    now = datetime.utcnow()
+    with db.engine.begin() as conn:
+        for start in range(0, rows, 5000):
+            conn.execute(insert(AnalysisResult), [
+                dict(
+                    created_at=now - timedelta(seconds=i),
+                    source="local",
+                    model="mistral",
+                    log_content="",
+                    log_hash=f"{i:064x}",
+                    log_size_bytes=0,
+                    log_lines=0,
+                    response="## 근본 원인\nConnection pool exhausted",
+                    response_size_bytes=0,
+                    duration_seconds=1.0,
+                    service_name=f"service-{i % 50}",
+                    status="completed",
+                )
+                for i in range(start, min(start + 5000, rows))
+            ])
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.init_db()
+        populate(db, args.rows)
+        print(f"📄 {args.rows:,}행, 페이지 {args.page}행\n")
+        print(f"  {'위치':>8}  {'OFFSET':>10}  {'키셋':>10}")
+
+        for offset in (0, 1000, 10000, 50000, args.rows - args.page):
+            if offset >= args.rows:
+                continue
+            # offset 바로 앞 행의 커서 = 같은 페이지
+            cursor = None
+            if offset:
+                previous = db.list_analyses(limit=1, offset=offset - 1, fields=["id", "created_at"])[0]
+                cursor = encode_cursor(datetime.fromisoformat(previous["created_at"]), previous["id"])
+
+            by_offset = db.list_analyses(limit=args.page, offset=offset, fields=FIELDS)
+            by_cursor = db.list_analyses_page(limit=args.page, cursor=cursor, fields=FIELDS)["items"]
+            assert by_offset == by_cursor
+
+            offset_ms = timed(lambda: db.list_analyses(limit=args.page, offset=offset, fields=FIELDS), args.repeat)
+            keyset_ms = timed(lambda: db.list_analyses_page(limit=args.page, cursor=cursor, fields=FIELDS), args.repeat)
+            print(f"  {offset:>8,}  {offset_ms:8.2f}ms  {keyset_ms:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""히스토리 목록 조회 벤치마크 (지연 로딩 / 컬럼 프로젝션)
+
+log_content가 평문으로 남아 있는 이전 행 N개를 SQLite에 넣고
+- 기존 방식: ORM 행 전체(log_content 포함) 로드 후 to_dict()
+- 지연 로딩: ORM 행 (log_content deferred)
+- 프로젝션: list_analyses(fields=[...]) — 필요한 컬럼만 SELECT
+으로 페이지 조회와 전체 순회 시간을 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_history_projection.py --rows 100000 --log-kb 4
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import desc, text
+from sqlalchemy.orm import undefer
+
+from bifrost.database import Database
+from bifrost.models import AnalysisResult
+
+
+PAGE_FIELDS = ["id", "created_at", "model", "service_name", "status", "duration_seconds"]
+
+
+INSERT_LEGACY = text(
+    "INSERT INTO analysis_results (created_at, source, model, log_content, log_hash, log_size_bytes, log_lines, "
+    "response, response_size_bytes, duration_seconds, service_name, status) VALUES (:created_at, :source, :model, "
+    ":log_content, :log_hash, :log_size_bytes, :log_lines, :response, :response_size_bytes, :duration_seconds, "
+    ":service_name, :status)"
+)
+
+
+def populate(db: Database, rows: int, log_kb: int):
+    """압축 도입 전 형식 행 (평문 log_content/response)"""
+    log = ("2024-10-25 10:15:33 ERROR [worker-7] Connection refused to db:5432\n" * (log_kb * 16))[: log_kb * 1024]
+    response = "## 근본 원인\nConnection pool exhausted\n" * 20
+    now = datetime.utcnow()
+    batch = []
+    with db.engine.begin() as conn:
+        for i in range(rows):
+            batch.append(dict(
+                created_at=(now - timedelta(seconds=i)).isoformat(" "),
+                source="local",
+                model="mistral",
+                log_content=log,
+                log_hash=f"{i:064x}",
+                log_size_bytes=len(log),
+                log_lines=log.count("\n") + 1,
+                response=response,
+                response_size_bytes=len(response.encode()),
+                duration_seconds=1.0,
+                service_name=f"service-{i % 50}",
+                status="completed",
+            ))
+            if len(batch) == 5000:
+                conn.execute(INSERT_LEGACY, batch)
+                batch = []
+        if batch:
+            conn.execute(INSERT_LEGACY, batch)
+
+
+def legacy_page(db: Database, limit: int, offset: int):
+    with db.get_session() as session:
+        rows = (
+            session.query(AnalysisResult)
+            .options(undefer(AnalysisResult.log_content))
+            .order_by(desc(AnalysisResult.created_at))
+            .limit(limit).offset(offset).all()
+        )
+        return [r.to_dict() for r in rows]
+
+
+def deferred_page(db: Database, limit: int, offset: int):
+    with db.get_session() as session:
+        rows = session.query(AnalysisResult).order_by(desc(AnalysisResult.created_at)).limit(limit).offset(offset).all()
+        return [r.to_dict() for r in rows]
+
+
+def projection_page(db: Database, limit: int, offset: int):
+    return db.list_analyses(limit=limit, offset=offset, fields=PAGE_FIELDS)
+
+
+def timed(label: str, fn, db: Database, rows: int, page: int):
+    start = time.perf_counter()
+    fn(db, page, 0)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total = 0
+    for offset in range(0, min(rows, page * 20), page):
+        total += len(fn(db, page, offset))
+    scan = time.perf_counter() - start
+    print(f"  {label:<12} 첫 페이지 {first * 1000:8.1f} ms   앞 {total:,}행 페이지 순회 {scan:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--log-kb", type=int, default=4)
+    parser.add_argument("--page", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.init_db()
+        populate(db, args.rows, args.log_kb)
+        print(f"📄 {args.rows:,}행 (log_content {args.log_kb} KB), 페이지 {args.page}행\n")
+
+        timed("기존(전체 행)", legacy_page, db, args.rows, args.page)
+        timed("지연 로딩", deferred_page, db, args.rows, args.page)
+        timed("프로젝션", projection_page, db, args.rows, args.page)
+
+
+if __name__ == "__main__":
+    main()
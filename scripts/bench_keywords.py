@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""다중 키워드 필터링 벤치마크 (키워드 500개, 1 GB 로그)
+
+filter_by_keyword를
+- 기존 방식: 줄마다 lower() + any(keyword in line) (줄 수 × 키워드 수)
+- KeywordMatcher: 트라이 결합 정규식 한 번 search
+로 비교한다. 기존 방식은 너무 느려서 앞부분(--legacy-mb)만 재고 환산한다.
+KeywordMatcher는 파일을 LogFilter.pipeline().run()으로 줄 단위 스트리밍한다.
+
+실행: python scripts/bench_keywords.py --size-mb 1024 --keywords 500
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from bifrost.filters import LogFilter
+from bifrost.keywords import get_keyword_matcher
+
+
+def make_keywords(count: int):
+    rng = random.Random(42)
+    keywords = [f"E{code:04d}" for code in rng.sample(range(10000), count // 2)]
+    keywords += [f"payment-{rng.getrandbits(32):08x}" for _ in range(count - len(keywords) - 2)]
+    # 실제로 등장하는 키워드
+    keywords += ["connection refused", "OOMKilled"]
+    return keywords
+
+
+def write_log(path: Path, size_mb: int):
+    rng = random.Random(7)
+    pods = [f"api-{rng.getrandbits(32):08x}" for _ in range(50)]
+    lines = []
+    for i in range(20000):
+        pod = pods[i % len(pods)]
+        if i % 97 == 0:
+            lines.append(f"2024-10-25 10:15:{i % 60:02d} ERROR [{pod}] Connection refused (code X{i % 9000})")
+        elif i % 401 == 0:
+            lines.append(f"2024-10-25 10:15:{i % 60:02d} WARN  [{pod}] container OOMKilled, restarting")
+        else:
+            lines.append(f"2024-10-25 10:15:{i % 60:02d} INFO  [{pod}] GET /api/orders/{i} 200 {i % 300}ms")
+    block = "\n".join(lines) + "\n"
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(max(1, size_mb * 1024 * 1024 // len(block))):
+            f.write(block)
+
+
+def legacy(lines, keywords):
+    lowered = [k.lower() for k in keywords]
+    matched = 0
+    for line in lines:
+        search_line = line.lower()
+        if any(keyword in search_line for keyword in lowered):
+            matched += 1
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--keywords", type=int, default=500)
+    parser.add_argument("--legacy-mb", type=int, default=16, help="기존 방식으로 측정할 앞부분 크기")
+    args = parser.parse_args()
+    
+    keywords = make_keywords(args.keywords)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        write_log(path, args.size_mb)
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"📄 {size_mb:.0f} MB 로그, 키워드 {len(keywords)}개\n")
+        
+        start = time.perf_counter()
+        get_keyword_matcher(keywords)
+        print(f"  매처 빌드            {(time.perf_counter() - start) * 1000:8.1f} ms")
+        
+        # 기존 방식: 앞부분만
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(args.legacy_mb * 1024 * 1024).split("\n")
+        start = time.perf_counter()
+        legacy_matched = legacy(head, keywords)
+        elapsed = time.perf_counter() - start
+        legacy_rate = args.legacy_mb / elapsed
+        print(f"  기존 ({args.legacy_mb} MB)        {elapsed:8.2f} s   {legacy_rate:7.1f} MB/s   "
+              f"(1 GB 환산 {1024 / legacy_rate / 60:.1f}분)")
+        
+        pipeline = LogFilter.pipeline().keywords(keywords)
+        matched = sum(1 for _ in pipeline.run(head))
+        print(f"  결과 동일: {'✅' if matched == legacy_matched else '❌'}")
+        
+        # KeywordMatcher: 전체 파일 스트리밍
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            matched = sum(1 for _ in pipeline.run(f))
+        elapsed = time.perf_counter() - start
+        print(f"  KeywordMatcher       {elapsed:8.2f} s   {size_mb / elapsed:7.1f} MB/s   ({matched:,}줄 매칭)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""LogPayload 마이크로벤치마크 (5-10 MB 로그)
+
+/analyze 한 번이 로그에 대해 수행하는 파생값 계산(인코딩, SHA-256, 크기, 줄 수)을
+- 기존 방식: 단계마다 다시 encode/hash/split
+- LogPayload: 한 번 계산 후 재사용
+으로 비교한다 (CPU 시간, tracemalloc 최대 할당량).
+
+실행: python scripts/bench_log_payload.py --sizes 5 10
+"""
+
+import argparse
+import hashlib
+import time
+import tracemalloc
+
+from bifrost.payload import LogPayload
+from bifrost.preprocessor import LogPreprocessor
+
+
+def make_log(size_mb: int) -> str:
+    line = "2024-10-25 10:15:33 ERROR [worker-7] 데이터베이스 연결 실패: Connection refused\n"
+    return line * (size_mb * 1024 * 1024 // len(line.encode()))
+
+
+def before(log: str, preprocessor: LogPreprocessor):
+    """기존 코드 경로 재현"""
+    # api.analyze_log: 캐시 키
+    log_hash = hashlib.sha256(log.encode()).hexdigest()
+    # LogPreprocessor.process: 크기 확인
+    len(log.encode('utf-8')) > preprocessor.max_size_bytes
+    # Database.save_analysis: 해시, 크기, 줄 수
+    hashlib.sha256(log.encode()).hexdigest()
+    len(log.encode())
+    len(log.split('\n'))
+    return log_hash
+
+
+def after(log: str, preprocessor: LogPreprocessor):
+    """LogPayload 경로"""
+    payload = LogPayload(log)
+    log_hash = payload.sha256
+    payload.size_bytes > preprocessor.max_size_bytes
+    payload.sha256, payload.size_bytes, payload.line_count
+    return log_hash
+
+
+def measure(fn, log: str, preprocessor: LogPreprocessor, repeat: int):
+    tracemalloc.start()
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(log, preprocessor)
+    elapsed = (time.process_time() - start) / repeat
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10], help="로그 크기 (MB)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    preprocessor = LogPreprocessor()
+    for size_mb in args.sizes:
+        log = make_log(size_mb)
+        cpu_before, peak_before = measure(before, log, preprocessor, args.repeat)
+        cpu_after, peak_after = measure(after, log, preprocessor, args.repeat)
+        print(f"📄 {size_mb} MB 로그")
+        print(f"  기존        {cpu_before * 1000:8.1f} ms CPU   최대 할당 {peak_before / 1024 / 1024:7.1f} MB")
+        print(f"  LogPayload  {cpu_after * 1000:8.1f} ms CPU   최대 할당 {peak_after / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""mmap LogSource 최대 RSS 벤치마크
+
+큰 로그 파일을 만들어 입력 방식별 처리 시간과 최대 RSS(ru_maxrss)를 비교한다.
+최대 RSS는 프로세스 단위 값이라 방식마다 자식 프로세스에서 따로 잰다.
+- read:    파일 전체 read() 후 LogPreprocessor.process() (기존 --no-preprocess / batch)
+- stream:  텍스트 파일 줄 단위 process_stream() (기존 local / cloud)
+- source:  LogSource(mmap) process_source() — 잘릴 중간 구간은 개행 수만 셈
+- hash:    read() + LogPayload.sha256 (기존 batch 캐시 조회)
+- mmhash:  LogSource.sha256() (청크 단위, 훑은 페이지는 매핑에서 내림)
+
+실행: PYTHONPATH=. python scripts/bench_log_source.py --size-mb 4096
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bifrost.logsource import LogSource
+from bifrost.payload import LogPayload
+from bifrost.preprocessor import LogPreprocessor
+
+
+MODES = ["read", "stream", "source", "hash", "mmhash"]
+
+
+def write_log(path: Path, size_mb: int):
+    line = "2024-10-25 10:15:33 ERROR [worker-7] Connection refused   \n"
+    block = line * 10000
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block)):
+            f.write(block)
+
+
+def run_mode(mode: str, path: Path, max_size_mb: float) -> int:
+    preprocessor = LogPreprocessor(max_size_mb=max_size_mb)
+    if mode == "read":
+        with open(path, "r", encoding="utf-8") as f:
+            return len(preprocessor.process(f.read()))
+    if mode == "stream":
+        with open(path, "r", encoding="utf-8") as f:
+            return len("".join(preprocessor.process_stream(f)))
+    if mode == "source":
+        with LogSource.open(path) as source:
+            return len("".join(preprocessor.process_source(source)))
+    if mode == "hash":
+        with open(path, "r", encoding="utf-8") as f:
+            return len(LogPayload(f.read()).sha256)
+    with LogSource.open(path) as source:
+        return len(source.sha256())
+
+
+def child(mode: str, path: Path, max_size_mb: float):
+    start = time.perf_counter()
+    run_mode(mode, path, max_size_mb)
+    elapsed = time.perf_counter() - start
+    # Linux ru_maxrss 단위는 KB
+    print(f"{elapsed} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+
+
+def measure(mode: str, path: Path, max_size_mb: float):
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--path", str(path), "--max-size-mb", str(max_size_mb)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(f"{mode:<8} 실패 (종료 코드 {proc.returncode}, 메모리 부족 등)")
+        return
+    elapsed, max_rss_kb = proc.stdout.split()
+    print(f"{mode:<8} {float(elapsed):7.2f}s  최대 RSS {int(max_rss_kb) / 1024:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=4096)
+    parser.add_argument("--max-size-mb", type=float, default=5, help="전처리 최대 크기 (log.max_size_mb)")
+    parser.add_argument("--modes", default=",".join(MODES), help="측정할 방식 (쉼표 구분)")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.path, args.max_size_mb)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        write_log(path, args.size_mb)
+        print(f"📄 {path.stat().st_size / 1024 / 1024:.0f} MB 로그\n")
+        for mode in args.modes.split(","):
+            measure(mode, path, args.max_size_mb)
+
+
+if __name__ == "__main__":
+    main()
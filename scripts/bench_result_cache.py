@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""분석 결과 캐시 벤치마크 (반복 로그 트래픽)
+
+같은 로그가 반복해서 들어오는 상황(장애 시 동일 에러 로그 재전송)을 흉내 내어
+- 기존 방식: get_duplicate_analyses(log_hash)[0]
+- DB 단건 조회: find_cached_analysis(log_hash, model, max_age)
+- 메모리 LRU 앞단: get_cached_analysis(log_hash, model)
+의 조회 지연을 비교한다.
+
+실행: python scripts/bench_result_cache.py --logs 200 --requests 5000
+"""
+
+import argparse
+import hashlib
+import random
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from bifrost.cache import LRUCache
+from bifrost.database import Database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logs", type=int, default=200, help="서로 다른 로그 수")
+    parser.add_argument("--copies", type=int, default=5, help="로그당 저장된 과거 분석 수")
+    parser.add_argument("--requests", type=int, default=5000, help="조회 요청 수")
+    parser.add_argument("--response-kb", type=int, default=16, help="응답 크기 (KB)")
+    parser.add_argument("--log-kb", type=int, default=256, help="로그 크기 (KB)")
+    parser.add_argument("--cache-entries", type=int, default=100, help="LRU 최대 항목 수")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(
+            f"sqlite:///{Path(tmp) / 'bench.db'}",
+            result_cache=LRUCache(max_entries=args.cache_entries),
+        )
+        db.init_db()
+        
+        response = "x" * (args.response_kb * 1024)
+        logs = [
+            (f"2024-10-25 ERROR incident {i}\n" * (args.log_kb * 1024 // 30))
+            for i in range(args.logs)
+        ]
+        hashes = [hashlib.sha256(log.encode()).hexdigest() for log in logs]
+        
+        print(f"📦 {args.logs}개 로그 × {args.copies}회 분석 저장 중...")
+        for log in logs:
+            for _ in range(args.copies):
+                db.save_analysis(
+                    source="local", model="mistral", log_content=log,
+                    response=response, duration=1.0,
+                )
+        
+        # 소수의 로그에 트래픽이 몰리는 분포 (파레토)
+        rng = random.Random(42)
+        traffic = [hashes[min(int(rng.paretovariate(1.2)) - 1, args.logs - 1)] for _ in range(args.requests)]
+        
+        start = time.perf_counter()
+        for log_hash in traffic:
+            db.get_duplicate_analyses(log_hash, hours=24)[0]
+        before = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for log_hash in traffic:
+            db.find_cached_analysis(log_hash, "mistral", timedelta(hours=24))
+        single_row = time.perf_counter() - start
+        
+        db.result_cache.clear()
+        start = time.perf_counter()
+        for log_hash in traffic:
+            db.get_cached_analysis(log_hash, "mistral")
+        after = time.perf_counter() - start
+        
+        stats = db.result_cache.stats()
+        hit_ratio = stats["hits"] / max(1, stats["hits"] + stats["misses"])
+        print(f"\n기존 (DB 전체 조회)   {before * 1000 / args.requests:8.3f} ms/req")
+        print(f"DB 단건 조회          {single_row * 1000 / args.requests:8.3f} ms/req")
+        print(f"메모리 LRU 앞단       {after * 1000 / args.requests:8.3f} ms/req")
+        print(f"LRU 히트율 {hit_ratio:.1%}, eviction {stats['evictions']}, 사용 {stats['total_bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
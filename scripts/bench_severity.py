@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""심각도 분류 벤치마크
+
+LogFilter의 심각도 필터링/통계를
+- 기존 방식: 줄마다 upper() + 정규식 3개 re.search
+- 현재: classify_lines (버퍼 한 번 upper(), 첫 글자 문자 집합 패턴 하나를 줄마다 적용)
+으로 비교한다.
+
+실행: python scripts/bench_severity.py --lines 1000000
+"""
+
+import argparse
+import re
+import time
+
+from bifrost.filters import LogFilter, SeverityLevel
+
+
+LEGACY_PATTERNS = [
+    r'\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b',
+    r'\[(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\]',
+    r'level[=:]?\s*(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)',
+]
+
+
+def legacy_detect(line: str):
+    line_upper = line.upper()
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, line_upper)
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_filter(log: str, min_level: SeverityLevel) -> str:
+    """기존 filter_by_severity 재현"""
+    min_priority = LogFilter.SEVERITY_PRIORITY[min_level.value]
+    filtered = []
+    for line in log.split('\n'):
+        severity = legacy_detect(line)
+        if severity is None or LogFilter.SEVERITY_PRIORITY.get(severity, 0) >= min_priority:
+            filtered.append(line)
+    return '\n'.join(filtered)
+
+
+def make_log(lines: int) -> str:
+    templates = [
+        "2024-10-25 10:15:32 INFO [main] Request handled in 12ms",
+        "2024-10-25 10:15:33 DEBUG [pool-3] Connection acquired",
+        "2024-10-25 10:15:34 ERROR [main] java.sql.SQLException: Connection refused",
+        "    at com.example.db.Pool.get(Pool.java:88)",
+        "2024-10-25 10:15:35 WARN  [main] Retrying connection...",
+    ]
+    return '\n'.join(templates[i % len(templates)] for i in range(lines))
+
+
+def measure(label: str, fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<24} {elapsed * 1000:8.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    log = make_log(args.lines)
+    print(f"📄 {args.lines:,}줄 ({len(log) / 1024 / 1024:.0f} MB)\n")
+    
+    print("필터링 (min_level=WARN)")
+    expected = measure("기존 (줄별 3 정규식)", lambda: legacy_filter(log, SeverityLevel.WARN), args.repeat)
+    result = measure("classify_lines", lambda: LogFilter.filter_by_severity(log, SeverityLevel.WARN), args.repeat)
+    print(f"  결과 동일: {'✅' if result == expected else '❌'}\n")
+    
+    print("분류만")
+    measure("기존 (줄별 3 정규식)", lambda: [legacy_detect(line) for line in log.split('\n')], args.repeat)
+    measure("classify_lines", lambda: LogFilter.classify_lines(log), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
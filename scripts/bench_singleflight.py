@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""같은 /analyze 요청 동시 폭주 벤치마크 (single-flight 끔 vs 켬, 가짜 모델)
+
+장애 직후처럼 클라이언트 --clients개가 같은 로그를 동시에 POST /analyze 한다
+(로그 종류는 --unique개). 모델 호출은 --latency초 걸리는 가짜 비동기 함수이고
+실제 모델 서버처럼 동시에 --backend-concurrency개까지만 처리한다.
+- 끔: 요청마다 모델 호출 (기존 동작)
+- 켬: analysis_flight로 진행 중인 같은 분석에 합류
+의 전체 시간, 모델 호출 수, 합쳐진 요청 수를 비교한다. 임시 SQLite DB 사용.
+
+실행: PYTHONPATH=. python scripts/bench_singleflight.py --clients 200 --unique 4
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from bifrost import api, database
+from bifrost.database import Database
+from bifrost.singleflight import SingleFlight
+
+
+class _NoFlight(SingleFlight):
+    """합치지 않음 (기존 동작)"""
+
+    async def do(self, key, fn, channel="api"):
+        self.leaders[channel] += 1
+        return await fn(), False
+
+
+async def burst(clients: int, unique: int, flight: SingleFlight, latency: float, backend_concurrency: int):
+    calls = 0
+    backend = asyncio.Semaphore(backend_concurrency)
+
+    async def fake_analysis(prompt, source, model=None):
+        nonlocal calls
+        calls += 1
+        async with backend:
+            await asyncio.sleep(latency)
+        return {"response": "## 근본 원인\nfake", "metadata": {"model": "fake"}}
+
+    api.run_analysis = fake_analysis
+    api.analysis_flight = flight
+    # 매번 다른 로그 (이전 실행의 결과 캐시에 걸리지 않도록)
+    nonce = time.time_ns()
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/analyze", json={
+                "log_content": f"{nonce} ERROR [service-{i % unique}] Connection refused to db:5432",
+                "source": "local",
+                "model": "fake",
+            })
+            for i in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+    ok = sum(1 for r in responses if r.status_code == 200)
+    coalesced = sum(1 for r in responses if r.status_code == 200 and r.json()["coalesced"])
+    return elapsed, calls, ok, coalesced
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--unique", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=1.0, help="가짜 모델 호출 시간 (초)")
+    parser.add_argument("--backend-concurrency", type=int, default=8, help="모델 서버 동시 처리 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database._db_instance = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        database._db_instance.init_db()
+
+        print(f"📨 동시 요청 {args.clients}개 (로그 {args.unique}종), 가짜 호출 {args.latency}s "
+              f"× 동시 {args.backend_concurrency}\n")
+        for label, flight in (("끔", _NoFlight()), ("켬", SingleFlight())):
+            elapsed, calls, ok, coalesced = asyncio.run(
+                burst(args.clients, args.unique, flight, args.latency, args.backend_concurrency)
+            )
+            print(f"  single-flight {label}  {elapsed:6.2f}s  모델 호출 {calls:>5}  "
+                  f"성공 {ok:>5}  합류 {coalesced:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""SQLite 동시 접근 벤치마크 (기본 저널 vs WAL 튜닝 프로파일)
+
+API 워커 여러 개와 배치 분석기가 같은 bifrost.db를 쓰는 상황을 흉내 낸다.
+쓰기 프로세스(save_analysis)와 읽기 프로세스(list_analyses + get_cached_analysis)를
+--seconds 동안 동시에 돌려 초당 처리량과 "database is locked" 오류 수를 센다.
+- 기본: 프라그마 없음 (rollback 저널, synchronous=FULL, pysqlite 기본 5초 대기)
+- 튜닝: SQLITE_PRAGMAS (WAL, synchronous=NORMAL, busy_timeout, cache/mmap)
+
+실행: PYTHONPATH=. python scripts/bench_sqlite_concurrency.py --writers 4 --readers 8 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+from bifrost.database import SQLITE_PRAGMAS, Database
+
+
+PROFILES = {
+    "기본": {"sqlite": {name: None for name in SQLITE_PRAGMAS}},
+    "튜닝(WAL)": {},
+}
+
+
+def writer(url: str, settings: dict, seconds: float, worker: int, results):
+    db = Database(url, settings=settings)
+    done = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            db.save_analysis(
+                source="local", model="mistral", log_content=f"worker {worker} log {done}",
+                response="## 근본 원인\nConnection pool exhausted\n" * 4, duration=1.0,
+                service_name=f"service-{worker}",
+            )
+            done += 1
+        except OperationalError:
+            errors += 1
+    results.put(("write", done, errors))
+
+
+def reader(url: str, settings: dict, seconds: float, worker: int, results):
+    db = Database(url, settings=settings)
+    done = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            db.list_analyses(limit=20, fields=["id", "created_at", "model", "status"])
+            db.get_cached_analysis(f"{worker:064x}", "mistral")
+            done += 1
+        except OperationalError:
+            errors += 1
+    results.put(("read", done, errors))
+
+
+def run(label: str, settings: dict, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        Database(url, settings=settings).init_db()
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=writer, args=(url, settings, args.seconds, i, results))
+            for i in range(args.writers)
+        ] + [
+            multiprocessing.Process(target=reader, args=(url, settings, args.seconds, i, results))
+            for i in range(args.readers)
+        ]
+        for proc in procs:
+            proc.start()
+        totals = {"write": [0, 0], "read": [0, 0]}
+        for _ in procs:
+            kind, done, errors = results.get()
+            totals[kind][0] += done
+            totals[kind][1] += errors
+        for proc in procs:
+            proc.join()
+
+    (writes, write_errors), (reads, read_errors) = totals["write"], totals["read"]
+    print(f"  {label:<10} 쓰기 {writes / args.seconds:8,.0f}/s (잠금 오류 {write_errors:,})  "
+          f"읽기 {reads / args.seconds:8,.0f}/s (잠금 오류 {read_errors:,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"📦 쓰기 프로세스 {args.writers}개 + 읽기 프로세스 {args.readers}개, {args.seconds:g}초\n")
+    for label, settings in PROFILES.items():
+        run(label, settings, args)
+
+
+if __name__ == "__main__":
+    main()
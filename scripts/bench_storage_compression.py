@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""분석 결과 저장 공간 벤치마크 (압축 + log_blobs 중복 제거)
+
+같은 로그를 여러 번 재분석한 상황을 만든다. 먼저 압축 도입 전 형식
+(평문 TEXT, 행마다 원문)으로 SQLite에 넣고 migrate_storage()로 변환한다.
+변환 전후의 DB 파일 크기를 비교하고, 새 형식으로 저장할 때의 속도도 잰다.
+
+실행: PYTHONPATH=. python scripts/bench_storage_compression.py --rows 2000 --unique 200 --log-kb 64
+"""
+
+import argparse
+import hashlib
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from bifrost.database import Database
+
+
+def make_log(seed: int, size_kb: int) -> str:
+    rng = random.Random(seed)
+    levels = ["INFO", "INFO", "INFO", "WARN", "ERROR", "DEBUG"]
+    lines = []
+    size = 0
+    while size < size_kb * 1024:
+        line = (
+            f"2024-10-25 10:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d} "
+            f"{rng.choice(levels):<5} [worker-{rng.randint(1, 16)}] "
+            f"request_id={rng.getrandbits(64):016x} latency_ms={rng.randint(1, 5000)} "
+            f"path=/api/v1/orders/{rng.randint(1, 10 ** 6)}"
+        )
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--unique", type=int, default=200, help="서로 다른 로그 수 (나머지는 재분석)")
+    parser.add_argument("--log-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    logs = [make_log(i, args.log_kb) for i in range(args.unique)]
+    response = "## 🔍 근본 원인\nConnection pool exhausted\n## 🛠️ 해결 방안\n1. pool size 증가\n" * 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        db = Database(f"sqlite:///{path}")
+        db.init_db()
+
+        # 이전 형식: 행마다 평문 원문
+        with db.engine.begin() as conn:
+            for i in range(args.rows):
+                log = logs[i % args.unique]
+                conn.execute(text(
+                    "INSERT INTO analysis_results (created_at, source, model, log_content, log_hash, "
+                    "log_size_bytes, log_lines, response, response_size_bytes, duration_seconds, status) "
+                    "VALUES (CURRENT_TIMESTAMP, 'local', 'mistral', :log, :hash, :size, 0, :response, 0, 1.0, 'completed')"
+                ), {"log": log, "hash": hashlib.sha256(log.encode()).hexdigest(), "size": len(log), "response": response})
+
+        print(f"📄 {args.rows:,}행, 서로 다른 로그 {args.unique:,}개 × {args.log_kb} KB\n")
+        start = time.perf_counter()
+        report = db.migrate_storage()
+        elapsed = time.perf_counter() - start
+
+        mb = 1024 * 1024
+        print(f"migrate_storage  {elapsed:6.2f}s  ({report['rows']:,}행, log_blobs {report['blobs_created']:,}개)")
+        print(f"  컬럼 크기  {report['bytes_before'] / mb:8.1f} MB → {report['bytes_after'] / mb:6.1f} MB")
+        print(f"  DB 파일    {report['file_bytes_before'] / mb:8.1f} MB → {report['file_bytes_after'] / mb:6.1f} MB")
+
+        # 새 형식 저장 속도 (중복 로그는 압축 생략)
+        start = time.perf_counter()
+        for i in range(200):
+            db.save_analysis(source="local", model="mistral", log_content=logs[i % args.unique],
+                             response=response, duration=1.0)
+        elapsed = time.perf_counter() - start
+        print(f"\nsave_analysis    {elapsed / 200 * 1000:6.2f} ms/건 (중복 로그는 압축 생략)")
+
+
+if __name__ == "__main__":
+    main()
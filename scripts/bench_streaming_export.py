@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""export 벤치마크 (전체 리스트 + to_json vs 서버 측 커서 스트리밍)
+
+N행 테이블을
+- 기존 방식: list_analyses(limit=N)로 전부 읽은 뒤 to_json / to_csv
+- 스트리밍: iter_analyses() → iter_json / iter_ndjson / iter_csv
+으로 파일에 써서 첫 조각까지 걸린 시간, 전체 시간, 최대 Python 메모리(tracemalloc)를 비교한다.
+
+실행: PYTHONPATH=. python scripts/bench_streaming_export.py --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from bifrost.database import Database
+from bifrost.export import DataExporter
+from bifrost.models import AnalysisResult
+
+
+def populate(db: Database, rows: int):
+    now = datetime.utcnow()
+    response = "## 근본 원인\nConnection pool exhausted\n" * 4
+    with db.engine.begin() as conn:
+        for start in range(0, rows, 10000):
+            conn.execute(insert(AnalysisResult), [
+                dict(
+                    created_at=now - timedelta(seconds=i),
+                    source="local",
+                    model="mistral",
+                    log_content="",
+                    log_hash=f"{i:064x}",
+                    log_size_bytes=0,
+                    log_lines=0,
+                    response=response,
+                    response_size_bytes=len(response.encode()),
+                    duration_seconds=1.0,
+                    service_name=f"service-{i % 50}",
+                    status="completed",
+                )
+                for i in range(start, min(start + 10000, rows))
+            ])
+
+
+def legacy(db: Database, rows: int, fmt: str):
+    results = db.list_analyses(limit=rows)
+    yield DataExporter.to_csv(results) if fmt == "csv" else DataExporter.to_json(results)
+
+
+def streaming(db: Database, rows: int, fmt: str):
+    writer = {"csv": DataExporter.iter_csv, "json": DataExporter.iter_json, "ndjson": DataExporter.iter_ndjson}[fmt]
+    return writer(db.iter_analyses())
+
+
+def measure(label: str, chunks, path: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            if first is None:
+                first = time.perf_counter() - start
+            f.write(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = os.path.getsize(path)
+    print(f"  {label:<16} 첫 조각 {first:7.2f}s  전체 {elapsed:7.2f}s  "
+          f"최대 메모리 {peak / 1024 / 1024:8.1f} MB  출력 {size / 1024 / 1024:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--formats", default="json,csv", help="비교할 포맷 (쉼표 구분)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.init_db()
+        populate(db, args.rows)
+        print(f"📄 {args.rows:,}행\n")
+
+        out = Path(tmp) / "export.out"
+        for fmt in args.formats.split(","):
+            print(fmt)
+            measure("기존(리스트)", legacy(db, args.rows, fmt), out)
+            measure("스트리밍", streaming(db, args.rows, fmt), out)
+        print("ndjson")
+        measure("스트리밍", streaming(db, args.rows, "ndjson"), out)
+
+
+if __name__ == "__main__":
+    main()
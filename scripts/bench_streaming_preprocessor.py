@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""스트리밍 전처리 메모리 벤치마크
+
+큰 로그 파일을 만들어
+- 기존 방식: 파일 전체 read() 후 LogPreprocessor.process()
+- 스트리밍: 파일을 줄 단위로 LogPreprocessor.process_stream()
+의 처리 시간과 최대 메모리(tracemalloc)를 비교한다.
+
+실행: python scripts/bench_streaming_preprocessor.py --size-mb 200
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bifrost.preprocessor import LogPreprocessor
+
+
+def write_log(path: Path, size_mb: int):
+    line = "2024-10-25 10:15:33 ERROR [worker-7] Connection refused   \n"
+    block = line * 10000
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block)):
+            f.write(block)
+            f.write("\n\n\n")
+
+
+def run_full(path: Path, preprocessor: LogPreprocessor) -> int:
+    content = path.read_text(encoding="utf-8")
+    return len(preprocessor.process(content))
+
+
+def run_stream(path: Path, preprocessor: LogPreprocessor) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return len("".join(preprocessor.process_stream(f)))
+
+
+def measure(label: str, fn, path: Path, preprocessor: LogPreprocessor):
+    tracemalloc.start()
+    start = time.perf_counter()
+    output_len = fn(path, preprocessor)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} {elapsed:6.2f}s  최대 메모리 {peak / 1024 / 1024:8.1f} MB  출력 {output_len / 1024 / 1024:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--max-size-mb", type=float, default=5, help="전처리 최대 크기 (log.max_size_mb)")
+    args = parser.parse_args()
+    
+    preprocessor = LogPreprocessor(max_size_mb=args.max_size_mb)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        write_log(path, args.size_mb)
+        print(f"📄 {path.stat().st_size / 1024 / 1024:.0f} MB 로그\n")
+        
+        measure("full", run_full, path, preprocessor)
+        measure("stream", run_stream, path, preprocessor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""시간 구간 슬라이싱 벤치마크 (2 GB 로그에서 5분 구간)
+
+- 기존 방식: 줄마다 정규식 2개 + 문자열 비교로 전체 스캔 (filter_by_time_range)
+- read_time_range: mmap 이진 탐색으로 구간 경계만 찾고 해당 구간만 읽기
+를 비교한다. 기존 방식은 앞부분(--legacy-mb)만 재고 환산한다.
+
+실행: python scripts/bench_time_slice.py --size-mb 2048
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bifrost.timeindex import read_time_range
+
+
+LEGACY_PATTERNS = [
+    r'\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}',
+    r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}',
+]
+
+START = datetime(2024, 10, 25)
+
+
+def write_log(path: Path, size_mb: int) -> datetime:
+    """초당 20줄 로그 생성, 마지막 시각 반환"""
+    target = size_mb * 1024 * 1024
+    written = 0
+    current = START
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            stamp = current.strftime("%Y-%m-%d %H:%M:%S")
+            chunk = "".join(
+                f"{stamp}.{i:03d} INFO [worker-{i % 8}] GET /api/orders/{i} 200 {i * 7 % 300}ms\n"
+                for i in range(20)
+            )
+            if current.second == 0:
+                chunk += "    at com.example.Service.call(Service.java:42)\n"
+            f.write(chunk)
+            written += len(chunk)
+            current += timedelta(seconds=1)
+    return current
+
+
+def legacy_scan(path: Path, limit_bytes: int, start: str, end: str) -> int:
+    matched = 0
+    read = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            read += len(line)
+            if read > limit_bytes:
+                break
+            timestamp = None
+            for pattern in LEGACY_PATTERNS:
+                match = re.search(pattern, line)
+                if match:
+                    timestamp = match.group(0)
+                    break
+            if not timestamp or (start <= timestamp <= end):
+                matched += 1
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--legacy-mb", type=int, default=128, help="기존 방식으로 측정할 앞부분 크기")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        last = write_log(path, args.size_mb)
+        size_mb = path.stat().st_size / 1024 / 1024
+        
+        middle = START + (last - START) / 2
+        start = middle.strftime("%Y-%m-%d %H:%M:%S")
+        end = (middle + timedelta(minutes=5)).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"📄 {size_mb:.0f} MB 로그, 구간 {start} ~ {end}\n")
+        
+        begin = time.perf_counter()
+        legacy_scan(path, args.legacy_mb * 1024 * 1024, start, end)
+        elapsed = time.perf_counter() - begin
+        rate = args.legacy_mb / elapsed
+        print(f"  기존 전체 스캔     {rate:7.1f} MB/s  → {size_mb:.0f} MB 환산 {size_mb / rate:7.1f} s")
+        
+        begin = time.perf_counter()
+        sliced = read_time_range(path, start, end)
+        elapsed = time.perf_counter() - begin
+        print(f"  read_time_range   {elapsed * 1000:7.1f} ms  ({len(sliced) / 1024 / 1024:.1f} MB, {sliced.count(chr(10)):,}줄)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""타임스탬프 제거 + 정리 처리량 벤치마크 (MB/s)
+
+LogPreprocessor의 타임스탬프 제거와 기본 정리를
+- 기존 방식: 포맷마다 re.sub 한 번씩 (3 패스) + 줄별 rstrip split/join
+- 현재: TimestampRegistry (':MM:SS' 앵커 주변만 결합 정규식 매칭) + 사전 컴파일 정리
+로 비교하고, 사용자 포맷(앵커 없음)을 추가했을 때의 처리량도 잰다.
+
+실행: python scripts/bench_timestamp_strip.py --size-mb 20
+"""
+
+import argparse
+import re
+import time
+
+from bifrost.preprocessor import LogPreprocessor
+from bifrost.timestamps import TimestampRegistry
+
+
+LEGACY_PATTERNS = [
+    r'\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?',
+    r'\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}',
+    r'\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}',
+]
+
+# 사용자 포맷 예시 (epoch millis, 괄호 시각)
+CUSTOM_FORMATS = {
+    "epoch_ms": r'\b1[6-9]\d{11}\b',
+    "bracket_time": r'\[\d{2}:\d{2}:\d{2}\.\d{3}\]',
+}
+
+
+def make_log(size_mb: int) -> str:
+    lines = [
+        "2024-10-25 10:15:33 ERROR [worker-7] Connection refused   ",
+        "192.168.0.1 - - [25/Oct/2024:10:15:34 +0000] \"GET /api HTTP/1.1\" 500 -",
+        "Oct 25 10:15:35 host kernel: oom-killer invoked\t",
+        "    at com.example.Service.call(Service.java:42)",
+        "",
+        "",
+        "",
+    ]
+    block = "\n".join(lines) + "\n"
+    return block * (size_mb * 1024 * 1024 // len(block))
+
+
+def legacy(content: str) -> str:
+    """기존 코드 경로 재현"""
+    for pattern in LEGACY_PATTERNS:
+        content = re.sub(pattern, '', content)
+    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+    return '\n'.join(line.rstrip() for line in content.split('\n'))
+
+
+def current(preprocessor: LogPreprocessor):
+    def run(content: str) -> str:
+        return preprocessor._clean_log(preprocessor._remove_timestamps(content))
+    return run
+
+
+def measure(label: str, fn, log: str, size_mb: float, repeat: int) -> str:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(log)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<18} {elapsed * 1000:8.1f} ms   {size_mb / elapsed:7.1f} MB/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    log = make_log(args.size_mb)
+    size_mb = len(log.encode()) / 1024 / 1024
+    print(f"📄 {size_mb:.1f} MB 로그\n")
+    
+    expected = measure("기존 (3 패스)", legacy, log, size_mb, args.repeat)
+    result = measure("레지스트리", current(LogPreprocessor()), log, size_mb, args.repeat)
+    print(f"  결과 동일: {'✅' if result == expected else '❌'}")
+    
+    registry = TimestampRegistry()
+    registry.register_many(CUSTOM_FORMATS)
+    measure("+ 사용자 포맷 2개", current(LogPreprocessor(timestamps=registry)), log, size_mb, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
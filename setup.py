@@ -14,5 +14,5 @@ setup(
             "bifrost=bifrost.main:main",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.9",
 )
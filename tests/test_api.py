@@ -49,6 +49,70 @@ def test_history_endpoint():
     assert isinstance(response.json(), list)
 
 
+def test_history_fields_projection():
+    """fields= 지정 시 해당 필드만, 알 수 없는 필드는 400"""
+    response = client.post("/history", json={"limit": 5, "fields": ["id", "created_at", "status"]})
+    assert response.status_code == 200
+    for row in response.json():
+        assert set(row) == {"id", "created_at", "status"}
+    
+    response = client.post("/history", json={"fields": ["log_content"]})
+    assert response.status_code == 400
+
+
+def test_history_keyset_pages():
+    """cursor를 보내면 {items, next_cursor}, 이어 받은 페이지는 겹치지 않음"""
+    from bifrost.database import get_database
+    for i in range(5):
+        get_database().save_analysis(
+            source="local", model="mistral", log_content=f"keyset log {i}", response="r", duration=1.0,
+        )
+    
+    first = client.post("/history", json={"limit": 2, "cursor": None, "fields": ["id"]}).json()
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    second = client.post("/history", json={"limit": 2, "cursor": first["next_cursor"], "fields": ["id"]}).json()
+    assert {r["id"] for r in first["items"]}.isdisjoint(r["id"] for r in second["items"])
+    assert max(r["id"] for r in second["items"]) < min(r["id"] for r in first["items"])
+    
+    assert client.post("/history", json={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_export_streaming():
+    """export는 스트리밍 응답, limit을 주면 X-Next-Cursor로 이어 받기"""
+    import json
+    from bifrost.database import get_database
+    for i in range(3):
+        get_database().save_analysis(
+            source="local", model="mistral", log_content=f"export log {i}", response="r", duration=1.0,
+        )
+
+    everything = client.get("/api/export/json?pretty=false").json()
+    first = client.get("/api/export/ndjson?limit=2")
+    assert [json.loads(line)["id"] for line in first.text.splitlines()] == [r["id"] for r in everything[:2]]
+    rest = client.get(f"/api/export/json?cursor={first.headers['X-Next-Cursor']}").json()
+    assert [r["id"] for r in rest] == [r["id"] for r in everything[2:]]
+
+    csv_text = client.get("/api/export/csv?limit=1").text
+    assert csv_text.startswith("id,created_at") and len(csv_text.splitlines()) == 2
+    assert client.get("/api/export/csv?cursor=bad").status_code == 400
+
+
+def test_export_parquet():
+    """Parquet export는 JSON export와 같은 행/순서"""
+    import io
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    expected = client.get("/api/export/json?pretty=false").json()
+    response = client.get("/api/export/parquet?fields=id&fields=duration_seconds")
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == ["id", "duration_seconds"]
+    assert table.column("id").to_pylist() == [r["id"] for r in expected]
+
+    assert client.get("/api/export/parquet?table=metrics").status_code == 200
+    assert client.get("/api/export/parquet?table=nope").status_code == 400
+
+
 def test_metrics_endpoint():
     """메트릭 엔드포인트"""
     response = client.get("/metrics?hours=24")
@@ -63,3 +127,23 @@ def test_prometheus_metrics():
     response = client.get("/metrics/prometheus")
     assert response.status_code == 200
     assert "bifrost_" in response.text
+    assert "bifrost_singleflight_in_flight" in response.text
+
+
+def test_filter_query_endpoint():
+    """복합 필터링"""
+    log_content = (
+        "2024-10-25 10:00:01 INFO start\n"
+        "2024-10-25 10:05:00 ERROR db timeout\n"
+        "2024-10-25 11:00:00 ERROR db refused"
+    )
+    response = client.post("/api/filter/query", json={
+        "log_content": log_content,
+        "min_level": "WARN",
+        "keywords": ["DB"],
+        "end_time": "2024-10-25 10:30:00",
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filtered_log"] == "2024-10-25 10:05:00 ERROR db timeout"
+    assert data["statistics"]["by_severity"]["ERROR"] == 1
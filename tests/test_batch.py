@@ -23,3 +23,157 @@ async def test_batch_analyze_files(sample_log_file, tmp_path):
     # assert len(results) == 3
     # for result in results:
     #     assert result["status"] in ["success", "failed", "cached"]
+
+
+@pytest.mark.asyncio
+async def test_batch_bounded_concurrency(tmp_path, monkeypatch):
+    """워커 수/백엔드 상한을 넘겨 동시에 모델을 호출하지 않음"""
+    from bifrost import batch
+    from bifrost.config import Config
+    from bifrost.database import Database
+
+    db = Database(f"sqlite:///{tmp_path / 'batch.db'}")
+    db.init_db()
+    monkeypatch.setattr(batch, "get_database", lambda: db)
+
+    config = Config()
+    config.data = {**config.data, "batch": {"backend_limits": {"local": 2}, "max_open_files": 2}}
+    analyzer = BatchAnalyzer(source="local", model="fake", max_workers=4, config=config)
+
+    active = peak = 0
+
+    async def fake_backend(prompt):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"response": "ok", "metadata": {"model": "fake"}}
+
+    monkeypatch.setattr(analyzer, "_call_backend", fake_backend)
+
+    files = []
+    for i in range(20):
+        log_file = tmp_path / f"bounded_{i}.log"
+        log_file.write_text(f"ERROR: bounded {i}")
+        files.append(log_file)
+
+    results = await analyzer.analyze_files(iter(files))
+    assert len(results) == 20
+    assert all(r["status"] == "success" for r in results)
+    assert peak == 2
+
+
+def test_batch_resume_skips_completed(tmp_path, monkeypatch):
+    """재개 시 완료된 파일은 열지 않고, 실패/변경된 파일만 다시 분석"""
+    from bifrost import batch
+    from bifrost.batch import BatchManifest
+    from bifrost.database import Database
+
+    db = Database(f"sqlite:///{tmp_path / 'batch.db'}")
+    db.init_db()
+    monkeypatch.setattr(batch, "get_database", lambda: db)
+
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    for i in range(5):
+        (logs / f"svc_{i}.log").write_text(f"ERROR: resume {i}")
+
+    called = []
+
+    async def fake_backend(prompt):
+        called.append(prompt)
+        if "resume 3" in prompt:
+            raise RuntimeError("backend down")
+        return {"response": "ok", "metadata": {"model": "fake"}}
+
+    def run(manifest):
+        analyzer = BatchAnalyzer(source="local", model="fake", max_workers=2, use_cache=False)
+        monkeypatch.setattr(analyzer, "_call_backend", fake_backend)
+        return analyzer.analyze_directory(logs, manifest=manifest)
+
+    manifest = BatchManifest.create(db, logs, "*.log", "local", "fake")
+    results = run(manifest)
+    assert sorted(r["status"] for r in results) == ["failed"] + ["success"] * 4
+    assert db.get_batch_job(manifest.id)["status"] == "incomplete"
+    files = db.get_batch_job_files(manifest.id)
+    assert all(f["log_hash"] for f in files.values() if f["status"] == "success")
+
+    # 재개: 실패한 파일 + 내용이 바뀐 파일만
+    (logs / "svc_0.log").write_text("ERROR: resume 0 changed")
+    called.clear()
+    resumed = BatchManifest.load(db, manifest.id)
+    results = run(resumed)
+    assert resumed.skipped == 3
+    assert sorted(Path(r["file"]).name for r in results) == ["svc_0.log", "svc_3.log"]
+    assert len(called) == 2
+    assert db.get_batch_job(manifest.id)["status"] == "incomplete"
+
+
+@pytest.mark.asyncio
+async def test_batch_dedup_in_run(tmp_path, monkeypatch):
+    """같은 내용 파일은 결과 공유, 전처리 결과가 같으면 모델 호출만 공유"""
+    from bifrost import batch
+    from bifrost.database import Database
+
+    db = Database(f"sqlite:///{tmp_path / 'batch.db'}")
+    db.init_db()
+    monkeypatch.setattr(batch, "get_database", lambda: db)
+
+    analyzer = BatchAnalyzer(source="local", model="fake", max_workers=4, use_cache=False)
+    calls = []
+
+    async def fake_backend(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return {"response": "ok", "metadata": {"model": "fake"}}
+
+    monkeypatch.setattr(analyzer, "_call_backend", fake_backend)
+
+    contents = ["ERROR a\n"] * 3 + ["ERROR b\n", "ERROR b   \n", "ERROR c\n"]
+    files = []
+    for i, content in enumerate(contents):
+        log_file = tmp_path / f"rotated_{i}.log"
+        log_file.write_text(content)
+        files.append(log_file)
+
+    results = {Path(r["file"]).name: r for r in await analyzer.analyze_files(files)}
+    assert len(calls) == 3
+    assert sorted(r["status"] for r in results.values()) == ["duplicate"] * 2 + ["success"] * 4
+    assert sum(1 for r in results.values() if r.get("shared_call")) == 1
+
+    duplicate = next(r for r in results.values() if r["status"] == "duplicate")
+    leader = results[Path(duplicate["duplicate_of"]).name]
+    assert duplicate["analysis_id"] == leader["analysis_id"] is not None
+
+
+@pytest.mark.asyncio
+async def test_batch_input_error_stops_workers_before_writer(tmp_path, monkeypatch):
+    """입력 이터레이터가 실패하면 워커를 멈춘 뒤 writer를 닫음 (닫힌 writer가 다시 열리지 않음)"""
+    from bifrost import batch
+    from bifrost.database import Database
+
+    db = Database(f"sqlite:///{tmp_path / 'batch.db'}")
+    db.init_db()
+    monkeypatch.setattr(batch, "get_database", lambda: db)
+
+    analyzer = BatchAnalyzer(source="local", model="fake", max_workers=2, use_cache=False)
+
+    async def slow_backend(prompt):
+        await asyncio.sleep(0.05)
+        return {"response": "ok", "metadata": {"model": "fake"}}
+
+    monkeypatch.setattr(analyzer, "_call_backend", slow_backend)
+
+    def paths():
+        for i in range(40):  # 첫 묶음(32개)은 넘겨진 뒤 실패
+            log_file = tmp_path / f"app_{i}.log"
+            log_file.write_text(f"ERROR {i}\n")
+            yield log_file
+        raise PermissionError("denied")
+
+    with pytest.raises(PermissionError):
+        await analyzer.analyze_files(paths())
+    await asyncio.sleep(0.3)
+
+    assert analyzer.writer._task is None
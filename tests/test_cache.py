@@ -0,0 +1,176 @@
+"""캐시 테스트"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from bifrost.cache import CacheManager, LRUCache
+
+
+def test_lru_get_set():
+    """기본 조회/저장"""
+    cache = LRUCache(max_entries=10)
+    cache.set("a", {"response": "x"}, size=1)
+    
+    assert cache.get("a") == {"response": "x"}
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    """항목 수 초과 시 가장 오래 안 쓴 항목 제거"""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a를 최근 사용으로
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_byte_budget():
+    """바이트 예산 초과 시 제거, 예산보다 큰 항목은 저장 안 함"""
+    cache = LRUCache(max_entries=100, max_bytes=100)
+    cache.set("a", "a", size=60)
+    cache.set("b", "b", size=60)
+    
+    assert cache.get("a") is None
+    assert cache.stats()["total_bytes"] == 60
+    
+    cache.set("huge", "x", size=1000)
+    assert cache.get("huge") is None
+    assert len(cache) == 1
+
+
+def test_lru_ttl():
+    """TTL 만료"""
+    cache = LRUCache(ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_manager_persists_index(tmp_path):
+    """샤드 파일에서 인덱스 복원, 덮어쓰기/삭제 반영"""
+    cache = CacheManager(cache_dir=str(tmp_path), shards=4)
+    cache.set("a", {"response": "x"})
+    cache.set("b", [1, 2])
+    cache.set("a", {"response": "y"})
+    cache.delete("b")
+    cache.close()
+    
+    cache = CacheManager(cache_dir=str(tmp_path), shards=4)
+    assert cache.get("a") == {"response": "y"}
+    assert cache.get("b") is None
+    assert cache.stats()["total_entries"] == 1
+    
+    cache.compact()
+    assert cache.get("a") == {"response": "y"}
+    assert cache.stats()["file_size_bytes"] == cache.stats()["total_size_bytes"]
+
+
+def test_cache_manager_expiry(tmp_path):
+    """TTL 만료 정리는 인덱스만 보고 처리"""
+    cache = CacheManager(cache_dir=str(tmp_path), ttl_hours=0)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    
+    assert cache.clear_expired() == 1
+    assert cache.get("a") is None
+    assert cache.stats()["total_entries"] == 0
+
+
+def test_cache_manager_imports_legacy_files_only(tmp_path):
+    """이전 형식(키 해시.json)만 옮기고 지움, 다른 JSON과 읽지 못한 파일은 남김"""
+    digest = hashlib.sha256(b"a").hexdigest()
+    (tmp_path / f"{digest}.json").write_text(json.dumps({
+        "value": {"response": "x"},
+        "cached_at": datetime.utcnow().isoformat(),
+    }))
+    broken = tmp_path / f"{hashlib.sha256(b'b').hexdigest()}.json"
+    broken.write_text("{not json")
+    other = tmp_path / "settings.json"
+    other.write_text("{}")
+    
+    cache = CacheManager(cache_dir=str(tmp_path), shards=4)
+    
+    assert cache.get("a") == {"response": "x"}
+    assert not (tmp_path / f"{digest}.json").exists()
+    assert broken.exists()
+    assert other.exists()
+
+
+def test_cache_manager_compacts_while_writing(tmp_path):
+    """압축 중 다른 샤드 쓰기와 겹쳐도 인덱스가 깨지지 않음"""
+    cache = CacheManager(cache_dir=str(tmp_path), shards=2)
+    for i in range(200):
+        cache.set(f"k{i}", i)
+    
+    errors = []
+    
+    def compact():
+        try:
+            for _ in range(20):
+                cache.compact()
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+    
+    thread = threading.Thread(target=compact)
+    thread.start()
+    for i in range(200, 2000):
+        cache.set(f"k{i}", i)
+        cache.delete(f"k{i - 200}")
+    thread.join()
+    
+    assert not errors
+    assert cache.stats()["total_entries"] == 200
+    assert cache.get("k1999") == 1999
+
+
+def test_cache_manager_get_races_set(tmp_path):
+    """같은 키를 덮어쓰는 중에 읽어도 멈추지 않음 (다시 조회는 lock 밖에서)"""
+    cache = CacheManager(cache_dir=str(tmp_path), shards=1)
+    cache.set("a", 0)
+    done = threading.Event()
+    
+    def write():
+        for i in range(5000):
+            cache.set("a", i)
+        done.set()
+    
+    def read():
+        while not done.is_set():
+            assert isinstance(cache.get("a"), int)
+    
+    readers = [threading.Thread(target=read, daemon=True) for _ in range(2)]
+    writer = threading.Thread(target=write, daemon=True)
+    for thread in readers + [writer]:
+        thread.start()
+    for thread in readers + [writer]:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    assert cache.get("a") == 4999
+
+
+def test_cache_manager_shard_count_is_stored(tmp_path):
+    """디렉토리의 샤드 수를 기록하고 다른 수로 열면 거부"""
+    cache = CacheManager(cache_dir=str(tmp_path), shards=4)
+    cache.set("a", 1)
+    cache.close()
+    
+    with pytest.raises(ValueError):
+        CacheManager(cache_dir=str(tmp_path), shards=8)
+    
+    cache = CacheManager(cache_dir=str(tmp_path))
+    assert cache.stats()["shards"] == 4
+    assert cache.get("a") == 1
@@ -100,3 +100,166 @@ def test_api_key_creation(test_db):
     assert len(key) > 20
     assert test_db.validate_api_key(key) is True
     assert test_db.validate_api_key("invalid-key") is False
+
+
+def test_cached_analysis_lookup(test_db):
+    """캐시 조회: 저장 시 메모리 캐시에 기록, 비우면 DB에서 다시 채움"""
+    import hashlib
+    log_content = "cached lookup log"
+    log_hash = hashlib.sha256(log_content.encode()).hexdigest()
+    
+    analysis_id = test_db.save_analysis(
+        source="local",
+        model="mistral",
+        log_content=log_content,
+        response="cached response",
+        duration=1.0,
+    )
+    
+    cached = test_db.get_cached_analysis(log_hash, "mistral")
+    assert cached["id"] == analysis_id
+    assert cached["cache_tier"] == "memory"
+    
+    test_db.result_cache.clear()
+    cached = test_db.get_cached_analysis(log_hash, "mistral")
+    assert cached["id"] == analysis_id
+    assert cached["cache_tier"] == "database"
+    assert test_db.get_cached_analysis(log_hash, "mistral")["cache_tier"] == "memory"
+    
+    # 다른 모델/프롬프트 버전은 별도 키
+    assert test_db.get_cached_analysis(log_hash, "llama2") is None
+    assert test_db.get_cached_analysis(log_hash, "mistral", prompt_version="2.0") is None
+
+
+def test_find_cached_analysis(test_db):
+    """DB 단건 캐시 조회: 최신 완료 결과만, 필요한 컬럼만"""
+    import hashlib
+    from datetime import timedelta
+    log_content = "find cached log"
+    log_hash = hashlib.sha256(log_content.encode()).hexdigest()
+    
+    test_db.save_analysis(
+        source="local", model="mistral", log_content=log_content,
+        response="old", duration=1.0,
+    )
+    latest_id = test_db.save_analysis(
+        source="local", model="mistral", log_content=log_content,
+        response="new", duration=2.0,
+    )
+    test_db.save_analysis(
+        source="local", model="mistral", log_content=log_content,
+        response="", duration=0.5, status="failed",
+    )
+    
+    found = test_db.find_cached_analysis(log_hash, "mistral", timedelta(hours=1))
+    assert found["id"] == latest_id
+    assert found["response"] == "new"
+    assert "log_content" not in found
+    
+    assert test_db.find_cached_analysis(log_hash, "llama2", timedelta(hours=1)) is None
+    assert test_db.find_cached_analysis(log_hash, "mistral", timedelta(seconds=-1)) is None
+
+
+def test_log_blob_dedup_and_compression(test_db):
+    """같은 로그는 log_blobs에 한 번만, 응답은 압축 저장 후 그대로 조회"""
+    from sqlalchemy import text
+    log_content = "ERROR Connection refused\n" * 200
+    response = "## 근본 원인\n" * 100
+    
+    ids = [
+        test_db.save_analysis(
+            source="local", model="mistral", log_content=log_content,
+            response=response, duration=1.0,
+        )
+        for _ in range(3)
+    ]
+    
+    with test_db.engine.connect() as conn:
+        blobs = conn.execute(text("SELECT COUNT(*), MAX(LENGTH(content)) FROM log_blobs WHERE size_bytes = :size"),
+                             {"size": len(log_content)}).one()
+        stored_response = conn.execute(text("SELECT response FROM analysis_results WHERE id = :id"),
+                                       {"id": ids[0]}).scalar()
+    assert blobs[0] == 1 and blobs[1] < len(log_content) / 10
+    assert len(stored_response) < len(response.encode())
+    
+    assert test_db.get_log_content(ids[2]) == log_content
+    assert test_db.get_analysis(ids[2])["response"] == response
+
+
+def test_migrate_storage_legacy_rows(tmp_path):
+    """압축 이전 평문 행을 log_blobs + 압축 컬럼으로 옮기기"""
+    import hashlib
+    from sqlalchemy import text
+    db = Database(f"sqlite:///{tmp_path / 'legacy.db'}")
+    db.init_db()
+    log_content = "WARN slow query\n" * 500
+    with db.engine.begin() as conn:
+        for i in range(3):
+            conn.execute(text(
+                "INSERT INTO analysis_results (created_at, source, model, log_content, log_hash, "
+                "log_size_bytes, log_lines, response, response_size_bytes, duration_seconds, status) "
+                "VALUES (CURRENT_TIMESTAMP, 'local', 'mistral', :log, :hash, 0, 0, :response, 0, 1.0, 'completed')"
+            ), {"log": log_content, "hash": hashlib.sha256(log_content.encode()).hexdigest(),
+                "response": f"response {i} " * 100})
+    
+    report = db.migrate_storage()
+    assert report["rows"] == 3
+    assert report["blobs_created"] == 1
+    assert report["bytes_saved"] > len(log_content) * 2
+    
+    assert db.get_log_content(1) == log_content
+    assert db.get_analysis(3)["response"] == "response 2 " * 100
+    assert db.migrate_storage()["rows"] == 0
+
+
+def test_bulk_save_analyses(test_db):
+    """bulk_save_analyses는 입력 순서대로 id, 같은 로그 원문은 한 번만 저장"""
+    ids = test_db.bulk_save_analyses([
+        dict(source="local", model="mistral", log_content=f"bulk log {i % 2}", response=f"r{i}", duration=1.0)
+        for i in range(4)
+    ])
+    assert ids == sorted(ids) and len(set(ids)) == 4
+    assert [test_db.get_analysis(i)["response"] for i in ids] == ["r0", "r1", "r2", "r3"]
+    assert test_db.get_log_content(ids[2]) == "bulk log 0"
+    assert test_db.bulk_save_analyses([]) == []
+
+
+@pytest.mark.asyncio
+async def test_writer_group_commit(tmp_path):
+    """AnalysisWriter: 동시 저장을 한 배치로 묶고 커밋 후 id 반환"""
+    import asyncio
+    from bifrost.writer import AnalysisWriter
+
+    # 저장은 워커 스레드에서 하므로 파일 DB 사용 (:memory:는 스레드마다 별도 DB)
+    test_db = Database(f"sqlite:///{tmp_path / 'writer.db'}")
+    test_db.init_db()
+
+    async with AnalysisWriter(test_db, max_batch=10, max_delay=0.5) as writer:
+        ids = await asyncio.gather(*(
+            writer.save_analysis(source="local", model="mistral", log_content=f"w{i}", response="r", duration=1.0)
+            for i in range(10)
+        ))
+        await writer.save_metric(ids[0], "latency", 1.5, "s")
+    assert writer.stats()["flushes"] == 2  # 분석 결과 1회 + 메트릭 1회
+    assert all(test_db.get_analysis(i) for i in ids)
+
+    buffered = AnalysisWriter(test_db, durability="buffered")
+    assert await buffered.save_analysis(source="local", model="m", log_content="b", response="r", duration=1.0) is None
+    await buffered.close()
+    assert buffered.stats()["rows_written"] == 1
+
+
+def test_sqlite_pragmas(tmp_path):
+    """SQLite 연결마다 WAL 등 프라그마 적용, 설정으로 덮어쓰기/생략"""
+    from sqlalchemy import text
+
+    db = Database(f"sqlite:///{tmp_path / 'wal.db'}", settings={"sqlite": {"busy_timeout": 1234, "mmap_size": None}})
+    with db.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert conn.execute(text("PRAGMA mmap_size")).scalar() == 0
+
+    with pytest.raises(ValueError):
+        with Database("sqlite:///:memory:", settings={"sqlite": {"journal_mode": "WAL; DROP"}}).engine.connect():
+            pass
@@ -0,0 +1,35 @@
+"""배치 파일 탐색 테스트"""
+
+import gzip
+import os
+import time
+
+from bifrost.discovery import FileDiscovery
+
+
+def _names(discovery):
+    return sorted(path.relative_to(discovery.root).as_posix() for path in discovery)
+
+
+def test_discovery_recursive_filters(tmp_path):
+    """하위 디렉토리 / 압축 로그 / exclude / 크기·시간 필터"""
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "tmp").mkdir()
+    (tmp_path / "top.log").write_text("x" * 10)
+    (tmp_path / "a" / "mid.log").write_text("x" * 100)
+    (tmp_path / "a" / "b" / "deep.log.gz").write_bytes(gzip.compress(b"ERROR deep\n"))
+    (tmp_path / "a" / "notes.txt").write_text("skip")
+    (tmp_path / "tmp" / "scratch.log").write_text("x")
+    os.symlink(tmp_path / "a", tmp_path / "loop")  # 심볼릭 링크 디렉토리는 따라가지 않음
+
+    discovery = FileDiscovery(tmp_path, exclude=["tmp"])
+    assert _names(discovery) == ["a/b/deep.log.gz", "a/mid.log", "top.log"]
+    assert discovery.files == 3
+
+    assert _names(FileDiscovery(tmp_path, recursive=False)) == ["top.log"]
+    assert _names(FileDiscovery(tmp_path, include=["a/*.log"])) == ["a/mid.log"]
+    assert _names(FileDiscovery(tmp_path, min_size=50)) == ["a/mid.log"]
+
+    old = time.time() - 7200
+    os.utime(tmp_path / "top.log", (old, old))
+    assert "top.log" not in _names(FileDiscovery(tmp_path, newer_than=time.time() - 3600))
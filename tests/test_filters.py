@@ -0,0 +1,100 @@
+"""로그 필터 테스트"""
+
+from bifrost.filters import LogFilter, SeverityLevel
+from bifrost.keywords import KeywordMatcher, get_keyword_matcher
+
+
+SAMPLE_LOG = """2024-10-25 10:15:32 INFO [main] started
+2024-10-25 10:15:33 debug connection acquired
+2024-10-25 10:15:34 [ERROR] Connection refused
+    at com.example.db.Pool.get(Pool.java:88)
+2024-10-25 10:15:35 Warning: retrying
+errorCount=0 CRITICAL failure"""
+
+
+def test_classify_lines():
+    """줄 단위 심각도 일괄 분류"""
+    assert LogFilter.classify_lines(SAMPLE_LOG) == [
+        "INFO", "DEBUG", "ERROR", None, "WARNING", "CRITICAL",
+    ]
+
+
+def test_severity_ignores_partial_words():
+    """심각도 접미사만 맞는 일반 단어는 심각도가 아님 (EARN, DARN, TNFO)"""
+    log = "users earn points\ndarn it\nTNFO x\nwarn: disk"
+    
+    assert LogFilter.classify_lines(log) == [None, None, None, "WARN"]
+    assert LogFilter.filter_by_severity(log, SeverityLevel.WARN) == "users earn points\ndarn it\nTNFO x\nwarn: disk"
+    assert LogFilter.get_log_statistics(log)["unknown"] == 3
+
+
+def test_filter_with_statistics():
+    """필터링 결과와 통계를 한 번에"""
+    filtered, stats = LogFilter.filter_with_statistics(SAMPLE_LOG, SeverityLevel.WARN)
+    
+    assert filtered == LogFilter.filter_by_severity(SAMPLE_LOG, SeverityLevel.WARN)
+    assert "started" not in filtered
+    assert "Pool.java" in filtered
+    assert stats == LogFilter.get_log_statistics(filtered)
+    assert stats["by_severity"]["FATAL"] == 1
+    assert stats["unknown"] == 1
+
+
+def test_pipeline_matches_chained_filters():
+    """파이프라인 = 필터를 순서대로 이어 부른 결과"""
+    chained = LogFilter.filter_by_time_range(
+        LogFilter.filter_by_keyword(
+            LogFilter.filter_by_severity(SAMPLE_LOG, SeverityLevel.DEBUG),
+            ["connection", "retry"],
+        ),
+        start_time="2024-10-25 10:15:33",
+    )
+    pipeline = (
+        LogFilter.pipeline()
+        .severity(SeverityLevel.DEBUG)
+        .keywords(["connection", "retry"])
+        .time_range(start_time="2024-10-25 10:15:33")
+    )
+    
+    assert pipeline.filter(SAMPLE_LOG) == chained
+    
+    # 줄 이터레이터 지연 처리 (개행 유지)
+    lines = SAMPLE_LOG.splitlines(keepends=True)
+    assert "".join(pipeline.run(iter(lines))).rstrip("\n") == chained
+
+
+def test_keyword_matcher_positions():
+    """트라이 매처: 가장 긴 키워드, 정규식 키워드, 매칭 위치"""
+    matcher = KeywordMatcher(["err", "error", "Pool"], patterns=[r"java\.\w+"])
+    text = "ERROR at com.example.db.Pool (java.sql)"
+    
+    assert [(m.start, m.end, m.keyword) for m in matcher.finditer(text)] == [
+        (0, 5, "error"),
+        (24, 28, "Pool"),
+        (30, 38, r"java\.\w+"),
+    ]
+    assert matcher.matches("an Err occurred")
+    assert not matcher.matches("all good")
+    assert get_keyword_matcher(["a", "b"]) is get_keyword_matcher(["a", "b"])
+
+
+def test_keyword_matcher_separate_patterns():
+    """역참조/전역 인라인 플래그가 있는 정규식 키워드도 그대로 동작"""
+    matcher = KeywordMatcher(
+        ["pool"], patterns=[r"id=(\d+)-\1", r"(?i)timeout"], case_sensitive=True,
+    )
+    text = "pool id=7-7 TIMEOUT id=7-8 Timeout"
+    
+    assert [(m.start, m.end, m.keyword) for m in matcher.finditer(text)] == [
+        (0, 4, "pool"),
+        (5, 11, r"id=(\d+)-\1"),
+        (12, 19, "(?i)timeout"),
+        (27, 34, "(?i)timeout"),
+    ]
+    assert matcher.matches("read TimeOut")
+    assert KeywordMatcher(patterns=[r"(a)\1"]).matches("xaay")
+    assert not KeywordMatcher(patterns=[r"(a)\1"]).matches("xay")
+    assert KeywordMatcher(["x"], patterns=["(?i)timeout"]).matches("TIMEOUT")
+    
+    filtered = LogFilter.filter_by_keyword("a TIMEOUT\nok\nid=3-3", ["x"], True, [r"(?i)timeout", r"id=(\d)-\1"])
+    assert filtered == "a TIMEOUT\nid=3-3"
@@ -173,7 +173,7 @@ class TestHeimdallIntegration:
         })
         
         # Mock DB 저장
-        service._save_analysis_to_db = MagicMock(return_value=789)
+        service._save_analysis_to_db = AsyncMock(return_value=789)
         
         # 테스트
         await service.process_analysis_request(sample_analysis_request)
@@ -0,0 +1,64 @@
+"""mmap 로그 입력 테스트"""
+
+import hashlib
+
+from bifrost.logsource import LogSource
+from bifrost.preprocessor import LogPreprocessor
+
+
+def test_log_source_access(tmp_path):
+    """줄 순회 / 구간 / 앞뒤 / 해시가 원문과 일치"""
+    text = "첫 줄\nsecond line\r\n\nlast"
+    path = tmp_path / "app.log"
+    path.write_bytes(text.encode())
+    
+    with LogSource.open(path) as source:
+        assert source.mapped
+        assert source.size == len(text.encode())
+        assert list(source.lines()) == ["첫 줄\n", "second line\r\n", "\n", "last"]
+        assert source.text(8, 19) == "second line"
+        assert source.head(21) == "첫 줄\nsecond line\r\n"
+        assert source.tail(6) == "\nlast"
+        assert source.sha256() == hashlib.sha256(text.encode()).hexdigest()
+        assert source.payload().text == text
+    
+    empty = tmp_path / "empty.log"
+    empty.write_text("")
+    with LogSource.open(empty) as source:
+        assert not source.mapped
+        assert source.text() == "" and list(source.lines()) == []
+
+
+def test_process_source_skips_middle(tmp_path):
+    """잘리는 큰 파일: 중간을 읽지 않아도 스트리밍 처리와 결과/통계 동일"""
+    path = tmp_path / "big.log"
+    path.write_text("".join(f"2024-10-25 10:15:32 INFO line {i}  \n" for i in range(20000)))
+    preprocessor = LogPreprocessor(max_size_mb=0.01, remove_timestamps=True)
+    
+    expected = preprocessor.stream()
+    with open(path, encoding="utf-8") as f:
+        expected_output = "".join(expected.process(f))
+    
+    processor = preprocessor.stream()
+    with LogSource.open(path) as source:
+        output = "".join(processor.process_source(source))
+    
+    assert output == expected_output
+    assert "생략" in output
+    assert processor.input_lines == expected.input_lines == 20001
+    assert processor.input_bytes == expected.input_bytes
+
+
+def test_log_source_gzip(tmp_path):
+    """.gz 로그는 풀어서 mmap (해시는 원문 기준)"""
+    import gzip
+
+    text = "ERROR first\n" * 1000
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(text.encode()))
+
+    with LogSource.open(path) as source:
+        assert source.mapped
+        assert source.size == len(text)
+        assert source.sha256() == hashlib.sha256(text.encode()).hexdigest()
+        assert source.tail(12) == "ERROR first\n"
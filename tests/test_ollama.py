@@ -0,0 +1,114 @@
+"""Ollama 클라이언트 테스트"""
+
+import asyncio
+import json
+import pytest
+import httpx
+
+from bifrost.ollama import AsyncOllamaClient, OllamaClientRegistry
+
+
+def _mock_transport(handler):
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_async_analyze():
+    """비동기 분석 (비스트리밍)"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        assert request.url.path == "/api/generate"
+        assert payload["stream"] is False
+        return httpx.Response(200, json={"response": "분석 결과", "done": True})
+    
+    async with AsyncOllamaClient(model="mistral", transport=_mock_transport(handler)) as client:
+        result = await client.analyze("prompt")
+    
+    assert result["response"] == "분석 결과"
+    assert result["metadata"]["model"] == "mistral"
+    assert result["metadata"]["done"] is True
+
+
+@pytest.mark.asyncio
+async def test_async_analyze_stream():
+    """비동기 분석 (스트리밍 청크 수집)"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        lines = [json.dumps({"response": text}) for text in ["Hel", "lo"]]
+        return httpx.Response(200, text="\n".join(lines))
+    
+    async with AsyncOllamaClient(transport=_mock_transport(handler)) as client:
+        result = await client.analyze("prompt", stream=True)
+    
+    assert result["response"] == "Hello"
+
+
+@pytest.mark.asyncio
+async def test_async_analyze_http_error():
+    """HTTP 오류는 예외로 전달"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"error": "boom"})
+    
+    async with AsyncOllamaClient(transport=_mock_transport(handler)) as client:
+        with pytest.raises(Exception, match="Ollama API 요청 실패"):
+            await client.analyze("prompt")
+
+
+@pytest.mark.asyncio
+async def test_async_health_check():
+    """헬스 체크"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"models": []})
+    
+    async with AsyncOllamaClient(transport=_mock_transport(handler)) as client:
+        assert await client.health_check() is True
+
+
+def test_registry_reuses_client():
+    """(url, model)별 클라이언트 재사용 및 hit/miss 집계"""
+    registry = OllamaClientRegistry()
+    
+    first = registry.get(url="http://ollama:11434", model="mistral", pool_size=4)
+    again = registry.get(url="http://ollama:11434/", model="mistral", pool_size=4)
+    other = registry.get(url="http://ollama:11434", model="llama2")
+    bigger = registry.get(url="http://ollama:11434", model="mistral", pool_size=16)
+    
+    assert first is again
+    assert first is not other
+    assert first.pool_size == 4
+    assert bigger is not first and bigger.pool_size == 16  # 설정이 다르면 별도 클라이언트
+    assert registry.stats() == {"hits": 1, "misses": 3, "clients": 3}
+    
+    registry.close()
+    assert registry.stats()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_async_client_per_loop():
+    """비동기 클라이언트는 같은 이벤트 루프 안에서 재사용"""
+    registry = OllamaClientRegistry()
+    
+    first = registry.get_async(model="mistral")
+    again = registry.get_async(model="mistral")
+    
+    assert first is again
+    assert registry.stats()["hits"] == 1
+    
+    await registry.aclose()
+
+
+def test_registry_closes_async_client_with_loop():
+    """루프가 끝나면 그 루프의 비동기 클라이언트를 닫고, 새 루프에서는 새로 만듦"""
+    registry = OllamaClientRegistry()
+    
+    async def use():
+        client = registry.get_async(model="mistral")
+        client.client  # 커넥션 풀 생성
+        return client
+    
+    first = asyncio.run(use())
+    assert first._client is None  # asyncio.run 종료 시 닫힘
+    assert registry.stats()["clients"] == 0
+    
+    second = asyncio.run(use())
+    assert second is not first
+    assert second._client is None
@@ -2,6 +2,7 @@
 
 import pytest
 from bifrost.preprocessor import LogPreprocessor
+from bifrost.timestamps import TimestampRegistry
 
 
 def test_truncate_large_log():
@@ -51,3 +52,101 @@ def test_clean_log():
     
     # 불필요한 빈 줄 제거
     assert "\n\n\n" not in processed
+
+
+def test_log_payload_derived_values():
+    """LogPayload 파생값이 기존 계산식과 동일"""
+    import hashlib
+    from bifrost.payload import LogPayload
+    
+    log = "첫 줄\nsecond line\n"
+    payload = LogPayload(log)
+    
+    assert payload.sha256 == hashlib.sha256(log.encode()).hexdigest()
+    assert payload.size_bytes == len(log.encode())
+    assert payload.line_count == len(log.split('\n'))
+    assert LogPayload.of(payload) is payload
+
+
+def test_process_accepts_payload():
+    """전처리는 str과 LogPayload에 대해 같은 결과"""
+    from bifrost.payload import LogPayload
+    preprocessor = LogPreprocessor(max_size_mb=0.001, truncate=True)
+    large_log = "\n".join([f"Line {i}" for i in range(1000)])
+    
+    assert preprocessor.process(LogPayload(large_log)) == preprocessor.process(large_log)
+
+
+def test_stream_matches_process_without_truncation():
+    """잘리지 않는 입력은 process()와 스트리밍 결과가 동일"""
+    preprocessor = LogPreprocessor(remove_timestamps=True)
+    log = "2024-10-25 10:15:32 INFO start  \n\n \n\nbody\t\n\n\n\nend\n"
+    chunks = [log[i:i + 3] for i in range(0, len(log), 3)]
+    
+    assert "".join(preprocessor.process_stream(chunks)) == preprocessor.process(log)
+
+
+def test_stream_truncates_with_bounded_tail():
+    """큰 입력은 앞/뒤 바이트 예산만 유지하고 중간 생략"""
+    preprocessor = LogPreprocessor(max_size_mb=0.001, truncate=True)
+    lines = (f"Line {i}\n" for i in range(100000))
+    
+    stream = preprocessor.stream()
+    processed = "".join(stream.process(lines))
+    
+    assert processed.startswith("Line 0\n")
+    assert processed.endswith("Line 99999\n")
+    assert "생략" in processed
+    assert len(processed.encode()) < preprocessor.max_size_bytes
+    assert stream.input_lines == 100001
+
+
+@pytest.mark.asyncio
+async def test_stream_async():
+    """비동기 이터레이터 입력"""
+    async def chunks():
+        for part in ["a\n", "\n\n\nb", "  \n"]:
+            yield part
+    
+    preprocessor = LogPreprocessor()
+    pieces = [piece async for piece in preprocessor.aprocess_stream(chunks())]
+    
+    assert "".join(pieces) == preprocessor.process("a\n\n\n\nb  \n")
+
+
+def test_timestamp_registry_custom_format():
+    """사용자 포맷 등록 후 기본 포맷과 함께 제거"""
+    registry = TimestampRegistry()
+    registry.register("epoch_ms", r'\b1[6-9]\d{11}\b')
+    preprocessor = LogPreprocessor(remove_timestamps=True, timestamps=registry)
+    
+    log = "2024-10-25 10:15:32 ERROR a\n1729851332123 WARN b\nOct 25 10:15:32 host c"
+    processed = preprocessor.process(log)
+    
+    assert processed == " ERROR a\n WARN b\n host c"
+    assert registry.search("at 25/Oct/2024:10:15:32").lastgroup == "apache"
+    
+    with pytest.raises(ValueError):
+        registry.register("bad name", r'\d+')
+
+
+def test_timestamp_registry_loads_config_formats(monkeypatch):
+    """전역 레지스트리는 처음 쓸 때 설정의 log.timestamp_formats를 등록"""
+    from bifrost import timestamps
+    
+    registry = TimestampRegistry()
+    monkeypatch.setattr(timestamps, "timestamp_registry", registry)
+    monkeypatch.setattr(timestamps, "_configured", False)
+    config = {"log.timestamp_formats": {"epoch_ms": r'\b1[6-9]\d{11}\b'}}
+    
+    class _Config:
+        def get(self, path, default=None):
+            return config.get(path, default)
+    
+    assert timestamps.get_timestamp_registry(_Config()) is registry
+    assert "epoch_ms" in registry.formats
+    
+    # 이후 호출은 다시 읽지 않음
+    config["log.timestamp_formats"] = {"other": r'x\d+'}
+    assert LogPreprocessor().timestamps is registry
+    assert "other" not in registry.formats
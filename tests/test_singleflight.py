@@ -0,0 +1,53 @@
+"""같은 분석 요청 합치기 테스트"""
+
+import asyncio
+
+import pytest
+
+from bifrost.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces():
+    """같은 키 동시 요청은 한 번만 실행, 끝나면 키 제거"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def analyze():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"response": "ok"}
+
+    results = await asyncio.gather(*(flight.do(("hash", "mistral"), analyze) for _ in range(10)))
+    assert calls == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result == {"response": "ok"} for result, _ in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": {"api": 1}, "coalesced": {"api": 9}}
+
+    await flight.do(("hash", "mistral"), analyze)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_failure_and_cancel():
+    """실패는 기다리던 요청 모두에 전달, 한 요청이 취소돼도 공유 작업은 계속"""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model down")
+
+    results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.in_flight() == 0
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("slow", slow))
+    follower = asyncio.ensure_future(flight.do("slow", slow, channel="websocket"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == ("done", True)
@@ -0,0 +1,48 @@
+"""타임스탬프 파싱 & 시간 구간 테스트"""
+
+from datetime import datetime, timezone
+
+from bifrost.timeindex import TimeIndex, bisect_time_range, parse_timestamp, read_time_range
+
+
+SAMPLE_LOG = """header without time
+2024-10-25 10:00:00 INFO start
+2024-10-25 10:04:59 ERROR failed
+    at com.example.Pool.get(Pool.java:88)
+[25/Oct/2024:10:05:30 +0000] GET /health
+ts=1729850760000 WARN slow
+2024-10-25 10:10:00 INFO done
+"""
+
+
+def epoch(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_parse_timestamp_formats():
+    """ISO / Apache / 미국식 / syslog / epoch millis"""
+    assert parse_timestamp("2024-10-25T10:15:32.5+09:00 x") == epoch(2024, 10, 25, 1, 15, 32) + 0.5
+    assert parse_timestamp("[25/Oct/2024:10:15:32 +0100]") == epoch(2024, 10, 25, 9, 15, 32)
+    assert parse_timestamp("10/25/2024 10:15:32") == epoch(2024, 10, 25, 10, 15, 32)
+    assert parse_timestamp("Oct 25 10:15:32 host", default_year=2024) == epoch(2024, 10, 25, 10, 15, 32)
+    assert parse_timestamp(b"ts=1729851332123") == 1729851332.123
+    assert parse_timestamp("no time here") is None
+
+
+def test_time_range_slicing(tmp_path):
+    """이진 탐색과 인덱스가 같은 구간을 반환"""
+    data = SAMPLE_LOG.encode()
+    start, end = "2024-10-25 10:04", "2024-10-25 10:06"
+    
+    begin, finish = bisect_time_range(data, start, end)
+    assert (begin, finish) == TimeIndex(data).range(start, end)
+    assert data[begin:finish].decode() == (
+        "2024-10-25 10:04:59 ERROR failed\n"
+        "    at com.example.Pool.get(Pool.java:88)\n"
+        "[25/Oct/2024:10:05:30 +0000] GET /health\n"
+        "ts=1729850760000 WARN slow\n"
+    )
+    
+    path = tmp_path / "app.log"
+    path.write_bytes(data)
+    assert read_time_range(path, start, end) == data[begin:finish].decode()